@@ -0,0 +1,80 @@
+"""
+This module benchmarks the memory used by UserQueryCommand objects, by measuring with tracemalloc the bytes allocated per
+command when a large number of commands of each concrete class is created, as when one command is created per record in
+a review queue. The bytes allocated for the extra dictionary built by each command's _doGetExtraDict() are also shown.
+
+The query preface of each command is a string shared by all commands, and the other arguments are the defaults, or small
+shared objects, so that only the commands themselves are measured.
+
+Run, with the UserResponseCollector package installed (or the src directory on PYTHONPATH), with:
+    python benchmarks/benchmark_command_memory.py [number of commands]
+"""
+
+# Standard
+import sys
+import tracemalloc
+
+# Local
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+from UserResponseCollector.UserQueryCommand import UserQueryCommandStr, UserQueryCommandText, UserQueryCommandPathSave
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathOpen, UserQueryCommandPathGlob, UserQueryCommandPathDirectory
+from UserResponseCollector.UserQueryCommand import UserQueryCommandTable
+from UserResponseCollector.UserQueryReceiver import UserQueryReceiver_GetCommandReceiver
+
+
+_QUERY_DIC = {'a': 'Accept', 'r': 'Reject', 's': 'Skip'}
+_COLUMNS = {'name': str, 'count': int, 'weight': float}
+
+# The arguments, after the receiver and query preface, used to create each concrete class
+COMMAND_ARGUMENTS = {
+    UserQueryCommandMenu: (_QUERY_DIC,),
+    UserQueryCommandNumberInteger: (1, 100),
+    UserQueryCommandNumberFloat: (0.0, 1.0),
+    UserQueryCommandStr: (25,),
+    UserQueryCommandText: (),
+    UserQueryCommandPathSave: (),
+    UserQueryCommandPathOpen: (),
+    UserQueryCommandPathGlob: (),
+    UserQueryCommandPathDirectory: (),
+    UserQueryCommandTable: (_COLUMNS,),
+}
+
+
+def measure_bytes_per_command(command_class=UserQueryCommandStr, command_count=10000):
+    """
+    Create command_count commands of command_class, and measure the memory that they keep allocated.
+    :parameter command_class: The concrete class to measure, a key of COMMAND_ARGUMENTS
+    :parameter command_count: The number of commands to create, int
+    :return: Tuple (bytes per command, bytes per extra dictionary), as Tuple (float, float)
+    """
+    receiver = UserQueryReceiver_GetCommandReceiver()
+    args = COMMAND_ARGUMENTS[command_class]
+    query_preface = 'Review the next record.'
+    # Create one command first, so that anything shared by all commands (e.g., table converters) isn't counted
+    command_class(receiver, query_preface, *args)._doGetExtraDict()
+    # The lists holding the commands and extra dictionaries aren't part of their cost, so they're allocated before measuring
+    commands = [None] * command_count
+    extras = [None] * command_count
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for i in range(command_count):
+            commands[i] = command_class(receiver, query_preface, *args)
+        after_commands = tracemalloc.get_traced_memory()[0]
+        for i in range(command_count):
+            extras[i] = commands[i]._doGetExtraDict()
+        after_extras = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return ((after_commands - start) / command_count, (after_extras - after_commands) / command_count)
+
+
+if __name__ == '__main__':
+    command_count = 10000
+    if len(sys.argv) > 1:
+        command_count = int(sys.argv[1])
+    print(f"Memory kept allocated by each of {command_count} commands, and by the extra dictionary each builds:")
+    for command_class in COMMAND_ARGUMENTS:
+        (command_bytes, extra_bytes) = measure_bytes_per_command(command_class, command_count)
+        print(f"  {command_class.__name__:30}: {command_bytes:7.1f} bytes per command, "
+              f"{extra_bytes:7.1f} bytes per extra dictionary")
@@ -0,0 +1,73 @@
+"""
+This module benchmarks the output buffering of ConsoleUserQueryReceiver, by counting the writes that reach the
+operating system (i.e., write syscalls) during a scripted session, with and without buffer_output=True.
+
+Each query in the session is answered first with an invalid response, and then with a valid one, so that every query
+produces two prompts and one error message. stdout is line buffered, as it is for a terminal. The session is run
+interactively, and headless with prompts sent to stdout, where input is never needed from a person.
+
+Run, with the UserResponseCollector package installed (or the src directory on PYTHONPATH), with:
+    python benchmarks/benchmark_output_buffering.py [number of queries]
+"""
+
+# Standard
+import io
+import sys
+import time
+from unittest.mock import patch
+
+# Local
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+
+
+class CountingRawWriter(io.RawIOBase):
+    """
+    Raw (unbuffered) stream that discards what is written to it, counting each write, as each would be a syscall.
+    """
+    def __init__(self):
+        super().__init__()
+        self.write_count = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.write_count += 1
+        return len(b)
+
+
+def run_session(query_count=1000, buffer_output=False, headless=False):
+    """
+    Run a scripted session of query_count integer queries, each answered first with an invalid response.
+    :parameter query_count: The number of queries, int
+    :parameter buffer_output: Passed to ConsoleUserQueryReceiver, boolean
+    :parameter headless: Passed to ConsoleUserQueryReceiver, boolean
+    :return: Tuple (number of write syscalls, elapsed seconds), as Tuple (int, float)
+    """
+    raw = CountingRawWriter()
+    stdout = io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8', line_buffering=True)
+    stdin = io.StringIO('ten\n10\n' * query_count)
+    prompt_stream = stdout if headless else None
+    receiver = ConsoleUserQueryReceiver(headless=headless, prompt_stream=prompt_stream, buffer_output=buffer_output)
+    command = UserQueryCommandNumberInteger(receiver, 'How many widgets do you want?')
+    with patch('sys.stdout', stdout), patch('sys.stdin', stdin):
+        start = time.perf_counter()
+        for i in range(query_count):
+            command.Execute()
+        receiver.Flush()
+        stdout.flush()
+        elapsed = time.perf_counter() - start
+    return (raw.write_count, elapsed)
+
+
+if __name__ == '__main__':
+    query_count = 1000
+    if len(sys.argv) > 1:
+        query_count = int(sys.argv[1])
+    print(f"Scripted session of {query_count} queries, each answered once invalidly and once validly:")
+    for headless in (False, True):
+        for buffer_output in (False, True):
+            (write_count, elapsed) = run_session(query_count, buffer_output, headless)
+            print(f"  headless={headless!s:5} buffer_output={buffer_output!s:5}: {write_count:6} write syscalls, "
+                  f"{write_count/query_count:.2f} per query, {elapsed*1000:.1f} ms")
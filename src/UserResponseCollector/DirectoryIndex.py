@@ -0,0 +1,496 @@
+"""
+Defines an index of the entries in a file system directory, and a cache of such indexes, so that checking whether a path
+exists, and completing a partial path, do not rescan the directory each time.
+
+Each DirectoryIndex is built with a single os.scandir(...) pass, and holds the entry names sorted, so that lookups and
+prefix completion are binary searches. The DirectoryIndexCache keeps the indexes of recently used directories, and
+checks the modification time of a directory (one os.stat(...) call) before reusing its index, rebuilding the index if the
+directory has changed.
+
+Exported Classes:
+    DirectoryIndex -- Sorted index of the entries in one directory.
+    DirectoryListing -- Subdirectories of one directory, listed lazily, one page at a time.
+    DirectoryIndexCache -- Cache of DirectoryIndex and DirectoryListing objects, invalidated by directory modification time.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    DirectoryIndexCache_GetCache -- Global prebound method that returns the global, single instance of DirectoryIndexCache.
+    iterGlobPaths(...) -- Generator of the paths of the files that match a glob pattern, found lazily with os.scandir(...).
+"""
+
+# Standard
+import os
+import time
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from fnmatch import fnmatch
+from pathlib import Path
+
+# Local
+
+
+class DirectoryIndex(object):
+    """
+    Sorted index of the entries in one directory, built with a single os.scandir(...) pass.
+
+    Entry names are compared after os.path.normcase(...), so that lookups are case insensitive on file systems that are.
+
+    Methods:
+        Contains(...) -- Returns True if the directory has an entry with the name.
+        IsDirectory(...) -- Returns True if the directory has an entry with the name that is itself a directory.
+        Complete(...) -- Returns the names of entries that start with a prefix.
+        GetNames() -- Returns the names of all entries, sorted.
+    """
+
+    def __init__(self, directory='.'):
+        """
+        Scan the directory and build the index.
+        :parameter directory: The directory to index, string or Path
+        Raises OSError if the directory can't be scanned.
+        """
+        self._directory = os.fspath(directory)
+        entries = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((os.path.normcase(entry.name), entry.name, is_dir))
+        entries.sort()
+        # Parallel lists, sorted by normalized name, so that bisect can be used on self._keys
+        self._keys = [entry[0] for entry in entries]
+        self._names = [entry[1] for entry in entries]
+        self._is_dir = [entry[2] for entry in entries]
+
+    def __len__(self):
+        """
+        :return: The number of entries in the directory, int
+        """
+        return len(self._keys)
+
+    def Contains(self, name=''):
+        """
+        :parameter name: The name of an entry, without any directory part, string
+        :return: True if the directory has an entry with the name, boolean
+        """
+        return self._find(name) is not None
+
+    def IsDirectory(self, name=''):
+        """
+        :parameter name: The name of an entry, without any directory part, string
+        :return: True if the directory has an entry with the name, and it is a directory, boolean
+        """
+        i = self._find(name)
+        return i is not None and self._is_dir[i]
+
+    def Complete(self, prefix='', limit=None):
+        """
+        :parameter prefix: The start of the name of an entry, string
+        :parameter limit: The maximum number of names to return, int. If None, then all matching names are returned.
+        :return: The names of the entries that start with prefix, sorted, as list of strings
+        """
+        key = os.path.normcase(prefix)
+        completions = []
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            if limit is not None and len(completions) >= limit:
+                break
+            completions.append(self._names[i])
+            i += 1
+        return completions
+
+    def GetNames(self):
+        """
+        :return: The names of all entries, sorted, as list of strings
+        """
+        return list(self._names)
+
+    def _find(self, name=''):
+        """
+        :parameter name: The name of an entry, string
+        :return: The position of the entry in the index, int, or None if there is no such entry
+        """
+        key = os.path.normcase(name)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return None
+
+
+class DirectoryListing(object):
+    """
+    Names of the subdirectories of one directory, listed lazily with os.scandir(...), one page at a time.
+
+    Only as many entries are read as are needed for the pages requested so far, so that the first page of a directory with
+    thousands of entries is available quickly. Names are in the order that the directory lists them, which is not
+    necessarily sorted, since sorting would require reading every entry. Names starting with '.' are not listed.
+
+    A listing is shared through DirectoryIndexCache, so it may be read by several threads at once. Reading entries is guarded
+    by a lock, so that the directory is scanned by one thread at a time. A listing closed before every entry was read (e.g.,
+    because the cache evicted it while another thread was still paging through it) scans the directory again when more
+    names are needed, rather than ending early.
+
+    Methods:
+        GetPage(...) -- Returns the names of the subdirectories on a page.
+        HasPage(...) -- Returns True if a page has any subdirectories on it.
+        Close() -- Stop listing, releasing the directory being scanned.
+    """
+
+    def __init__(self, directory='.'):
+        """
+        :parameter directory: The directory to list, string or Path
+        Raises OSError if the directory can't be scanned.
+        """
+        self._directory = os.fspath(directory)
+        self._names = []
+        self._scan = os.scandir(self._directory)
+        self._entries = self._iterSubdirectories()
+        # True once every entry has been read, and True/False if the scan has been closed
+        self._complete = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def GetPage(self, page=0, page_size=20):
+        """
+        :parameter page: The page number, starting with 0, int
+        :parameter page_size: The number of names on a page, int
+        :return: The names of the subdirectories on the page, as list of strings
+        """
+        with self._lock:
+            self._listUntil((page + 1) * page_size)
+            return self._names[page * page_size:(page + 1) * page_size]
+
+    def HasPage(self, page=0, page_size=20):
+        """
+        :parameter page: The page number, starting with 0, int
+        :parameter page_size: The number of names on a page, int
+        :return: True if the page has any subdirectories on it, boolean
+        """
+        with self._lock:
+            self._listUntil(page * page_size + 1)
+            return len(self._names) > page * page_size
+
+    def Close(self):
+        """
+        Stop listing, releasing the directory being scanned. Pages already listed remain available.
+            :return: None
+        """
+        with self._lock:
+            self._entries.close()
+            self._scan.close()
+            self._closed = True
+        return None
+
+    def _listUntil(self, count=0):
+        """
+        Read entries from the directory until count subdirectories have been listed, or there are no more entries. Must be
+        called with self._lock held.
+        :parameter count: The number of subdirectories needed, int
+        :return: None
+        """
+        if len(self._names) >= count or self._complete:
+            return None
+        reopened = self._closed
+        if reopened:
+            # Scan the directory again, skipping the names already listed, and close it again once enough are listed
+            try:
+                self._scan = os.scandir(self._directory)
+            except OSError:
+                return None
+            listed = set(self._names)
+            self._entries = (name for name in self._iterSubdirectories() if name not in listed)
+        try:
+            for name in self._entries:
+                self._names.append(name)
+                if len(self._names) >= count:
+                    return None
+            # Every entry has been read
+            self._complete = True
+        finally:
+            if reopened or self._complete:
+                self._entries.close()
+                self._scan.close()
+        return None
+
+    def _iterSubdirectories(self):
+        """
+        Generator of the names of the subdirectories, read from the directory as they are requested.
+        :return: Generator of strings
+        """
+        for entry in self._scan:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir():
+                    yield entry.name
+            except OSError:
+                continue
+
+
+class DirectoryIndexCache(object):
+    """
+    Cache of DirectoryIndex and DirectoryListing objects for the most recently used directories.
+
+    Before a cached index or listing is reused, the modification time of its directory is checked with a single os.stat(...) call,
+    and the index is rebuilt if the directory has changed. Following the Global Object and Prebound Method patterns, a
+    single instance is shared, and is obtained with DirectoryIndexCache_GetCache().
+
+    Methods:
+        GetCache() -- Returns self.
+        GetIndex(...) -- Returns the up-to-date DirectoryIndex of a directory.
+        GetListing(...) -- Returns the up-to-date DirectoryListing of a directory.
+        Exists(...) -- Returns True if a path exists.
+        CompletePath(...) -- Returns the paths that complete a partial path.
+        Clear() -- Forget all cached indexes and listings.
+    """
+    # A directory modified this recently (in seconds) before it was scanned may be modified again without its modification
+    # time changing, on file systems with coarse timestamps, so its index is not trusted, and is rebuilt when next used.
+    _RACY_INTERVAL = 2.0
+
+    def __init__(self, max_directories=128, max_listings=32):
+        """
+        :parameter max_directories: The maximum number of directory indexes to keep, int
+        :parameter max_listings: The maximum number of directory listings to keep, int. Each listing that is only partly
+            read keeps its directory open.
+        """
+        self._max_directories = max_directories
+        self._max_listings = max_listings
+        # Maps absolute directory path to Tuple (modification time in ns, trusted? True/False, DirectoryIndex)
+        self._indexes = OrderedDict()
+        # Maps absolute directory path to Tuple (modification time in ns, trusted? True/False, DirectoryListing)
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def GetCache(self):
+        """
+        This is a concrete method, intended to be used as the target of a prebound method. It returns self.
+            :return: self, DirectoryIndexCache object
+        """
+        return self
+
+    def GetIndex(self, directory='.'):
+        """
+        Returns the index of a directory, from the cache if the directory has not changed since it was indexed.
+        :parameter directory: The directory, string or Path
+        :return: The index of the directory, DirectoryIndex, or None if directory is not an existing directory
+        """
+        key = os.path.abspath(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached is not None and cached[0] == mtime_ns and cached[1]:
+                self._indexes.move_to_end(key)
+                return cached[2]
+        try:
+            index = DirectoryIndex(key)
+        except OSError:
+            # Not a directory, or not readable
+            return None
+        trusted = (time.time_ns() - mtime_ns) > self._RACY_INTERVAL * 1e9
+        with self._lock:
+            self._indexes[key] = (mtime_ns, trusted, index)
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self._max_directories:
+                self._indexes.popitem(last=False)
+        return index
+
+    def GetListing(self, directory='.'):
+        """
+        Returns the listing of the subdirectories of a directory, from the cache if the directory has not changed since it
+        was listed, so that pages already read are not read again.
+        :parameter directory: The directory, string or Path
+        :return: The listing of the directory, DirectoryListing, or None if directory is not an existing directory
+        """
+        key = os.path.abspath(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] == mtime_ns and cached[1]:
+                self._listings.move_to_end(key)
+                return cached[2]
+        try:
+            listing = DirectoryListing(key)
+        except OSError:
+            # Not a directory, or not readable
+            return None
+        trusted = (time.time_ns() - mtime_ns) > self._RACY_INTERVAL * 1e9
+        evicted = []
+        with self._lock:
+            if key in self._listings:
+                evicted.append(self._listings[key][2])
+            self._listings[key] = (mtime_ns, trusted, listing)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self._max_listings:
+                evicted.append(self._listings.popitem(last=False)[1][2])
+        for old_listing in evicted:
+            old_listing.Close()
+        return listing
+
+    def Exists(self, path=''):
+        """
+        :parameter path: The path to check, string or Path
+        :return: True if path is an existing entry in an existing directory, boolean
+        """
+        (directory, name) = os.path.split(os.path.abspath(path))
+        if name == '':
+            # The root directory
+            return os.path.isdir(directory)
+        index = self.GetIndex(directory)
+        return index is not None and index.Contains(name)
+
+    def CompletePath(self, text='', limit=None):
+        """
+        Returns the paths that complete a partial path. The directory part of text is kept as typed, and paths that are
+        directories end with a separator, so that they can be completed further.
+        :parameter text: The partial path, string
+        :parameter limit: The maximum number of paths to return, int. If None, then all matching paths are returned.
+        :return: The completed paths, sorted, as list of strings
+        """
+        (directory, prefix) = os.path.split(text)
+        index = self.GetIndex(os.path.expanduser(directory) or '.')
+        if index is None:
+            return []
+        completions = []
+        for name in index.Complete(prefix, limit):
+            path = os.path.join(directory, name)
+            if index.IsDirectory(name):
+                path += os.sep
+            completions.append(path)
+        return completions
+
+    def Clear(self):
+        """
+        Forget all cached indexes and listings.
+            :return: None
+        """
+        with self._lock:
+            self._indexes.clear()
+            listings = [cached[2] for cached in self._listings.values()]
+            self._listings.clear()
+        for listing in listings:
+            listing.Close()
+        return None
+
+
+def _hasMagic(part=''):
+    """
+    :parameter part: One part of a path, string
+    :return: True if part contains any glob pattern characters, boolean
+    """
+    return '*' in part or '?' in part or '[' in part
+
+
+def iterGlobPaths(pattern=''):
+    """
+    Generator of the paths of the files that match a glob pattern. Directories are scanned with os.scandir(...) only as
+    the paths are requested, so that the first paths are available before the whole pattern has been expanded.
+    The paths are produced in the order that the directories list them, which is not necessarily sorted.
+
+    Patterns follow the glob module: '*', '?' and '[...]' match within one part of the path, '**' matches any number of
+    directories, and names starting with '.' are only matched by a part that also starts with '.'.
+    If pattern is an existing directory, then the files in it are produced.
+
+    :parameter pattern: The glob pattern, e.g., 'data/*.csv' or 'data/**/*.csv', or a directory, string or Path
+    :return: Generator of the paths of matching files, as generator of Path objects
+    """
+    pattern = os.path.expanduser(os.fspath(pattern))
+    if pattern == '':
+        return
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*')
+    parts = Path(pattern).parts
+    # Split the parts into the leading directory without any pattern characters, and the rest
+    first_magic = 0
+    while first_magic < len(parts) and not _hasMagic(parts[first_magic]):
+        first_magic += 1
+    if first_magic == len(parts):
+        # No pattern characters, so the pattern is just a path
+        if os.path.isfile(pattern):
+            yield Path(pattern)
+        return
+    directory = os.path.join(*parts[:first_magic]) if first_magic > 0 else ''
+    yield from _iterGlobParts(directory, parts[first_magic:])
+
+
+def _iterGlobParts(directory='', parts=()):
+    """
+    Generator of the paths of the files under directory that match the remaining parts of a glob pattern.
+    :parameter directory: The directory to search, or '' for the current directory, string
+    :parameter parts: The remaining parts of the glob pattern, tuple of strings
+    :return: Generator of Path objects
+    """
+    (part, rest) = (parts[0], parts[1:])
+    if part == '**':
+        # Match no directories here, and then any number of directories below
+        yield from _iterGlobParts(directory, rest or ('*',))
+        try:
+            it = os.scandir(directory or '.')
+        except OSError:
+            return
+        with it:
+            for entry in it:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    # The entry vanished or can't be examined, so it isn't searched
+                    continue
+                if is_dir:
+                    yield from _iterGlobParts(os.path.join(directory, entry.name), parts)
+        return
+    try:
+        it = os.scandir(directory or '.')
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.name.startswith('.') and not part.startswith('.'):
+                continue
+            if not fnmatch(entry.name, part):
+                continue
+            try:
+                if rest:
+                    if entry.is_dir():
+                        yield from _iterGlobParts(os.path.join(directory, entry.name), rest)
+                elif entry.is_file():
+                    yield Path(directory, entry.name)
+            except OSError:
+                # The entry vanished or can't be examined, so it doesn't match
+                continue
+
+
+# Here are the global (intended to be private), single instance, and the global prebound method(s). So that importing
+# this module has no side effects, they are created by __getattr__(...) when either is first used.
+_instance_lock = threading.Lock()
+
+
+def __getattr__(name=''):
+    """
+    Create the global, single instance and the global prebound method(s) when either is first used. Once created, they are
+    ordinary module attributes, so this is not called for them again, and they may be replaced as before, e.g.:
+        UserResponseCollector.DirectoryIndex._instance = DirectoryIndexCache(max_directories=1024)
+        UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache = UserResponseCollector.DirectoryIndex._instance.GetCache
+    :parameter name: The name of the module attribute, string
+    :return: The module attribute
+    Raises AttributeError if the module has no attribute name.
+    """
+    if name not in ('_instance', 'DirectoryIndexCache_GetCache'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _instance_lock:
+        module_globals = globals()
+        if '_instance' not in module_globals:
+            module_globals['_instance'] = DirectoryIndexCache()
+        if 'DirectoryIndexCache_GetCache' not in module_globals:
+            module_globals['DirectoryIndexCache_GetCache'] = module_globals['_instance'].GetCache
+        return module_globals[name]
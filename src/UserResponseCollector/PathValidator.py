@@ -0,0 +1,253 @@
+"""
+Defines the interface and concrete implementations of PathValidator classes that check the size and kind of a file
+(e.g., not empty, text rather than binary, a CSV file, a file with a given signature), so that UserQueryCommandPathOpen
+can reject a file of the wrong kind before the application spends time loading it.
+
+Validators look only at the size of the file, from one os.stat(...) call, and at the first bytes of the file (the header),
+which are read once and shared by all the validators of a command. So validation takes the same time however large the
+file is.
+
+Exported Classes:
+    PathValidator -- Interface (abstract base) class for validators of files.
+    PathValidatorMaxSize -- Checks that a file is no larger than a maximum size.
+    PathValidatorNotEmpty -- Checks that a file is not empty.
+    PathValidatorText -- Checks that the header of a file is text, rather than binary.
+    PathValidatorSignature -- Checks that a file starts with one of a set of signatures (magic numbers).
+    PathValidatorCSV -- Checks that the header of a file is text with a consistent number of comma separated values per line.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    validatePath(...) -- Apply a sequence of validators to a file, reading its header only once.
+"""
+
+# Standard
+import codecs
+import csv
+import os
+
+# Local
+from UserResponseCollector.UserQueryResult import UserQueryResult, asUserQueryResult
+
+
+class PathValidator(object):
+    """
+    This is an interface (abstract base) class for validators of files.
+
+    Methods:
+        GetHeaderSize() -- Returns the number of bytes at the start of the file that the validator needs to examine.
+        Validate(...) -- Returns a UserQueryResult (Is Valid? True/False, Error code and message parameters) for a file.
+    """
+
+    def GetHeaderSize(self):
+        """
+        :return: The number of bytes at the start of the file that Validate(...) needs, int
+        """
+        return 0
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        This is an abstract method that MUST be implemented by children.
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is Valid? = True, then there should be no error code
+        """
+        raise NotImplementedError
+        return UserQueryResult.VALID
+
+
+class PathValidatorMaxSize(PathValidator):
+    """
+    Checks that a file is no larger than a maximum size.
+    """
+
+    def __init__(self, max_bytes=0):
+        """
+        :parameter max_bytes: The maximum size of the file, in bytes, int
+        """
+        self._max_bytes = max_bytes
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        Overrides PathValidator.Validate(...). Is the file no larger than the maximum size?
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If not, then the error code is 'file_too_large'
+        """
+        if size > self._max_bytes:
+            return UserQueryResult(False, 'file_too_large', (path, size, self._max_bytes))
+        return UserQueryResult.VALID
+
+
+class PathValidatorNotEmpty(PathValidator):
+    """
+    Checks that a file is not empty.
+    """
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        Overrides PathValidator.Validate(...). Is the file not empty?
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If not, then the error code is 'file_empty'
+        """
+        if size == 0:
+            return UserQueryResult(False, 'file_empty', (path,))
+        return UserQueryResult.VALID
+
+
+class PathValidatorText(PathValidator):
+    """
+    Checks that the header of a file is text, rather than binary: it contains no NUL bytes, and can be decoded.
+    """
+
+    def __init__(self, encoding='utf-8', sample_size=8192):
+        """
+        :parameter encoding: The encoding that the text must be in, string
+        :parameter sample_size: The number of bytes at the start of the file to examine, int
+        """
+        self._encoding = encoding
+        self._sample_size = sample_size
+
+    def GetHeaderSize(self):
+        """
+        Overrides PathValidator.GetHeaderSize().
+        :return: The number of bytes at the start of the file that are examined, sample_size, int
+        """
+        return self._sample_size
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        Overrides PathValidator.Validate(...). Is the header of the file text in the encoding?
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If not, then the error code is 'not_text_file'
+        """
+        if self._decode(header) is None:
+            return UserQueryResult(False, 'not_text_file', (path,))
+        return UserQueryResult.VALID
+
+    def _decode(self, header=b''):
+        """
+        :parameter header: The first bytes of the file, bytes
+        :return: The header decoded, string, or None if the header is not text
+        """
+        if b'\x00' in header:
+            return None
+        # The header may end part way through a multi-byte character, which is not an error
+        decoder = codecs.getincrementaldecoder(self._encoding)()
+        try:
+            return decoder.decode(header, final=False)
+        except UnicodeDecodeError:
+            return None
+
+
+class PathValidatorSignature(PathValidator):
+    """
+    Checks that a file starts with one of a set of signatures (magic numbers), e.g., b'%PDF-' for a PDF file, or
+    b'PK\\x03\\x04' for a zip file.
+    """
+
+    def __init__(self, signatures=(), description='the expected kind'):
+        """
+        :parameter signatures: The bytes that the file may start with, sequence of bytes
+        :parameter description: The kind of file, used in the error message, e.g., 'a PDF file', string
+        """
+        self._signatures = tuple(signatures)
+        self._description = description
+
+    def GetHeaderSize(self):
+        """
+        Overrides PathValidator.GetHeaderSize().
+        :return: The length of the longest signature, in bytes, int
+        """
+        return max((len(signature) for signature in self._signatures), default=0)
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        Overrides PathValidator.Validate(...). Does the file start with one of the signatures?
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If not, then the error code is 'wrong_signature'
+        """
+        if not header.startswith(self._signatures):
+            return UserQueryResult(False, 'wrong_signature', (path, self._description))
+        return UserQueryResult.VALID
+
+
+class PathValidatorCSV(PathValidatorText):
+    """
+    Checks that the header of a file is text, where every complete line has the same number of delimiter separated
+    values, and at least min_columns of them. By default, at least two values are required, since any line of text
+    is a single value.
+    """
+
+    def __init__(self, delimiter=',', min_columns=2, encoding='utf-8', sample_size=8192):
+        """
+        :parameter delimiter: The character that separates values, string
+        :parameter min_columns: The minimum number of values on each line, int (default 2)
+        :parameter encoding: The encoding that the text must be in, string
+        :parameter sample_size: The number of bytes at the start of the file to examine, int
+        """
+        PathValidatorText.__init__(self, encoding, sample_size)
+        self._delimiter = delimiter
+        self._min_columns = min_columns
+
+    def Validate(self, path=None, size=0, header=b''):
+        """
+        Overrides PathValidator.Validate(...). Is the header of the file comma (or delimiter) separated values?
+        :parameter path: The path of the file, Path object
+        :parameter size: The size of the file in bytes, int
+        :parameter header: The first GetHeaderSize() bytes of the file, or all of it if it is smaller, bytes
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If not, then the error code is 'not_csv_file'
+        """
+        text = self._decode(header)
+        if text is None:
+            return UserQueryResult(False, 'not_csv_file', (path,))
+        lines = text.splitlines()
+        if size > len(header) and len(lines) > 1:
+            # The last line of the header is probably incomplete
+            lines = lines[:-1]
+        column_counts = set(len(row) for row in csv.reader(lines, delimiter=self._delimiter) if row)
+        if len(column_counts) != 1 or column_counts.pop() < self._min_columns:
+            return UserQueryResult(False, 'not_csv_file', (path,))
+        return UserQueryResult.VALID
+
+
+def validatePath(path=None, validators=()):
+    """
+    Apply a sequence of validators to a file, stopping at the first that fails. The size of the file is found with one
+    os.stat(...) call, and the header needed by all of the validators is read with a single read.
+    :parameter path: The path of the file, Path object
+    :parameter validators: The validators to apply, sequence of PathValidator objects
+    :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+        Note: If Is Valid? = True, then there should be no error code
+    """
+    if not validators:
+        return UserQueryResult.VALID
+    header_size = max(validator.GetHeaderSize() for validator in validators)
+    try:
+        size = os.stat(path).st_size
+        header = b''
+        if header_size > 0 and size > 0:
+            with open(path, 'rb') as file:
+                header = file.read(header_size)
+    except OSError as err:
+        return UserQueryResult(False, 'unreadable_file', (path, err.strerror))
+    for validator in validators:
+        result = asUserQueryResult(validator.Validate(path, size, header))
+        if not result.value:
+            return result
+    return UserQueryResult.VALID
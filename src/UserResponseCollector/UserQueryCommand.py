@@ -18,6 +18,13 @@ Exported Classes:
     Each UserQueryCommandX may optionally extend:
         (4) _doGetExtraDict() - Returns dictionary of key/value pairs to pass to UserQueryReceiver.GetRawResponse(...) method.
             Note: Clients must assume that the UserQueryReceiver implementation may ignore this parameter.
+        (5) _doGetRawResponse(...) - Obtains the raw response from the UserQueryReceiver. The base implementation calls
+            UserQueryReceiver.GetRawResponse(...).
+        (6) _doIsAcceptablePartialResponse(...) - Returns True if a partly typed response could still become valid, so that
+            receivers able to check each keystroke can reject a bad one at once. The base implementation accepts everything.
+    UserQueryTable -- Column-oriented table of typed values, returned by UserQueryCommandTable.
+    UserQueryPathMatches -- Iterator of the paths that match a glob pattern, returned by UserQueryCommandPathGlob.
+    OverwritePolicy -- Enumeration of what resolvePathSaveBatch(...) does with paths to files that already exist.
     
 Exported Exceptions:
     None    
@@ -27,22 +34,66 @@ Exported Functions:
     askForInt(...) -- Convenience function to query user for an integer number without using objects.
     askForFloat(...) -- Convenience function to query user for a floating point number without using objects.
     askForStr(...) -- Convenience function to query user for a text string without using objects.
+    askForText(...) -- Convenience function to query user for multiple lines of text without using objects.
     askForPathSave(...) -- Convenience function to query user for a path to save a file without using objects.
+    resolvePathSaveBatch(...) -- Function to check a batch of paths to save files, applying an OverwritePolicy to existing files.
     askForPathOpen(...) -- Convenience function to query user for a path to open a file without using objects.
+    askForPathGlob(...) -- Convenience function to query user for a glob pattern to open a set of files without using objects.
+    askForPathDirectory(...) -- Convenience function to query user to choose a directory without using objects.
+    askForTable(...) -- Convenience function to query user to paste a table of comma separated values without using objects.
 """
 
 # Standard
 import sys
-from multiprocessing import process
 from pathlib import Path
+from array import array
+from enum import Enum
+from types import MappingProxyType
+import csv
+import itertools
+import os
+import re
+import bisect
+import functools
+import threading
 
 # Local
 import UserResponseCollector.UserQueryReceiver
+import UserResponseCollector.DirectoryIndex
+import UserResponseCollector.PathValidator
+from UserResponseCollector.UserQueryResult import UserQueryResult, asUserQueryResult
+from UserResponseCollector.UserQueryMiddleware import _EMPTY_DICT
+import UserResponseCollector.UserQueryTracer
 
 # TODO: Remove or comment out debug print for release. This was added to help understand
 # and debug package import behavior.
 # print("In module UserQueryCommands sys.path[0], __package__ ==", sys.path[0], __package__)
 
+# The cancellation token of the query being executed, per thread, so that a command may be executed by several threads at once
+_executing = threading.local()
+
+
+def _rawResponseText(raw_response=''):
+    """
+    Returns the raw response as a string, for use in an error message. A raw response read as bytes (see
+    UserQueryReceiver.GetRawResponseUndecoded(...)) is decoded, replacing any bytes that aren't valid UTF-8.
+    :parameter raw_response: The raw response, string or bytes-like object
+    :return: The raw response, as string
+    """
+    if isinstance(raw_response, (bytes, bytearray, memoryview)):
+        return str(bytes(raw_response), 'utf-8', 'replace')
+    return raw_response
+
+
+# The maximum number of paths listed in a prompt or message
+_MAX_LISTED_PATHS = 5
+
+# Partly typed responses that could still become valid numbers, allowing surrounding spaces as int() and float() do
+_PARTIAL_INTEGER = re.compile(r'\s*[+-]?\d*\s*')
+_PARTIAL_UNSIGNED_INTEGER = re.compile(r'\s*\+?\d*\s*')
+_PARTIAL_FLOAT = re.compile(r'\s*[+-]?(\d*\.?\d*|\d*\.?\d+[eE][+-]?\d*|\d+\.[eE][+-]?\d*)\s*')
+
+
 class UserQueryCommand(object):
     """
     Following the Command design pattern, this is the abstract base or interface class for ConcreteUserQueryCommand classes that know how to execute
@@ -56,7 +107,39 @@ class UserQueryCommand(object):
     Each child may optionally extend:
         (4) _doGetExtraDict() - Returns dictionary of key/value pairs to pass to UserQueryReceiver.GetRawResponse(...) method.
             Note: Clients must assume that the UserQueryReceiver implementation may ignore this parameter.
+        (5) _doGetRawResponse(...) - Obtains the raw response from the UserQueryReceiver. The base implementation calls
+            UserQueryReceiver.GetRawResponse(...).
+        (6) _doIsAcceptablePartialResponse(...) - Returns True if a partly typed response could still become valid, so that
+            receivers able to check each keystroke can reject a bad one at once. The base implementation accepts everything.
+
+    The primitive operations (2) and (3) return a UserQueryResult, carrying an error code and the parameters of the error
+    message, rather than the message itself. The message is only rendered if the receiver shows it.
+
+    Any command may be given a default response with SetDefaultResponse(...). If the receiver times out waiting for the user
+    (raising UserQueryReceiverTimeoutError), the default response is processed and validated as if the user had typed it,
+    and the substitution is reported to the receiver.
+
+    Any command may be given a UserQueryResponseMemo with SetResponseMemo(...), which caches the results of processing and
+    validating raw responses for the command's configuration, as returned by _getMemoConfiguration(). Children whose results
+    depend only on the raw response and their configuration extend _getMemoConfiguration(); others ignore the memo.
+
+    Commands may be created in large numbers (e.g., one per record in a review queue), so their attributes are kept in
+    __slots__ rather than in a per-instance __dict__, and entries of the extra dictionary that are the same for every
+    instance of a class are kept in the class's read-only _EXTRA mapping. Children must declare __slots__ for the
+    attributes that they add, or their instances will have a __dict__ again. Commands may be weakly referenced (e.g., by
+    UserQueryResponseStore), so that keeping track of a command doesn't keep it alive.
+
+    Commands may be executed by several threads at once, including on a free-threaded (no-GIL) build of Python. Execute(...)
+    keeps the state of a query in locals and in the extra dictionary, and the cancellation token per thread, so one command
+    may be executed by several threads, each with its own token. Children must not keep the state of a query in attributes
+    of the command, other than values that depend only on its configuration (e.g., the converters of a table). Values
+    derived for one query (e.g., the sorted keys of a menu) are bound to the callables in its extra dictionary instead.
     """
+    __slots__ = ('_receiver', '_query_preface', '_default_response', '_memo', '__weakref__')
+
+    # Entries of the extra dictionary shared by every instance of the class
+    _EXTRA = MappingProxyType({})
+
     def __init__(self, receiver=None, query_preface = ''):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command, must be a UserQueryReceiver instance.
@@ -65,39 +148,223 @@ class UserQueryCommand(object):
         assert(isinstance(receiver, UserResponseCollector.UserQueryReceiver.UserQueryReceiver))
         self._receiver = receiver
         self._query_preface = query_preface
+        self._default_response = None
+        self._memo = None
+
+    def SetDefaultResponse(self, default_response=None):
+        """
+        Set the response used if the receiver times out waiting for the user.
+        :parameter default_response: The raw response, as the user would type it (e.g., '10' rather than 10), string,
+            or None for no default response
+        :return: self, so that calls can be chained, e.g., command.SetDefaultResponse('y').Execute()
+        """
+        self._default_response = default_response
+        return self
+
+    def GetDefaultResponse(self):
+        """
+        :return: The raw response used if the receiver times out waiting for the user, string, or None if there is none
+        """
+        return self._default_response
+
+    def SetResponseMemo(self, memo=None):
+        """
+        Set the memo that caches the results of processing and validating raw responses. It is ignored if the command
+        can't be memoized (i.e., _getMemoConfiguration() returns None).
+        :parameter memo: The memo, UserQueryResponseMemo, which may be shared by many commands, or None for no memo
+        :return: self, so that calls can be chained
+        """
+        self._memo = memo
+        return self
+
+    def GetResponseMemo(self):
+        """
+        :return: The memo set with SetResponseMemo(...), UserQueryResponseMemo, or None if there is none
+        """
+        return self._memo
     
-    def Execute(self):
+    def Execute(self, cancellation_token=None):
         """
         Following the Template Method design pattern, Execute is a template method that is called to obtain a
         response from the user. This method requires that the following primitive operations are implemented.
             (1) doCreatePromptText(...)
             (2) doProcessRawResponse(...)
             (3) doValidateProcessedResponse(...)
+        :parameter cancellation_token: Token that cancels the query from another thread, UserQueryCancellationToken, or None.
+            It is passed to the receiver as extra['cancellation_token']. Raises UserQueryReceiverTerminateQueryingThreadError
+            if the token is cancelled before the user has responded.
         :return: The user's response as object of required type, which can differ for each subclass of UserQueryCommand        
+        If the receiver has middleware (see UserQueryReceiver.AddMiddleware(...)), its hooks are called around the primitive
+        operations, and its AfterQueryAbandoned(...) hooks if the query ends with an exception. If a UserQueryTracer is installed, a span is recorded around Execute(...), and around each primitive operation.
+        """
+        # Kept for this thread, so that any commands executed on behalf of this one can be cancelled too
+        previous_token = getattr(_executing, 'cancellation_token', None)
+        _executing.cancellation_token = cancellation_token
+        try:
+            tracer = UserResponseCollector.UserQueryTracer.getUserQueryTracer()
+            if tracer is None:
+                return self._executeOperations(self._getOperations(), cancellation_token)
+            with tracer.Span(f"{type(self).__name__}.Execute", 'command'):
+                return self._executeOperations(self._getOperations(tracer), cancellation_token)
+        except BaseException as error:
+            # Let middleware reset any state kept for the query (e.g., the rejections in a row counted by a rate limiter),
+            # since the query ended without a response
+            pipeline = self._receiver.GetMiddlewarePipeline()
+            if pipeline is not None:
+                pipeline.QueryAbandoned(self, error)
+            raise
+        finally:
+            _executing.cancellation_token = previous_token
+
+    def _getCancellationToken(self):
+        """
+        :return: The cancellation token passed to the innermost Execute(...) running in this thread, which commands executed
+            on behalf of this one (e.g., to confirm a response) should be executed with, UserQueryCancellationToken, or None
+        """
+        return getattr(_executing, 'cancellation_token', None)
+
+    # Names of the operations returned by _getOperations(...), used to name their spans when tracing
+    _OPERATION_NAMES = ('_doCreatePromptText', '_doGetExtraDict', '_doGetRawResponse', '_doProcessRawResponse',
+                        '_doValidateProcessedResponse')
+
+    def _getOperations(self, tracer=None):
+        """
+        Gather the primitive operations called by Execute(...), and the receiver's IssueErrorMessage(...). If the receiver
+        has middleware, its hooks are called around the operations of the stages that they apply to.
+        :parameter tracer: The tracer that records a span around each operation, UserQueryTracer, or None to call the
+            operations directly
+        :return: Tuple of the callables (create prompt text, get extra dict, get raw response, process raw response,
+            validate processed response, issue error message)
+        """
+        operations = (self._doCreatePromptText, self._doGetExtraDict, self._doGetRawResponse, self._doProcessRawResponse,
+                      self._doValidateProcessedResponse, self._receiver.IssueErrorMessage)
+        if self._memo is not None:
+            configuration = self._getMemoConfiguration()
+            if configuration is not None:
+                operations = self._memoizeOperations(operations, configuration)
+        pipeline = self._receiver.GetMiddlewarePipeline()
+        if pipeline is not None:
+            operations = pipeline.WrapOperations(self, operations)
+        if tracer is None:
+            return operations
+        traced = [tracer.Wrap(operation, f"{type(self).__name__}.{name}", 'primitive')
+                  for (operation, name) in zip(operations, self._OPERATION_NAMES)]
+        traced.append(tracer.Wrap(operations[-1], f"{type(self._receiver).__name__}.IssueErrorMessage", 'receiver'))
+        return tuple(traced)
+
+    def _getMemoConfiguration(self):
+        """
+        Children whose results of _doProcessRawResponse(...) and _doValidateProcessedResponse(...) depend only on the raw
+        response and on their configuration should extend this, returning their configuration.
+        :return: The configuration of the command, e.g., Tuple (type of command, minimum, maximum), hashable, or None
+            if the command can't be memoized. This base implementation returns None.
+        """
+        return None
+
+    def _memoizeOperations(self, operations=(), configuration=None):
         """
+        :parameter operations: Tuple returned by _getOperations(...), before middleware and tracing are added
+        :parameter configuration: The configuration returned by _getMemoConfiguration()
+        :return: The operations, where processing a raw response found in self._memo returns the cached result, and the
+            validation that follows it returns the cached validation result, tuple
+        """
+        memo = self._memo
+        process_raw_response = operations[3]
+        validate_processed_response = operations[4]
+        # Results of the raw response last processed, which are cached, or to be cached, with the result of its validation
+        pending_key = None
+        pending_result = None
+        cached_validation = None
+
+        def memoized_process_raw_response(raw_response=''):
+            nonlocal pending_key, pending_result, cached_validation
+            pending_key = None
+            cached_validation = None
+            key = bytes(raw_response) if isinstance(raw_response, (bytearray, memoryview)) else raw_response
+            try:
+                cached = memo.Get(configuration, key)
+            except TypeError:
+                # The raw response can't be a key (e.g., a generator of lines)
+                return process_raw_response(raw_response)
+            if cached is not None:
+                (pending_result, cached_validation) = cached
+                return pending_result
+            result = asUserQueryResult(process_raw_response(raw_response))
+            if result.value is None:
+                memo.Put(configuration, key, result, None)
+            else:
+                (pending_key, pending_result) = (key, result)
+            return result
+
+        def memoized_validate_processed_response(processed_response=None):
+            nonlocal pending_key, cached_validation
+            # Only use the cache if validating the response just processed, rather than one changed by middleware
+            is_pending = pending_result is not None and processed_response is pending_result.value
+            if is_pending and cached_validation is not None:
+                return cached_validation
+            result = asUserQueryResult(validate_processed_response(processed_response))
+            if is_pending and pending_key is not None:
+                memo.Put(configuration, pending_key, pending_result, result)
+                pending_key = None
+            return result
+
+        return (operations[0], operations[1], operations[2], memoized_process_raw_response,
+                memoized_validate_processed_response, operations[5])
+
+    def _executeOperations(self, operations=(), cancellation_token=None):
+        """
+        The body of the Execute(...) template method, calling the primitive operations gathered by _getOperations(...).
+        :parameter operations: Tuple returned by _getOperations(...)
+        :parameter cancellation_token: See Execute(...)
+        :return: See Execute(...)
+        """
+        (create_prompt_text, get_extra_dict, get_raw_response, process_raw_response, validate_processed_response,
+         issue_error_message) = operations
         processed_response = None
         
-        prompt_text = self._doCreatePromptText()
+        prompt_text = create_prompt_text()
 
-        extra = self._doGetExtraDict()
+        extra = get_extra_dict()
+        if cancellation_token is not None:
+            extra['cancellation_token']=cancellation_token
 
         while processed_response is None:
+
+            if cancellation_token is not None:
+                cancellation_token.RaiseIfCancelled()
                 
             # Ask the receiver/user for a raw response, which will be in the form of a string
-            raw_response = self._receiver.GetRawResponse(prompt_text, extra)
+            used_default = False
+            try:
+                raw_response = get_raw_response(prompt_text, extra)
+            except UserResponseCollector.UserQueryReceiver.UserQueryReceiverTimeoutError:
+                if self._default_response is None:
+                    raise
+                # Nobody responded in time, so use the default response, as if it had been typed
+                raw_response = self._default_response
+                used_default = True
+                self._receiver.ReportDefaultResponse(prompt_text, raw_response, extra)
         
-            # Process the response from the receiver/user into an object of required type
-            (processed_response, error_msg) = self._doProcessRawResponse(raw_response)
+            # Process the response from the receiver/user into an object of required type. The error message is only
+            # rendered from the result if it is shown.
+            result = asUserQueryResult(process_raw_response(raw_response))
+            processed_response = result.value
             
             if processed_response is None:
+                if used_default:
+                    # Asking again would only time out again, with the same invalid default response
+                    raise ValueError(f"The default response \'{raw_response}\' is not valid: {str(result).strip()}")
                 # Raw response could not be converted to an object of the required type. Issue error message.
-                self._receiver.IssueErrorMessage(error_msg)
+                issue_error_message(result)
             else:
                 # Raw response could be converted to an object of the required type. Check validity.
-                (isValid, error_msg) = self._doValidateProcessedResponse(processed_response)
-                if not isValid:
+                result = asUserQueryResult(validate_processed_response(processed_response))
+                if not result.value and used_default:
+                    # Asking again would only time out again, with the same invalid default response
+                    raise ValueError(f"The default response \'{raw_response}\' is not valid: {str(result).strip()}")
+                if not result.value:
                     # Processed response is an object of right type but of invalid value. Issue error message.
-                    self._receiver.IssueErrorMessage(error_msg)
+                    issue_error_message(result)
                     # Set processed_respone to None, so that we go around again asking user for input
                     processed_response = None
                 
@@ -107,13 +374,41 @@ class UserQueryCommand(object):
         """
         Following the Template Method design pattern, this is a primitive operation to
         assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
-        This base implemetation adds the "query_type" key with the value of the type of this UserQueryCommand.
-        It is intended that concrete child classes will extend this method to add any additional keyword arguments.
+        This base implemetation copies the entries of the class's _EXTRA mapping, and adds the "query_type" key with the
+        value of the type of this UserQueryCommand, and the "default_response" key with the value of the default response,
+        if there is one.
+        It is intended that concrete child classes will extend this method to add any additional keyword arguments that
+        differ between instances, and add those that don't to _EXTRA.
         :return: The dictionary of extra key/value pairs, as dict
         """
-        extra = {}
+        extra = dict(self._EXTRA)
         extra['query_type']=type(self)
+        if self._default_response is not None:
+            # Let the receiver know that it may time out
+            extra['default_response']=self._default_response
         return extra
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response
+        from the receiver. This base implementation calls the receiver's GetRawResponse(...) method.
+        Concrete child classes may override this method if they need a different receiver method, for example to obtain
+        a multi-line response.
+        :parameter prompt_text: The text returned by _doCreatePromptText(), string
+        :parameter extra: The dictionary returned by _doGetExtraDict(), dict
+        :return: The raw response, as string (or other object understood by the child's _doProcessRawResponse(...))
+        """
+        return self._receiver.GetRawResponse(prompt_text, extra)
+
+    def _doIsAcceptablePartialResponse(self, partial_response=''):
+        """
+        Following the Template Method design pattern, this is a primitive operation to check a response while the user is
+        still typing it. Concrete child classes that can reject a partly typed response, before it is complete, should
+        override this method, and extend _doGetExtraDict() to add it as the 'accept_partial' key.
+        :parameter partial_response: The response typed so far, including the latest keystroke, string
+        :return: True if the partial response could still be extended into a valid response, boolean
+        """
+        return True
     
     def _doCreatePromptText(self):
         """
@@ -131,12 +426,13 @@ class UserQueryCommand(object):
         convert the raw text response from the user into an object of required type. A concrete implementaton must be provided
         by concrete child classes.
         :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to object of required type, Error message), as Tuple (object of required type, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (object of required type, '')
+        :return: UserQueryResult (Raw text response converted to object of required type, Error code and message parameters), unpacking as Tuple (object of required type, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
+            Children written before UserQueryResult may instead return Tuple (object of required type, Error message).
         """
         raise NotImplementedError
-        return (None, 'some error message')
+        return UserQueryResult(None, 'message', ('some error message',))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -144,11 +440,12 @@ class UserQueryCommand(object):
         validate that the processed response returned from _doProcessRawResponse(...) meets any additional requirements
         beyond being convertible to an object of the required type.
         :parameter processed_response: The returned object from _doProcessRawResponse(...), object of required type
-        :return: Tuple (Is valid? True/False, Error message), as Tuple (boolean, string)
-            Note: If Is Valid? = True, then Error message should be ''
+        :return: UserQueryResult (Is valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is Valid? = True, then there should be no error code
+            Children written before UserQueryResult may instead return Tuple (Is valid? True/False, Error message).
         """
         raise NotImplementedError
-        return (False, 'some error mesage')
+        return UserQueryResult(False, 'message', ('some error message',))
 
 
 class UserQueryCommandMenu(UserQueryCommand):
@@ -158,8 +455,11 @@ class UserQueryCommandMenu(UserQueryCommand):
 
     Methods:
         Execute(...) --- Returns the key of the value from the query dictionary that the user selected.
+        GetQueryDic() -- Returns the query dictionary.
     """
-    def __init__(self, receiver=None, query_preface = '', query_dic = {}):
+    __slots__ = ('_query_dic',)
+
+    def __init__(self, receiver=None, query_preface = '', query_dic=_EMPTY_DICT):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
         :parameter query_preface: Text displayed to the user to request their response, string
@@ -168,16 +468,49 @@ class UserQueryCommandMenu(UserQueryCommand):
         UserQueryCommand.__init__(self, receiver, query_preface)
         self._query_dic = query_dic
 
+    def GetQueryDic(self):
+        """
+        :return: The query dictionary, whose keys are the responses that the user may select, and whose values describe them, dict
+        """
+        return self._query_dic
+
     def _doGetExtraDict(self):
         """
         Following the Template Method design pattern, this is a primitive operation to
         assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
-        This extends the base implemetation by adding the 'query_dic' key with value of the self._query_dic.
+        This extends the base implemetation by adding the 'query_dic' key with value of the self._query_dic, and the
+        'accept_partial' key with value of self._doIsAcceptablePartialResponse, given the sorted keys of this query.
         :return: The dictionary of extra key/value pairs, as dict
         """
         extra = super()._doGetExtraDict()
         extra['query_dic']=self._query_dic
+        # Sort the keys once per query, so that each keystroke is checked with a binary search. They are kept in the extra
+        # dictionary of this query, rather than in the command, so that queries of the same command in several threads
+        # don't replace each other's keys.
+        sorted_keys = sorted(str(key) for key in self._query_dic)
+        extra['accept_partial']=functools.partial(self._doIsAcceptablePartialResponse, sorted_keys=sorted_keys)
         return extra
+
+    def _getMemoConfiguration(self):
+        """
+        This extends the base implementation, since the results depend only on the raw response and the menu.
+        :return: Tuple (type of command, Tuple of the items of self._query_dic)
+        """
+        return (type(self), tuple(self._query_dic.items()))
+
+    def _doIsAcceptablePartialResponse(self, partial_response='', sorted_keys=None):
+        """
+        Following the Template Method design pattern, this is a primitive operation to check a response while the user is
+        still typing it. This overrides the base implementation, accepting only the start of a key in self._query_dic.
+        :parameter partial_response: The response typed so far, including the latest keystroke, string
+        :parameter sorted_keys: The keys of self._query_dic as sorted strings, as built by _doGetExtraDict() for the query,
+            list, or None to check every key
+        :return: True if the partial response is the start of a key, boolean
+        """
+        if sorted_keys is None:
+            return any(str(key).startswith(partial_response) for key in self._query_dic)
+        i = bisect.bisect_left(sorted_keys, partial_response)
+        return i < len(sorted_keys) and sorted_keys[i].startswith(partial_response)
     
     def _doCreatePromptText(self):
         """
@@ -201,21 +534,17 @@ class UserQueryCommandMenu(UserQueryCommand):
         primitive operation to convert the raw text response from the user into a key from self._query_dic.
         Since the key is always a string, this function processes the raw text response from the user into a string.
         :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response, Error message), as Tuple (string, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (string, '')
+        :return: UserQueryResult (Raw text response, Error code and message parameters), unpacking as Tuple (string, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into a string.
         # This is unlikely to ever fail, since (nearly?) every type in python at least as a default __str()...
         # implementation. 
-        processed_response = None
-        msg = ''
         try:
-            processed_response = str(raw_response)
+            return UserQueryResult(str(raw_response))
         except:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not a valid response. Please try again." 
-        return (processed_response, msg)
+            return UserQueryResult(None, 'invalid_response', (raw_response,))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -223,18 +552,17 @@ class UserQueryCommandMenu(UserQueryCommand):
         primitive operation to validate that the processed response (string) returned from _doProcessRawResponse(...)
         is a valid key contained in self._query_dic.
         :parameter processed_response: The returned object from _doProcessRawResponse(...), string
-        :return: Tuple (Is Valid? True/False, Error message), as Tuple (boolean, string)
-            Note: If Is Valid? = True, then Error message should be ''
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is Valid? = True, then there should be no error code
         """
         if processed_response not in self._query_dic:
-            # User's input does not match a key in the menu dictionary, so craft an error message
-            msg = f"\n\'{processed_response}\' is not a valid response. Please try again." 
-            return (False, msg)
-        return (True, '')
+            # User's input does not match a key in the menu dictionary
+            return UserQueryResult(False, 'invalid_response', (processed_response,))
+        return UserQueryResult.VALID
 
 
 # Convenience function to query user to select a menu option without using objects.
-def askForMenuSelection(query_preface = '', query_dic = {}):
+def askForMenuSelection(query_preface = '', query_dic=_EMPTY_DICT):
     """
     This is a convenience fuction to query user to select a menu option without using objects.
     Returns the key of the value from query_dic that the user selected. User will be prompted with text:
@@ -261,6 +589,8 @@ class UserQueryCommandNumberInteger(UserQueryCommand):
     Methods:
         Execute(...) --- Returns the integer value provided by the user.
     """
+    __slots__ = ('_min_val', '_max_val')
+
     def __init__(self, receiver=None, query_preface = '', minimum=None, maximum=None):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
@@ -278,6 +608,47 @@ class UserQueryCommandNumberInteger(UserQueryCommand):
         self._max_val = maximum
 
         
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
+        This extends the base implemetation by adding the 'accept_partial' key with value of self._doIsAcceptablePartialResponse.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['accept_partial']=self._doIsAcceptablePartialResponse
+        return extra
+
+    def _getMemoConfiguration(self):
+        """
+        This extends the base implementation, since the results depend only on the raw response and the configuration.
+        :return: Tuple (type of command, minimum, maximum)
+        """
+        return (type(self), self._min_val, self._max_val)
+
+    def _doIsAcceptablePartialResponse(self, partial_response=''):
+        """
+        Following the Template Method design pattern, this is a primitive operation to check a response while the user is
+        still typing it. This overrides the base implementation, accepting only digits, after an optional sign. A minus
+        sign is not accepted if the minimum is not negative.
+        :parameter partial_response: The response typed so far, including the latest keystroke, string
+        :return: True if the partial response is the start of an integer, boolean
+        """
+        if self._min_val is not None and self._min_val >= 0:
+            return _PARTIAL_UNSIGNED_INTEGER.fullmatch(partial_response) is not None
+        return _PARTIAL_INTEGER.fullmatch(partial_response) is not None
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response
+        from the receiver. This overrides the base implementation to call the receiver's GetRawResponseUndecoded(...) method,
+        since int() can convert bytes as well as strings, so a receiver able to read bytes need not decode them.
+        :parameter prompt_text: The text returned by _doCreatePromptText(), string
+        :parameter extra: The dictionary returned by _doGetExtraDict(), dict
+        :return: The raw response, as string or bytes-like object
+        """
+        return self._receiver.GetRawResponseUndecoded(prompt_text, extra)
+
     def _doCreatePromptText(self):
         """
         Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
@@ -293,20 +664,16 @@ class UserQueryCommandNumberInteger(UserQueryCommand):
         """
         Following the Template Method design pattern, _doProcessRawResponse(...) implements the
         primitive operation to convert the raw text response from the user into an integer.
-        :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to an integer, Error message), as Tuple (integer, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (integer, '')
+        :parameter raw_response: The text input provide by the user in response to the prompt, string or bytes-like object
+        :return: UserQueryResult (Raw text response converted to an integer, Error code and message parameters), unpacking as Tuple (integer, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into an integer
-        processed_response = None
-        msg = ''
         try: 
-            processed_response = int(raw_response)
+            return UserQueryResult(int(raw_response))
         except:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not an integer. Please try again."
-        return (processed_response, msg)
+            return UserQueryResult(None, 'not_an_integer', (_rawResponseText(raw_response),))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -314,21 +681,17 @@ class UserQueryCommandNumberInteger(UserQueryCommand):
         primitive operation to validate that the processed response (integer) returned from _doProcessRawResponse(...)
         is within the required range.
         :parameter processed_response: The returned value from _doProcessRawResponse(...), integer
-        :return: Tuple (In range? True/False, Error message), as Tuple (boolean, string)
-            Note: If In range? = True, then Error message should be ''
+        :return: UserQueryResult (In range? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If In range? = True, then there should be no error code
         """
         # Check if the entered integer is within range, if the user has provided min and max values
         if self._min_val is not None:
             if processed_response < self._min_val:
-                # Craft error message
-                msg = f"\n\'{processed_response}\' is less than {self._min_val}. Please try again."
-                return (False, msg)
+                return UserQueryResult(False, 'less_than_minimum', (processed_response, self._min_val))
         if self._max_val is not None:
             if processed_response > self._max_val:
-                # Craft error message
-                msg = f"\n\'{processed_response}\' is greater than {self._max_val}. Please try again."
-                return (False, msg)
-        return (True, '')
+                return UserQueryResult(False, 'greater_than_maximum', (processed_response, self._max_val))
+        return UserQueryResult.VALID
 
 # Convenience function to query user for an integer number without using objects.
 def askForInt(query_preface = '', minimum=None, maximum=None):
@@ -361,6 +724,8 @@ class UserQueryCommandNumberFloat(UserQueryCommand):
     Methods:
         Execute(...) --- Returns the floating point value provided by the user.
     """
+    __slots__ = ('_min_val', '_max_val')
+
     def __init__(self, receiver=None, query_preface = '', minimum=None, maximum=None):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
@@ -377,6 +742,45 @@ class UserQueryCommandNumberFloat(UserQueryCommand):
         self._min_val = minimum
         self._max_val = maximum
 
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
+        This extends the base implemetation by adding the 'accept_partial' key with value of self._doIsAcceptablePartialResponse.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['accept_partial']=self._doIsAcceptablePartialResponse
+        return extra
+
+    def _getMemoConfiguration(self):
+        """
+        This extends the base implementation, since the results depend only on the raw response and the configuration.
+        :return: Tuple (type of command, minimum, maximum)
+        """
+        return (type(self), self._min_val, self._max_val)
+
+    def _doIsAcceptablePartialResponse(self, partial_response=''):
+        """
+        Following the Template Method design pattern, this is a primitive operation to check a response while the user is
+        still typing it. This overrides the base implementation, accepting only the start of a decimal number, with an
+        optional sign, decimal point, and exponent.
+        :parameter partial_response: The response typed so far, including the latest keystroke, string
+        :return: True if the partial response is the start of a floating point number, boolean
+        """
+        return _PARTIAL_FLOAT.fullmatch(partial_response) is not None
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response
+        from the receiver. This overrides the base implementation to call the receiver's GetRawResponseUndecoded(...) method,
+        since float() can convert bytes as well as strings, so a receiver able to read bytes need not decode them.
+        :parameter prompt_text: The text returned by _doCreatePromptText(), string
+        :parameter extra: The dictionary returned by _doGetExtraDict(), dict
+        :return: The raw response, as string or bytes-like object
+        """
+        return self._receiver.GetRawResponseUndecoded(prompt_text, extra)
+
     def _doCreatePromptText(self):
         """
         Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
@@ -392,20 +796,16 @@ class UserQueryCommandNumberFloat(UserQueryCommand):
         """
         Following the Template Method design pattern, _doProcessRawResponse(...) implements the
         primitive operation to convert the raw text response from the user into a floating point number.
-        :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to a float, Error message), as Tuple (float, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (float, '')
+        :parameter raw_response: The text input provide by the user in response to the prompt, string or bytes-like object
+        :return: UserQueryResult (Raw text response converted to a float, Error code and message parameters), unpacking as Tuple (float, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into a float
-        processed_response = None
-        msg = ''
         try: 
-            processed_response = float(raw_response)
+            return UserQueryResult(float(raw_response))
         except:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not a floating point number. Please try again."
-        return (processed_response, msg)
+            return UserQueryResult(None, 'not_a_float', (_rawResponseText(raw_response),))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -413,21 +813,17 @@ class UserQueryCommandNumberFloat(UserQueryCommand):
         primitive operation to validate that the processed response (float) returned from _doProcessRawResponse(...)
         is within the required range.
         :parameter processed_response: The returned value from _doProcessRawResponse(...), float
-        :return: Tuple (In range? True/False, Error message), as Tuple (boolean, string)
-            Note: If In range? = True, then Error message should be ''
+        :return: UserQueryResult (In range? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If In range? = True, then there should be no error code
         """
         # Check if the entered float is within range, if the user has provided min and max values
         if self._min_val is not None:
             if processed_response < self._min_val:
-                # Craft error message
-                msg = f"\n\'{processed_response}\' is less than {self._min_val}. Please try again."
-                return (False, msg)
+                return UserQueryResult(False, 'less_than_minimum', (processed_response, self._min_val))
         if self._max_val is not None:
             if processed_response > self._max_val:
-                # Craft error message
-                msg = f"\n\'{processed_response}\' is greater than {self._max_val}. Please try again."
-                return (False, msg)
-        return (True, '')
+                return UserQueryResult(False, 'greater_than_maximum', (processed_response, self._max_val))
+        return UserQueryResult.VALID
 
 
 # Convenience function to query user for a floating point value without using objects.
@@ -461,6 +857,8 @@ class UserQueryCommandStr(UserQueryCommand):
     Methods:
         Execute(...) --- Returns the valid string provided by the user.
     """
+    __slots__ = ('_max_len',)
+
     def __init__(self, receiver=None, query_preface = '', max_length = 25):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
@@ -470,6 +868,33 @@ class UserQueryCommandStr(UserQueryCommand):
         UserQueryCommand.__init__(self, receiver, query_preface)
         self._max_len = max_length
     
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
+        This extends the base implemetation by adding the 'accept_partial' key with value of self._doIsAcceptablePartialResponse.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['accept_partial']=self._doIsAcceptablePartialResponse
+        return extra
+
+    def _getMemoConfiguration(self):
+        """
+        This extends the base implementation, since the results depend only on the raw response and the configuration.
+        :return: Tuple (type of command, maximum length)
+        """
+        return (type(self), self._max_len)
+
+    def _doIsAcceptablePartialResponse(self, partial_response=''):
+        """
+        Following the Template Method design pattern, this is a primitive operation to check a response while the user is
+        still typing it. This overrides the base implementation, accepting only responses no longer than self._max_len.
+        :parameter partial_response: The response typed so far, including the latest keystroke, string
+        :return: True if the partial response is not too long, boolean
+        """
+        return not self._max_len or len(partial_response) <= self._max_len
+
     def _doCreatePromptText(self):
         """
         Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
@@ -486,21 +911,17 @@ class UserQueryCommandStr(UserQueryCommand):
         Following the Template Method design pattern, _doProcessRawResponse(...) implements the
         primitive operation to convert the raw text response from the user into a string.
         :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to a string, Error message), as Tuple (float, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (string, '')
+        :return: UserQueryResult (Raw text response converted to a string, Error code and message parameters), unpacking as Tuple (float, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into a string.
         # This is unlikely to ever fail, since (nearly?) every type in python at least as a default __str()...
         # implementation. 
-        processed_response = None
-        msg = ''
         try: 
-            processed_response = str(raw_response)
+            return UserQueryResult(str(raw_response))
         except:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not a valid string of text. Please try again." 
-        return (processed_response, msg)
+            return UserQueryResult(None, 'invalid_string', (raw_response,))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -508,16 +929,14 @@ class UserQueryCommandStr(UserQueryCommand):
         primitive operation to validate that the processed response (string) returned from _doProcessRawResponse(...)
         is of the required length.
         :parameter processed_response: The returned value from _doProcessRawResponse(...), string
-        :return: Tuple (Is of valid length? True/False, Error message), as Tuple (boolean, string)
-            Note: If Is of valid length? = True, then Error message should be ''
+        :return: UserQueryResult (Is of valid length? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is of valid length? = True, then there should be no error code
         """
         # Check if the entered float is within range, if the user has provided min and max values
         if self._max_len:
             if len(processed_response) > self._max_len:
-                # Craft error message
-                msg = f"\n\'{processed_response}\' is longer than {self._max_len} characters. Please try again."
-                return (False, msg)
-        return (True, '')        
+                return UserQueryResult(False, 'string_too_long', (processed_response, self._max_len))
+        return UserQueryResult.VALID
 
 
 # Convenience function to query user for a text string without using objects.
@@ -541,6 +960,138 @@ def askForStr(query_preface = '', max_length=25):
     return response
 
 
+class UserQueryCommandText(UserQueryCommand):
+    """
+    Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a Text command.
+    Query the user via receiver to provide multiple lines of text, such as a pasted log or certificate.
+
+    The text is read from the receiver in chunks of limited size, and written to a SpooledTemporaryFile, which is held in memory
+    until it grows past spool_threshold characters, and is then moved to disk. Text that is longer than max_length is rejected
+    as soon as the limit is passed, without holding the whole text.
+
+    Methods:
+        Execute(...) --- Returns the text provided by the user, as a file-like object positioned at the start of the text.
+            The client is responsible for closing the returned file-like object.
+    """
+    __slots__ = ('_max_len', '_terminator', '_spool_threshold', '_chunk_size')
+
+    def __init__(self, receiver=None, query_preface = '', max_length = None, terminator = '.', spool_threshold = 1024*1024, chunk_size = 8192):
+        """
+        :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
+        :parameter query_preface: Text displayed to the user to request their response, string
+        :parameter max_length: The maximum valid entered text length in characters, including line endings, int
+            If None, then there is no maximum length.
+        :parameter terminator: Line of text that ends the text, string
+        :parameter spool_threshold: The number of characters above which the text is moved from memory to disk, int
+        :parameter chunk_size: The maximum number of characters requested from the receiver at a time, int
+        """
+        UserQueryCommand.__init__(self, receiver, query_preface)
+        self._max_len = max_length
+        self._terminator = terminator
+        self._spool_threshold = spool_threshold
+        self._chunk_size = chunk_size
+
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponseChunks(...) method.
+        This extends the base implemetation by adding the 'terminator' key with value of self._terminator.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['terminator']=self._terminator
+        return extra
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response
+        from the receiver. This overrides the base implementation to call the receiver's GetRawResponseChunks(...) method.
+        :parameter prompt_text: The text returned by _doCreatePromptText(), string
+        :parameter extra: The dictionary returned by _doGetExtraDict(), dict
+        :return: The raw response, as generator of strings, one per chunk
+        """
+        return self._receiver.GetRawResponseChunks(prompt_text, extra, self._terminator, self._chunk_size)
+
+    def _doCreatePromptText(self):
+        """
+        Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
+        generate a suitable string of text to prompt the user for multiple lines of text of valid length.
+        :return: The prompt text, as string
+        """
+        prompt_text = self._query_preface + '\n'
+        # Add to the prompt, asking the user to enter lines of text no longer than a certain number of characters, and how to end them
+        if self._max_len:
+            prompt_text += f"Enter lines of text no longer than {self._max_len} characters in total.\n"
+        else:
+            prompt_text += 'Enter lines of text.\n'
+        prompt_text += f"End with a line containing only \'{self._terminator}\':  \n"
+        return prompt_text
+
+    def _doProcessRawResponse(self, raw_response=''):
+        """
+        Following the Template Method design pattern, _doProcessRawResponse(...) implements the
+        primitive operation to copy the raw text response from the user into a SpooledTemporaryFile.
+        If the text becomes longer than self._max_len, then copying stops, and the remaining chunks are read and discarded,
+        so that they are not taken as the next response.
+        :parameter raw_response: The chunks of text input provided by the user, iterable of strings, or a single string
+        :return: UserQueryResult (Raw text response as a file-like object, Error code and message parameters), unpacking as Tuple (SpooledTemporaryFile, string)
+            Note: If the text is too long, then the value should be None, with an error code.
+                  Otherwise, there should be no error code.
+        """
+        if isinstance(raw_response, str):
+            raw_response = (raw_response,)
+        chunks = iter(raw_response)
+        # Imported here rather than with the module, since it takes a while to import, and only text responses need it
+        import tempfile
+        spool = tempfile.SpooledTemporaryFile(max_size=self._spool_threshold, mode='w+', encoding='utf-8', newline='')
+        length = 0
+        for chunk in chunks:
+            length += len(chunk)
+            if self._max_len and length > self._max_len:
+                spool.close()
+                # Discard the rest of the text
+                for chunk in chunks:
+                    pass
+                # The error message deliberately does not repeat the text
+                return UserQueryResult(None, 'text_too_long', (self._max_len,))
+            spool.write(chunk)
+        spool.seek(0)
+        return UserQueryResult(spool)
+
+    def _doValidateProcessedResponse(self, processed_response=None):
+        """
+        Following the Template Method design pattern, _doValidateProcessedResponse(...) implements the
+        primitive operation to validate the processed response (file-like object) returned from _doProcessRawResponse(...).
+        The length has already been checked while the text was read, so no further validation is required, and always return a valid result.
+        :parameter processed_response: The returned value from _doProcessRawResponse(...), SpooledTemporaryFile
+        :return: UserQueryResult.VALID
+        """
+        return UserQueryResult.VALID
+
+
+# Convenience function to query user for multiple lines of text without using objects.
+def askForText(query_preface = '', max_length = None, terminator = '.'):
+    """
+    This is a convenience fuction to query user for multiple lines of text without using objects.
+    Returns the valid length text that the user entered, as a file-like object. User will be prompted with text:
+        {query_preface argument}
+        Enter lines of text no longer than {max_length argument} characters in total.
+        End with a line containing only '{terminator argument}':
+
+    :parameter query_preface: Text displayed to the user to request their response, string
+    :parameter max_length: The maximum valid entered text length in characters, int
+        If None, then there is no maximum length. Default is None.
+    :parameter terminator: Line of text that ends the text, string
+
+    :return: The text entered by the user, as a file-like object positioned at the start of the text, which the caller must close
+    """
+    # Build a query for the user to obtain multiple lines of text
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    command = UserQueryCommandText(receiver, query_preface, max_length=max_length, terminator=terminator)
+    response = command.Execute()
+    return response
+
+
 class UserQueryCommandPathSave(UserQueryCommand):
     """
     Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a PathSave command.
@@ -549,6 +1100,11 @@ class UserQueryCommandPathSave(UserQueryCommand):
     Methods:
         Execute(...) --- Returns the valid file path provided by the user.
     """
+    __slots__ = ()
+
+    # Let receivers able to complete paths do so
+    _EXTRA = MappingProxyType({'completion': 'path'})
+
     def __init__(self, receiver=None, query_preface = ''):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
@@ -572,19 +1128,15 @@ class UserQueryCommandPathSave(UserQueryCommand):
         Following the Template Method design pattern, _doProcessRawResponse(...) implements the
         primitive operation to convert the raw text response from the user into a Path object.
         :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to a Path object, Error message), as Tuple (Path, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (Path, '')
+        :return: UserQueryResult (Raw text response converted to a Path object, Error code and message parameters), unpacking as Tuple (Path, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into a Path object
-        processed_response = None
-        msg = ''
         try: 
-            processed_response = Path(raw_response)
+            return UserQueryResult(Path(raw_response))
         except OSError:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not a valid file path. Please try again." 
-        return (processed_response, msg)
+            return UserQueryResult(None, 'invalid_path', (raw_response,))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
@@ -593,22 +1145,19 @@ class UserQueryCommandPathSave(UserQueryCommand):
         Validation consists of determining that the Path is not to an already existing file, or if it is, then
         confirming that the user wishes to overwrite it.
         :parameter processed_response: The returned value from _doProcessRawResponse(...), Path object
-        :return: Tuple (New or overwrite? True/False, Error message), as Tuple (boolean, string)
-            Note: If New or overwrite? = True or False, then Error message should be ''
+        :return: UserQueryResult (New or overwrite? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If New or overwrite? = True, then there should be no error code
         """
-        new_or_overwrite = True
-        msg = ''
         # Check if the receiver / user has provided the path to an existing file. If so, confirm that they wish to overwrite it.
         if processed_response.exists():
             query_preface = f"\n\'{processed_response}\' is an existing file. Do you want to overwrite it?"
             query_dic = {'y':'Yes', 'n':'No'}
             command = UserQueryCommandMenu(self._receiver, query_preface, query_dic)
-            overwrite_response = command.Execute()
+            overwrite_response = command.Execute(self._getCancellationToken())
             match overwrite_response:
                 case 'n':
-                    new_or_overwrite = False
-                    msg = 'Please enter a path to a new file or file that you wish to overwrite.'
-        return (new_or_overwrite, msg)
+                    return UserQueryResult(False, 'not_overwritten')
+        return UserQueryResult.VALID
 
  
 # Convenience function to query user for a path to save a file without using objects.
@@ -633,20 +1182,147 @@ def askForPathSave(query_preface = ''):
     return response    
 
 
+class OverwritePolicy(Enum):
+    """
+    What resolvePathSaveBatch(...) does with paths to files that already exist.
+        ASK -- Ask the user once, for all of the existing files, whether to overwrite, skip, or rename them.
+        ALWAYS -- Overwrite existing files.
+        NEVER -- Skip existing files.
+        RENAME -- Add a numbered suffix to the name of each existing file, e.g., 'data_1.csv', to make it a new file.
+    """
+    ASK = 'ask'
+    ALWAYS = 'always'
+    NEVER = 'never'
+    RENAME = 'rename'
+
+
+def _renameWithSuffix(path=None, taken=None):
+    """
+    Returns path with a numbered suffix added to its name, e.g., 'data_1.csv', choosing the lowest number that gives
+    a name not in taken.
+    :parameter path: The path to rename, Path object
+    :parameter taken: The names that can't be used, after os.path.normcase(...), set of strings. The chosen name is added to it.
+        If None, then no names are taken.
+    :return: The renamed path, Path object
+    """
+    if taken is None:
+        taken = set()
+    number = 1
+    while True:
+        name = f"{path.stem}_{number}{path.suffix}"
+        if os.path.normcase(name) not in taken:
+            taken.add(os.path.normcase(name))
+            return path.with_name(name)
+        number += 1
+
+
+# Function to check a batch of paths to save files, without querying the user for each one.
+def resolvePathSaveBatch(paths = (), overwrite_policy = OverwritePolicy.ASK, query_preface = '', receiver = None):
+    """
+    This is a function to check a batch of paths to save files, applying overwrite_policy to the paths of files that
+    already exist. The paths are grouped by directory, and each directory is listed once (using the shared DirectoryIndexCache),
+    rather than checking each path separately. If overwrite_policy is OverwritePolicy.ASK, and any of the files exist,
+    then the user is asked once, for all of them, with text:
+        {query_preface argument}
+        {number} of the files already exist: {names}. What do you want to do with them?
+        Choose (y)Overwrite them, (n)Skip them, (r)Rename them:
+
+    :parameter paths: The paths to check, iterable of strings or Path objects
+    :parameter overwrite_policy: What to do with paths to files that already exist, OverwritePolicy
+    :parameter query_preface: Text displayed to the user before asking about existing files, string
+    :parameter receiver: The UserQueryReceiver used to ask the user. If None, then the global receiver is used.
+
+    :return: The paths to save to, in the same order as paths, as list of Path objects, with None in place of each path that
+        is to be skipped
+    """
+    paths = [Path(path) for path in paths]
+    # Group the positions of the paths by directory
+    positions_by_directory = {}
+    for (i, path) in enumerate(paths):
+        positions_by_directory.setdefault(path.parent, []).append(i)
+    cache = UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache()
+    existing = []
+    # The index of each directory that exists, so that each directory is listed once, even if it is renamed into
+    index_by_directory = {}
+    for (directory, positions) in positions_by_directory.items():
+        index = cache.GetIndex(directory)
+        index_by_directory[directory] = index
+        if index is None:
+            # The directory doesn't exist (yet), so neither does any file in it
+            continue
+        existing.extend(i for i in positions if index.Contains(paths[i].name))
+    existing.sort()
+
+    if existing and overwrite_policy is OverwritePolicy.ASK:
+        # Ask the user once, for all of the existing files
+        if receiver is None:
+            receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        names = ', '.join(f"\'{paths[i]}\'" for i in existing[:_MAX_LISTED_PATHS])
+        if len(existing) > _MAX_LISTED_PATHS:
+            names += ', ...'
+        preface = f"{query_preface}\n{len(existing)} of the files already exist: {names}. What do you want to do with them?"
+        query_dic = {'y':'Overwrite them', 'n':'Skip them', 'r':'Rename them'}
+        command = UserQueryCommandMenu(receiver, preface, query_dic)
+        overwrite_policy = {'y':OverwritePolicy.ALWAYS, 'n':OverwritePolicy.NEVER, 'r':OverwritePolicy.RENAME}[command.Execute()]
+
+    resolved = list(paths)
+    if overwrite_policy is OverwritePolicy.NEVER:
+        for i in existing:
+            resolved[i] = None
+    elif overwrite_policy is OverwritePolicy.RENAME:
+        # Names that a renamed file can't take: those already in the directory, and those of the other paths in the batch
+        taken_by_directory = {}
+        for i in existing:
+            directory = paths[i].parent
+            if directory not in taken_by_directory:
+                taken = set(os.path.normcase(name) for name in index_by_directory[directory].GetNames())
+                taken.update(os.path.normcase(paths[j].name) for j in positions_by_directory[directory])
+                taken_by_directory[directory] = taken
+            resolved[i] = _renameWithSuffix(paths[i], taken_by_directory[directory])
+    return resolved
+
+
 class UserQueryCommandPathOpen(UserQueryCommand):
     """
     Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a PathOpen command.
     Query the user via receiver to provide a file path.
 
+    With must_exist=True, the path must be an existing file. Existence is checked using the shared DirectoryIndexCache, so that
+    retries, and the suggestions offered for a path that doesn't exist, don't rescan the directory.
+    Optional validators (see PathValidator) check the size and kind of an existing file, reading only its header.
+
     Methods:
         Execute(...) --- Returns the valid file path provided by the user.
     """
-    def __init__(self, receiver=None, query_preface = ''):
+    # The maximum number of existing paths suggested when the path entered doesn't exist
+    _MAX_SUGGESTIONS = 5
+
+    __slots__ = ('_must_exist', '_validators')
+
+    # Let receivers able to complete paths do so
+    _EXTRA = MappingProxyType({'completion': 'path'})
+
+    def __init__(self, receiver=None, query_preface = '', must_exist = False, validators = ()):
         """
         :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
         :parameter query_preface: Text displayed to the user to request their response, string
+        :parameter must_exist: If True, the path must be an existing file, boolean (default False, any valid path)
+        :parameter validators: Checks applied, in order, to the path if it is an existing file, sequence of PathValidator objects
         """
         UserQueryCommand.__init__(self, receiver, query_preface)
+        self._must_exist = must_exist
+        self._validators = tuple(validators)
+
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponse(...) method.
+        This extends the base implemetation by adding the 'must_exist' key with value of self._must_exist.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['must_exist']=self._must_exist
+        return extra
 
     def _doCreatePromptText(self):
         """
@@ -664,45 +1340,617 @@ class UserQueryCommandPathOpen(UserQueryCommand):
         Following the Template Method design pattern, _doProcessRawResponse(...) implements the
         primitive operation to convert the raw text response from the user into a Path object.
         :parameter raw_response: The text input provide by the user in response to the prompt, string
-        :return: Tuple (Raw text response converted to a Path object, Error message), as Tuple (Path, string)
-            Note: If conversion isn't possible, then return Tuple should be (None, 'some error message text').
-                  If conversion is possible, then return Tuple should be (Path, '')
+        :return: UserQueryResult (Raw text response converted to a Path object, Error code and message parameters), unpacking as Tuple (Path, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
         """
         # Process the response from the receiver/user into a Path object
-        processed_response = None
-        msg = ''
         try: 
-            processed_response = Path(raw_response)
+            return UserQueryResult(Path(raw_response))
         except OSError:
-            # Craft error message
-            msg = f"\n\'{raw_response}\' is not a valid file path. Please try again." 
-        return (processed_response, msg)
+            return UserQueryResult(None, 'invalid_path', (raw_response,))
 
     def _doValidateProcessedResponse(self, processed_response=None):
         """
         Following the Template Method design pattern, _doValidateProcessedResponse(...) implements the
         primitive operation to validate the processed response (Path) returned from _doProcessRawResponse(...).
-        No Validation is required for this UserQueryCommand, so always return (True, '')
+        If self._must_exist is True, then validation consists of determining that the Path is to an existing file.
+        If not, then existing paths that start with the entered path are suggested in the error message.
+        If self._must_exist is False, then a path that doesn't exist is valid.
+        An existing file must also pass each of self._validators.
         :parameter processed_response: The returned value from _doProcessRawResponse(...), Path object
-        :return: Tuple (True, ''), as Tuple (boolean, string)
+        :return: UserQueryResult (Is existing file? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is existing file? = True, then there should be no error code
         """
-        return (True, '')
+        if not self._must_exist and not self._validators:
+            return UserQueryResult.VALID
+        if processed_response is None:
+            # There is no path to check
+            return UserQueryResult.VALID if not self._must_exist else UserQueryResult(False, 'not_existing_file', (processed_response,))
+        cache = UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache()
+        index = cache.GetIndex(processed_response.parent)
+        name = processed_response.name
+        if index is not None and index.Contains(name):
+            if index.IsDirectory(name):
+                return UserQueryResult(False, 'is_directory', (processed_response,))
+            return UserResponseCollector.PathValidator.validatePath(processed_response, self._validators)
+        if not self._must_exist:
+            return UserQueryResult.VALID
+        # Suggest existing paths that the user may have meant
+        suggestions = cache.CompletePath(str(processed_response), self._MAX_SUGGESTIONS)
+        return UserQueryResult(False, 'not_existing_file', (processed_response, tuple(suggestions)))
         
 
 # Convenience function to query user for a path to open a file without using objects.
-def askForPathOpen(query_preface = ''):
+def askForPathOpen(query_preface = '', must_exist = False, validators = ()):
     """
     This is a convenience fuction to query user for a path to open a file without using objects.
     Returns the valid file path that the user entered. User will be prompted with text:
         {query_preface argument}
         Enter a valid file system path, without file extension, and with escaped backslashes.      
 
+    If must_exist is True and the path provided is not an existing file, or if the file fails any of the validators, the
+    user will be prompted to enter another path.
+
     :parameter query_preface: Text displayed to the user to request their response, string
+    :parameter must_exist: If True, the path must be an existing file, boolean (default False, any valid path)
+    :parameter validators: Checks applied to the file, e.g., PathValidator.PathValidatorCSV(), sequence of PathValidator objects
         
     :return: Valid file path, as Path object   
     """
     # Build a query for the user to obtain a file open path
     receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
-    command = UserQueryCommandPathOpen(receiver, query_preface)    
+    command = UserQueryCommandPathOpen(receiver, query_preface, must_exist, validators)    
+    response = command.Execute()
+    return response
+
+
+class UserQueryPathMatches(object):
+    """
+    Iterator of the paths that match a glob pattern, as returned by UserQueryCommandPathGlob.Execute().
+
+    The first few paths are found in advance, to be previewed to the user. The rest are found lazily, as they are requested,
+    so that processing of the first paths can start before the whole pattern has been expanded.
+
+    Methods:
+        GetPattern() -- Returns the glob pattern.
+        GetPreview() -- Returns the paths found in advance.
+        HasMore() -- Returns True if there may be more paths than those found in advance.
+        Close() -- Stop finding paths.
+    """
+
+    def __init__(self, pattern='', preview_limit=10):
+        """
+        :parameter pattern: The glob pattern, string
+        :parameter preview_limit: The number of paths to find in advance, int
+        """
+        self._pattern = pattern
+        self._paths = UserResponseCollector.DirectoryIndex.iterGlobPaths(pattern)
+        self._preview = list(itertools.islice(self._paths, preview_limit))
+        # Find one more path, to know if there are more than the preview
+        self._next = list(itertools.islice(self._paths, 1))
+        self._pending = itertools.chain(self._preview, self._next, self._paths)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._pending)
+
+    def GetPattern(self):
+        """
+        :return: The glob pattern, string
+        """
+        return self._pattern
+
+    def GetPreview(self):
+        """
+        :return: The paths found in advance, as list of Path objects
+        """
+        return list(self._preview)
+
+    def HasMore(self):
+        """
+        :return: True if there are more paths than those returned by GetPreview(), boolean
+        """
+        return len(self._next) > 0
+
+    def Close(self):
+        """
+        Stop finding paths, releasing any directories being scanned.
+            :return: None
+        """
+        self._paths.close()
+        self._pending = iter(())
+        return None
+
+
+class UserQueryCommandPathGlob(UserQueryCommand):
+    """
+    Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a PathGlob command.
+    Query the user via receiver to provide a glob pattern, or a directory, to choose a set of files to open.
+
+    Methods:
+        Execute(...) --- Returns the paths of the files that match the pattern provided by the user, as a UserQueryPathMatches iterator.
+    """
+    __slots__ = ('_preview_limit', '_confirm')
+
+    # Let receivers able to complete paths do so
+    _EXTRA = MappingProxyType({'completion': 'path'})
+
+    def __init__(self, receiver=None, query_preface = '', preview_limit = 10, confirm = True):
+        """
+        :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
+        :parameter query_preface: Text displayed to the user to request their response, string
+        :parameter preview_limit: The maximum number of matching paths shown to the user when confirming the pattern, int
+        :parameter confirm: If True, the user is shown the first matching paths, and asked to confirm the pattern, boolean
+        """
+        UserQueryCommand.__init__(self, receiver, query_preface)
+        self._preview_limit = preview_limit
+        self._confirm = confirm
+
+    def _doCreatePromptText(self):
+        """
+        Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
+        generate a suitable string of text to prompt the user for a glob pattern or directory.
+        :return: The prompt text, as string
+        """
+        prompt_text = self._query_preface + '\n'
+        # Add to the prompt, telling the user what patterns are possible
+        prompt_text += 'Enter a file system path pattern (e.g., data/*.csv or data/**/*.csv), or a directory:  '
+        return prompt_text
+
+    def _doProcessRawResponse(self, raw_response=''):
+        """
+        Following the Template Method design pattern, _doProcessRawResponse(...) implements the
+        primitive operation to convert the raw text response from the user into a UserQueryPathMatches iterator.
+        Only the first matching paths are found, to be previewed.
+        :parameter raw_response: The text input provide by the user in response to the prompt, string
+        :return: UserQueryResult (Raw text response converted to a UserQueryPathMatches, Error code and message parameters), unpacking as Tuple (UserQueryPathMatches, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
+        """
+        if raw_response.strip() == '':
+            return UserQueryResult(None, 'no_pattern')
+        return UserQueryResult(UserQueryPathMatches(raw_response, self._preview_limit))
+
+    def _doValidateProcessedResponse(self, processed_response=None):
+        """
+        Following the Template Method design pattern, _doValidateProcessedResponse(...) implements the
+        primitive operation to validate the processed response (UserQueryPathMatches) returned from _doProcessRawResponse(...).
+        Validation consists of determining that at least one file matches, and, if self._confirm is True, showing the user
+        the first matching paths and confirming that they wish to use the pattern.
+        :parameter processed_response: The returned value from _doProcessRawResponse(...), UserQueryPathMatches
+        :return: UserQueryResult (Matches and confirmed? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Matches and confirmed? = True, then there should be no error code
+        """
+        preview = processed_response.GetPreview()
+        if not preview:
+            # The matches are abandoned, so release any directories being scanned now, rather than when they are garbage collected
+            processed_response.Close()
+            return UserQueryResult(False, 'no_matches', (processed_response.GetPattern(),))
+        if self._confirm:
+            query_preface = f"\nFiles matching \'{processed_response.GetPattern()}\':\n"
+            query_preface += '\n'.join(f"    {path}" for path in preview)
+            if processed_response.HasMore():
+                query_preface += '\n    ... and more'
+            query_preface += '\nDo you want to use these files?'
+            query_dic = {'y':'Yes', 'n':'No'}
+            command = UserQueryCommandMenu(self._receiver, query_preface, query_dic)
+            if command.Execute(self._getCancellationToken()) == 'n':
+                processed_response.Close()
+                return UserQueryResult(False, 'pattern_not_confirmed')
+        return UserQueryResult.VALID
+
+
+# Convenience function to query user for a glob pattern to open a set of files without using objects.
+def askForPathGlob(query_preface = '', preview_limit = 10):
+    """
+    This is a convenience fuction to query user for a glob pattern to open a set of files without using objects.
+    Returns an iterator of the paths of the files that match the pattern that the user entered. User will be prompted with text:
+        {query_preface argument}
+        Enter a file system path pattern (e.g., data/*.csv or data/**/*.csv), or a directory:
+
+    The user is shown up to preview_limit matching paths, and asked to confirm the pattern. If no files match, or they
+    do not confirm, they will be prompted to enter another pattern.
+
+    :parameter query_preface: Text displayed to the user to request their response, string
+    :parameter preview_limit: The maximum number of matching paths shown to the user, int
+
+    :return: Iterator of matching file paths, as UserQueryPathMatches
+    """
+    # Build a query for the user to obtain a glob pattern
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    command = UserQueryCommandPathGlob(receiver, query_preface, preview_limit)
+    response = command.Execute()
+    return response
+
+
+class UserQueryCommandPathDirectory(UserQueryCommand):
+    """
+    Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a PathDirectory command.
+    Query the user via receiver to choose a directory, by navigating from a starting directory with a menu of the
+    subdirectories, one page at a time.
+
+    Subdirectories are listed lazily, one page at a time, and the listings of directories already visited are cached
+    (see DirectoryIndex.DirectoryIndexCache), so that browsing is fast even in directories with thousands of entries.
+
+    Methods:
+        Execute(...) --- Returns the path of the directory that the user chose, as a Path object.
+    """
+    __slots__ = ('_start_directory', '_page_size')
+
+    def __init__(self, receiver=None, query_preface = '', start_directory = '.', page_size = 20):
+        """
+        :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
+        :parameter query_preface: Text displayed to the user to request their response, string
+        :parameter start_directory: The directory where navigation starts, string or Path
+        :parameter page_size: The number of subdirectories shown on each page of the menu, int
+        """
+        UserQueryCommand.__init__(self, receiver, query_preface)
+        self._start_directory = start_directory
+        self._page_size = page_size
+
+    def _doCreatePromptText(self):
+        """
+        Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
+        generate a suitable string of text to prompt the user. Each page of the navigation menu adds the current directory
+        and the menu options to this text.
+        :return: The prompt text, as string
+        """
+        return self._query_preface
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response from the
+        user. This overrides the base implementation, by letting the user navigate with a UserQueryCommandMenu for each
+        page of subdirectories, until they select a directory.
+        :parameter prompt_text: The text that prompts the user for a response, string
+        :parameter extra: Dictionary of extra optional key/value pairs to pass to the receiver, dict
+        :return: The path of the directory selected by the user, string
+        """
+        cache = UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache()
+        directory = os.path.abspath(os.path.expanduser(self._start_directory))
+        page = 0
+        while True:
+            listing = cache.GetListing(directory)
+            names = listing.GetPage(page, self._page_size) if listing is not None else []
+            query_preface = prompt_text + f"\nCurrent directory: {directory}"
+            if page > 0 or (listing is not None and listing.HasPage(page + 1, self._page_size)):
+                query_preface += f" (page {page + 1})"
+            query_dic = {}
+            for (i, name) in enumerate(names, 1):
+                query_dic[str(i)] = name
+            if listing is not None and listing.HasPage(page + 1, self._page_size):
+                query_dic['n'] = 'Next page'
+            if page > 0:
+                query_dic['p'] = 'Previous page'
+            if os.path.dirname(directory) != directory:
+                query_dic['u'] = 'Up to parent directory'
+            query_dic['s'] = 'Select this directory'
+            command = UserQueryCommandMenu(self._receiver, query_preface, query_dic)
+            response = command.Execute(self._getCancellationToken())
+            match response:
+                case 's':
+                    return directory
+                case 'n':
+                    page += 1
+                case 'p':
+                    page -= 1
+                case 'u':
+                    directory = os.path.dirname(directory)
+                    page = 0
+                case _:
+                    directory = os.path.join(directory, query_dic[response])
+                    page = 0
+
+    def _doProcessRawResponse(self, raw_response=''):
+        """
+        Following the Template Method design pattern, _doProcessRawResponse(...) implements the
+        primitive operation to convert the path selected by the user into a Path object.
+        :parameter raw_response: The path of the directory selected by the user, string
+        :return: UserQueryResult (Raw response converted to a Path object, Error code and message parameters), unpacking as Tuple (Path, string)
+        """
+        return UserQueryResult(Path(raw_response))
+
+    def _doValidateProcessedResponse(self, processed_response=None):
+        """
+        Following the Template Method design pattern, _doValidateProcessedResponse(...) implements the
+        primitive operation to validate that the selected directory still exists, since it may have been removed while
+        the user was navigating.
+        :parameter processed_response: The returned value from _doProcessRawResponse(...), Path object
+        :return: UserQueryResult (Is Valid? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Is Valid? = True, then there should be no error code
+        """
+        if not os.path.isdir(processed_response):
+            return UserQueryResult(False, 'not_existing_directory', (processed_response,))
+        return UserQueryResult.VALID
+
+
+# Convenience function to query user to choose a directory without using objects.
+def askForPathDirectory(query_preface = '', start_directory = '.', page_size = 20):
+    """
+    This is a convenience fuction to query user to choose a directory without using objects.
+    Returns the path of the directory that the user chose. User will be shown a menu for each page of subdirectories:
+        {query_preface argument}
+        Current directory: {the directory being browsed}
+        Choose (1){first subdirectory}, ..., (n)Next page, (p)Previous page, (u)Up to parent directory, (s)Select this directory:
+
+    :parameter query_preface: Text displayed to the user to request their response, string
+    :parameter start_directory: The directory where navigation starts, string or Path
+    :parameter page_size: The number of subdirectories shown on each page of the menu, int
+
+    :return: The directory chosen by the user, as a Path object
+    """
+    # Build a query for the user to choose a directory
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    command = UserQueryCommandPathDirectory(receiver, query_preface, start_directory, page_size)
+    response = command.Execute()
+    return response
+
+
+class UserQueryTable(object):
+    """
+    A table of typed values, stored column by column, as returned by UserQueryCommandTable.Execute().
+
+    Integer columns are stored in array('q') and floating point columns in array('d'), so that each value takes 8 bytes
+    instead of a full Python object. Text columns are stored in lists.
+
+    Methods:
+        GetColumnNames() -- Returns the list of column names, in order.
+        GetColumn(...) -- Returns the stored values of one column.
+        GetRow(...) -- Returns the values of one row, as a tuple.
+    """
+    # Maps column type to the array typecode used to store the column
+    _ARRAY_TYPECODES = {int: 'q', float: 'd'}
+
+    def __init__(self, columns=_EMPTY_DICT):
+        """
+        :parameter columns: Keys are the column names, values are the column types (int, float, or str), dict
+        """
+        self._column_names = list(columns.keys())
+        self._columns = {}
+        for (name, column_type) in columns.items():
+            if column_type in self._ARRAY_TYPECODES:
+                self._columns[name] = array(self._ARRAY_TYPECODES[column_type])
+            else:
+                self._columns[name] = []
+        self._row_count = 0
+
+    def __len__(self):
+        """
+        :return: The number of rows in the table, int
+        """
+        return self._row_count
+
+    def GetColumnNames(self):
+        """
+        :return: The names of the columns in the table, in order, as list of strings
+        """
+        return list(self._column_names)
+
+    def GetColumn(self, name=''):
+        """
+        :parameter name: The name of the column, string
+        :return: The values in the column, as array (for int and float columns) or list (for str columns)
+        """
+        return self._columns[name]
+
+    def GetRow(self, index=0):
+        """
+        :parameter index: The zero based index of the row, int
+        :return: The values in the row, in column order, as tuple
+        """
+        return tuple(self._columns[name][index] for name in self._column_names)
+
+    def _AppendRow(self, values=()):
+        """
+        Append one row of already converted values, in column order. If any value can't be stored, then the table is left unchanged.
+        :parameter values: The converted values of the row, in column order, sequence
+        :return: None
+        """
+        appended = []
+        try:
+            for (name, value) in zip(self._column_names, values):
+                self._columns[name].append(value)
+                appended.append(name)
+        except OverflowError:
+            # Undo the partial row, so that all columns stay the same length
+            for name in appended:
+                self._columns[name].pop()
+            raise
+        self._row_count += 1
+        return None
+
+
+class UserQueryCommandTable(UserQueryCommand):
+    """
+    Following the Command design pattern, this is the ConcreteUserQueryCommand class that knows how to exeucte a Table command.
+    Query the user via receiver to paste a block of comma separated values, for example copied from a spreadsheet.
+
+    The block is read from the receiver one line at a time, until a terminator line, and each line is parsed and converted
+    as soon as it is read. Values are converted following the same rules as UserQueryCommandNumberInteger,
+    UserQueryCommandNumberFloat, and UserQueryCommandStr.
+
+    Methods:
+        Execute(...) --- Returns the valid table provided by the user, as a UserQueryTable.
+    """
+    # Maps column type to the UserQueryCommand class whose conversion rules are used for the column
+    _COLUMN_COMMANDS = {int: UserQueryCommandNumberInteger, float: UserQueryCommandNumberFloat, str: UserQueryCommandStr}
+
+    __slots__ = ('_columns', '_header', '_terminator', '_delimiter', '_converters')
+
+    def __init__(self, receiver=None, query_preface = '', columns=_EMPTY_DICT, header = True, terminator = '', delimiter = ','):
+        """
+        :parameter receiver: The object that knows how to perform the operations associated with carrying out a command.
+        :parameter query_preface: Text displayed to the user to request their response, string
+        :parameter columns: Keys are the column names, values are the column types (int, float, or str), dict
+        :parameter header: If True, the first line of the block must be a header row naming the columns, boolean
+            If False, the values in each row must be in the same order as columns.
+        :parameter terminator: Line of text that ends the block, string
+            If '', then the block ends with a blank line.
+        :parameter delimiter: Character that separates values in a row, string
+        """
+        UserQueryCommand.__init__(self, receiver, query_preface)
+        assert(len(columns) > 0)
+        for column_type in columns.values():
+            assert(column_type in self._COLUMN_COMMANDS)
+        self._columns = columns
+        self._header = header
+        self._terminator = terminator
+        self._delimiter = delimiter
+        # Build the commands that convert cell values now, one per column type, so that a missing receiver is found at once
+        self._converters = {column_type: self._createConverter(column_type) for column_type in set(columns.values())}
+
+    def _createConverter(self, column_type=int):
+        """
+        Cell values are converted using the _doProcessRawResponse(...) of a command for the column type, which is created
+        with the receiver of this table, and never executed.
+        :parameter column_type: The type of the column, int, float, or str
+        :return: The command that converts cell values of the column, UserQueryCommand
+        """
+        if column_type is str:
+            return UserQueryCommandStr(self._receiver, '', max_length=None)
+        return self._COLUMN_COMMANDS[column_type](self._receiver, '')
+
+    def _doGetExtraDict(self):
+        """
+        Following the Template Method design pattern, this is a primitive operation to
+        assemble a dictionary of extra optional key/value pairs to pass to the receiver's GetRawResponseBlock(...) method.
+        This extends the base implemetation by adding the 'columns' key with value of self._columns, and the
+        'terminator' key with value of self._terminator.
+        :return: The dictionary of extra key/value pairs, as dict
+        """
+        extra = super()._doGetExtraDict()
+        extra['columns']=self._columns
+        extra['terminator']=self._terminator
+        return extra
+
+    def _doGetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Following the Template Method design pattern, this is a primitive operation to obtain the raw response
+        from the receiver. This overrides the base implementation to call the receiver's GetRawResponseBlock(...) method.
+        :parameter prompt_text: The text returned by _doCreatePromptText(), string
+        :parameter extra: The dictionary returned by _doGetExtraDict(), dict
+        :return: The raw response, as generator of strings, one per line
+        """
+        return self._receiver.GetRawResponseBlock(prompt_text, extra, self._terminator)
+
+    def _doCreatePromptText(self):
+        """
+        Following the Template Method design pattern, _doCreatePromptText() implements the primitive operation to
+        generate a suitable string of text to prompt the user to paste a block of comma separated values.
+        :return: The prompt text, as string
+        """
+        prompt_text = self._query_preface + '\n'
+        # Add to the prompt, telling the user what columns are expected, and how to end the block
+        if self._header:
+            prompt_text += 'Enter rows of values, starting with a header row, for columns: '
+        else:
+            prompt_text += 'Enter rows of values, for columns: '
+        prompt_text += ', '.join(str(name) for name in self._columns.keys()) + '\n'
+        if self._terminator == '':
+            prompt_text += 'End with a blank line:  '
+        else:
+            prompt_text += f"End with a line containing only '{self._terminator}':  "
+        return prompt_text
+
+    def _doProcessRawResponse(self, raw_response=''):
+        """
+        Following the Template Method design pattern, _doProcessRawResponse(...) implements the
+        primitive operation to convert the raw text response from the user into a UserQueryTable.
+        Rows are parsed and converted one at a time as the lines are produced by the receiver. If a row can't be
+        converted, then the remaining lines of the block are read and discarded, so that they are not taken as the next response.
+        :parameter raw_response: The lines of text input provided by the user, iterable of strings, or a single string of lines
+        :return: UserQueryResult (Raw text response converted to a UserQueryTable, Error code and message parameters), unpacking as Tuple (UserQueryTable, string)
+            Note: If conversion isn't possible, then the value should be None, with an error code.
+                  If conversion is possible, then there should be no error code.
+        """
+        if isinstance(raw_response, str):
+            raw_response = raw_response.splitlines()
+        lines = iter(raw_response)
+        result = self._parseRows(csv.reader(lines, delimiter=self._delimiter))
+        if result.value is None:
+            # Discard the rest of the block
+            for line in lines:
+                pass
+        return result
+
+    def _parseRows(self, reader=None):
+        """
+        Parse and convert the rows produced by reader into a new UserQueryTable, stopping at the first row that can't be converted.
+        :parameter reader: A csv.reader over the lines of the block
+        :return: UserQueryResult (The converted rows as UserQueryTable, Error code and message parameters)
+            Note: If a row can't be converted, then the value is None, with an error code.
+        """
+        table = UserQueryTable(self._columns)
+        column_names = list(self._columns.keys())
+        # Position of each column within a row
+        positions = list(range(len(column_names)))
+        row_length = len(column_names)
+        converters = [self._converters[self._columns[name]] for name in column_names]
+        if self._header:
+            header = next(reader, None)
+            if header is None:
+                return UserQueryResult(table)
+            header = [value.strip() for value in header]
+            for (i, name) in enumerate(column_names):
+                if str(name) not in header:
+                    return UserQueryResult(None, 'missing_column', (name,))
+                positions[i] = header.index(str(name))
+            row_length = len(header)
+        for row in reader:
+            if not row:
+                # Skip blank lines, which can only be present if the terminator isn't a blank line
+                continue
+            if len(row) != row_length:
+                return UserQueryResult(None, 'wrong_value_count', (reader.line_num, len(row), row_length))
+            values = []
+            for (name, position, converter) in zip(column_names, positions, converters):
+                result = asUserQueryResult(converter._doProcessRawResponse(row[position]))
+                if result.value is None:
+                    # The message of the cell's result is only rendered if the message for the table is
+                    return UserQueryResult(None, 'invalid_cell', (reader.line_num, name, result))
+                values.append(result.value)
+            try:
+                table._AppendRow(values)
+            except OverflowError:
+                return UserQueryResult(None, 'integer_too_large', (reader.line_num,))
+        return UserQueryResult(table)
+
+    def _doValidateProcessedResponse(self, processed_response=None):
+        """
+        Following the Template Method design pattern, _doValidateProcessedResponse(...) implements the
+        primitive operation to validate that the processed response (UserQueryTable) returned from _doProcessRawResponse(...)
+        contains at least one row.
+        :parameter processed_response: The returned value from _doProcessRawResponse(...), UserQueryTable
+        :return: UserQueryResult (Has rows? True/False, Error code and message parameters), unpacking as Tuple (boolean, string)
+            Note: If Has rows? = True, then there should be no error code
+        """
+        if len(processed_response) == 0:
+            return UserQueryResult(False, 'no_rows')
+        return UserQueryResult.VALID
+
+
+# Convenience function to query user to paste a table of comma separated values without using objects.
+def askForTable(query_preface = '', columns=_EMPTY_DICT, header = True, terminator = ''):
+    """
+    This is a convenience fuction to query user to paste a table of comma separated values without using objects.
+    Returns the valid table that the user entered. User will be prompted with text:
+        {query_preface argument}
+        Enter rows of values, starting with a header row, for columns: {keys of columns argument}
+        End with a blank line:
+
+    :parameter query_preface: Text displayed to the user to request their response, string
+    :parameter columns: Keys are the column names, values are the column types (int, float, or str), dict
+    :parameter header: If True, the first line must be a header row naming the columns, boolean
+    :parameter terminator: Line of text that ends the block, string
+        If '', then the block ends with a blank line.
+
+    :return: The table entered by the user, as UserQueryTable
+    """
+    # Build a query for the user to obtain a table
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    command = UserQueryCommandTable(receiver, query_preface, columns, header, terminator)
     response = command.Execute()
-    return response   
\ No newline at end of file
+    return response
@@ -0,0 +1,129 @@
+"""
+Defines UserQueryResponseMemo, an optional, bounded cache of the results of processing and validating raw responses, for
+replayed and scripted workloads that give the same raw responses to commands of the same configuration over and over.
+
+A command uses a memo once it is given one with UserQueryCommand.SetResponseMemo(...). The memo keeps a separate least
+recently used (LRU) cache for each command configuration, as returned by the command's _getMemoConfiguration() (e.g.,
+the type of the command and its minimum and maximum), so that one memo can be shared by many commands, and commands of
+the same configuration share their cached results. A raw response found in the cache skips both
+_doProcessRawResponse(...) and _doValidateProcessedResponse(...). The number of configurations is bounded too, since a
+configuration includes values (e.g., a maximum) that may differ for every command, and the least recently used
+configuration is discarded, with all of its cached results, when there are too many.
+
+Only commands whose results depend on nothing but the raw response and their configuration can be memoized (e.g., not
+UserQueryCommandPathOpen, whose results depend on the file system). Their _getMemoConfiguration() returns None, and a memo
+is ignored by them.
+
+Exported Classes:
+    UserQueryResponseMemo -- Bounded LRU caches of (process result, validation result), one per command configuration, for a
+        bounded number of configurations.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+"""
+
+# Standard
+import threading
+from collections import OrderedDict
+
+# Local
+
+
+class UserQueryResponseMemo(object):
+    """
+    Bounded LRU caches, one per command configuration, that map a raw response to the results of processing and validating
+    it, themselves kept in a bounded LRU cache of configurations. Safe to share between threads.
+
+    Methods:
+        Get(...) -- Returns the cached (process result, validation result) for a raw response, or None.
+        Put(...) -- Caches the (process result, validation result) for a raw response.
+        GetStats() -- Returns the numbers of hits, misses, evictions, cached entries and configurations.
+        Clear() -- Discards all cached results, and resets the statistics.
+    """
+
+    def __init__(self, max_entries=1024, max_configurations=64):
+        """
+        :parameter max_entries: The maximum number of raw responses cached for each command configuration, int
+        :parameter max_configurations: The maximum number of command configurations that have cached raw responses, int
+        """
+        assert(max_entries > 0)
+        assert(max_configurations > 0)
+        self._max_entries = max_entries
+        self._max_configurations = max_configurations
+        # The cache of each configuration, in order from least to most recently used
+        self._caches = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def Get(self, configuration=None, raw_response=''):
+        """
+        :parameter configuration: The configuration of the command, hashable
+        :parameter raw_response: The raw response, hashable
+        :return: Tuple (process result, validation result), as Tuple (UserQueryResult, UserQueryResult or None), or None
+            if the raw response isn't cached. The validation result is None if the raw response couldn't be processed.
+        """
+        with self._lock:
+            cache = self._caches.get(configuration)
+            results = cache.get(raw_response) if cache is not None else None
+            if results is None:
+                self._misses += 1
+                return None
+            self._caches.move_to_end(configuration)
+            cache.move_to_end(raw_response)
+            self._hits += 1
+            return results
+
+    def Put(self, configuration=None, raw_response='', process_result=None, validate_result=None):
+        """
+        Cache the results for a raw response, discarding the least recently used raw response of the configuration if
+        there are already max_entries, and the least recently used configuration, with all of its raw responses, if there
+        are already max_configurations.
+        :parameter configuration: The configuration of the command, hashable
+        :parameter raw_response: The raw response, hashable
+        :parameter process_result: The result of _doProcessRawResponse(...), UserQueryResult
+        :parameter validate_result: The result of _doValidateProcessedResponse(...), UserQueryResult, or None if the raw
+            response couldn't be processed
+        :return: None
+        """
+        with self._lock:
+            cache = self._caches.get(configuration)
+            if cache is None:
+                cache = self._caches[configuration] = OrderedDict()
+                if len(self._caches) > self._max_configurations:
+                    (_, evicted_cache) = self._caches.popitem(last=False)
+                    self._evictions += len(evicted_cache)
+            else:
+                self._caches.move_to_end(configuration)
+            cache[raw_response] = (process_result, validate_result)
+            cache.move_to_end(raw_response)
+            if len(cache) > self._max_entries:
+                cache.popitem(last=False)
+                self._evictions += 1
+        return None
+
+    def GetStats(self):
+        """
+        :return: The statistics of the memo, with keys 'hits', 'misses', 'evictions' (the number of raw responses discarded,
+            including those of discarded configurations), 'entries' (the number of raw responses cached, for all
+            configurations) and 'configurations', dict
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                    'entries': sum(len(cache) for cache in self._caches.values()), 'configurations': len(self._caches)}
+
+    def Clear(self):
+        """
+        Discard all cached results, and reset the statistics.
+        :return: None
+        """
+        with self._lock:
+            self._caches.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+        return None
@@ -0,0 +1,215 @@
+"""
+Defines middleware, which adds cross-cutting stages (e.g., normalization, caching, metrics, auditing, rate limiting) around
+the raw response -> process -> validate flow of UserQueryCommand.Execute(...), for every command that uses a receiver,
+without subclassing each concrete command.
+
+Middleware is added to a receiver with UserQueryReceiver.AddMiddleware(...). Each time the middleware of a receiver changes,
+it is compiled into a UserQueryMiddlewarePipeline: for each stage, a flat tuple of just the hooks that the middleware
+overrides. Execute(...) then calls those hooks in a loop around the primitive operation, rather than through a chain of
+nested wrappers. A receiver without middleware has no pipeline, and Execute(...) calls the primitive operations directly.
+
+Exported Classes:
+    UserQueryMiddleware -- Base class for middleware, whose hooks do nothing. Children override the hooks they need.
+    UserQueryMiddlewarePipeline -- Middleware compiled into flat tuples of hooks, one tuple per stage.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+"""
+
+# Standard
+from types import MappingProxyType
+
+# Local
+from UserResponseCollector.UserQueryResult import asUserQueryResult
+
+
+# A shared, read-only empty dictionary, used as the default of dictionary parameters, so that a default can't be changed
+# by one call and then seen by every later call, in any thread. The other modules of the package import it from here.
+_EMPTY_DICT = MappingProxyType({})
+
+
+class UserQueryMiddleware(object):
+    """
+    Base class for middleware. Each hook is called with the command being executed, so that middleware can depend on the
+    type or configuration of the command. Children override only the hooks that they need; hooks that aren't overridden
+    are left out of the compiled pipeline, so they cost nothing.
+
+    Before... hooks are called in the order that the middleware was added to the receiver, and After... hooks in the reverse
+    order, so that the first middleware added is the outermost.
+
+    Methods:
+        BeforeGetRawResponse(...) -- Called before the raw response is requested, e.g., to rate limit or audit queries.
+        AfterGetRawResponse(...) -- Returns the raw response, possibly changed, e.g., normalized.
+        BeforeProcessRawResponse(...) -- Returns a UserQueryResult to use instead of processing the raw response, or None.
+        AfterProcessRawResponse(...) -- Returns the result of processing the raw response, possibly changed.
+        AfterValidateProcessedResponse(...) -- Returns the result of validating the processed response, possibly changed.
+        AfterQueryAbandoned(...) -- Called when a query ends with an exception, e.g., to reset state kept for the query.
+    """
+
+    def BeforeGetRawResponse(self, command=None, prompt_text='', extra=_EMPTY_DICT):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter prompt_text: The text that prompts the user for a response, string
+        :parameter extra: The extra dictionary passed to the receiver, dict
+        :return: None
+        """
+        return None
+
+    def AfterGetRawResponse(self, command=None, raw_response=''):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter raw_response: The raw response, string (or other object returned by command._doGetRawResponse(...),
+            e.g., a generator of lines for UserQueryCommandTable)
+        :return: The raw response to process
+        """
+        return raw_response
+
+    def BeforeProcessRawResponse(self, command=None, raw_response=''):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter raw_response: The raw response
+        :return: A UserQueryResult to use instead of calling command._doProcessRawResponse(...) (e.g., from a cache), or
+            None to process the raw response. The remaining Before... hooks are skipped if a result is returned, but the
+            After... hooks are still called.
+        """
+        return None
+
+    def AfterProcessRawResponse(self, command=None, raw_response='', result=None):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter raw_response: The raw response
+        :parameter result: The result of processing the raw response, UserQueryResult
+        :return: The result to use, UserQueryResult
+        """
+        return result
+
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter processed_response: The processed response
+        :parameter result: The result of validating the processed response, UserQueryResult
+        :return: The result to use, UserQueryResult
+        """
+        return result
+
+    def AfterQueryAbandoned(self, command=None, error=None):
+        """
+        Called when UserQueryCommand.Execute(...) ends with an exception instead of a response (e.g., because the query
+        was cancelled, timed out, or the receiver failed), so that state kept for the query can be reset, since none of
+        the hooks that follow a response will be called.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter error: The exception that ended the query, BaseException
+        :return: None
+        """
+        return None
+
+
+def _getHooks(middleware=(), name=''):
+    """
+    :parameter middleware: The middleware, in the order that the hooks are to be called, sequence of UserQueryMiddleware
+    :parameter name: The name of the hook, string
+    :return: The bound hooks, of the middleware that overrides the hook, tuple
+    """
+    default = getattr(UserQueryMiddleware, name)
+    return tuple(getattr(item, name) for item in middleware if getattr(type(item), name, default) is not default)
+
+
+class UserQueryMiddlewarePipeline(object):
+    """
+    Middleware compiled into flat tuples of hooks, one tuple per stage, so that Execute(...) can call them in a loop.
+
+    Methods:
+        GetMiddleware() -- Returns the middleware that the pipeline was compiled from.
+        WrapOperations(...) -- Returns the operations of a command, with the hooks called around them.
+        QueryAbandoned(...) -- Calls the AfterQueryAbandoned(...) hooks, for a query that ended with an exception.
+    """
+    __slots__ = ('_middleware', '_before_get', '_after_get', '_before_process', '_after_process', '_after_validate',
+                 '_after_abandoned')
+
+    def __init__(self, middleware=()):
+        """
+        :parameter middleware: The middleware, in the order that it was added, sequence of UserQueryMiddleware
+        """
+        self._middleware = tuple(middleware)
+        outermost_last = tuple(reversed(self._middleware))
+        self._before_get = _getHooks(self._middleware, 'BeforeGetRawResponse')
+        self._after_get = _getHooks(outermost_last, 'AfterGetRawResponse')
+        self._before_process = _getHooks(self._middleware, 'BeforeProcessRawResponse')
+        self._after_process = _getHooks(outermost_last, 'AfterProcessRawResponse')
+        self._after_validate = _getHooks(outermost_last, 'AfterValidateProcessedResponse')
+        self._after_abandoned = _getHooks(outermost_last, 'AfterQueryAbandoned')
+
+    def GetMiddleware(self):
+        """
+        :return: The middleware that the pipeline was compiled from, tuple of UserQueryMiddleware
+        """
+        return self._middleware
+
+    def WrapOperations(self, command=None, operations=()):
+        """
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter operations: The operations of the command, as returned by UserQueryCommand._getOperations(...)
+        :return: The operations, where those of stages with hooks call the hooks around the operation, tuple
+        """
+        (create_prompt_text, get_extra_dict, get_raw_response, process_raw_response, validate_processed_response,
+         issue_error_message) = operations
+        if self._before_get or self._after_get:
+            get_raw_response = self._wrapGetRawResponse(command, get_raw_response)
+        if self._before_process or self._after_process:
+            process_raw_response = self._wrapProcessRawResponse(command, process_raw_response)
+        if self._after_validate:
+            validate_processed_response = self._wrapValidateProcessedResponse(command, validate_processed_response)
+        return (create_prompt_text, get_extra_dict, get_raw_response, process_raw_response, validate_processed_response,
+                issue_error_message)
+
+    def QueryAbandoned(self, command=None, error=None):
+        """
+        Call the AfterQueryAbandoned(...) hooks, innermost middleware first, as the After... hooks are.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter error: The exception that ended the query, BaseException
+        :return: None
+        """
+        for hook in self._after_abandoned:
+            hook(command, error)
+        return None
+
+    def _wrapGetRawResponse(self, command=None, operation=None):
+        before_hooks = self._before_get
+        after_hooks = self._after_get
+        def get_raw_response(prompt_text='', extra=_EMPTY_DICT):
+            for hook in before_hooks:
+                hook(command, prompt_text, extra)
+            raw_response = operation(prompt_text, extra)
+            for hook in after_hooks:
+                raw_response = hook(command, raw_response)
+            return raw_response
+        return get_raw_response
+
+    def _wrapProcessRawResponse(self, command=None, operation=None):
+        before_hooks = self._before_process
+        after_hooks = self._after_process
+        def process_raw_response(raw_response=''):
+            result = None
+            for hook in before_hooks:
+                result = hook(command, raw_response)
+                if result is not None:
+                    break
+            if result is None:
+                result = operation(raw_response)
+            result = asUserQueryResult(result)
+            for hook in after_hooks:
+                result = hook(command, raw_response, result)
+            return result
+        return process_raw_response
+
+    def _wrapValidateProcessedResponse(self, command=None, operation=None):
+        after_hooks = self._after_validate
+        def validate_processed_response(processed_response=None):
+            result = asUserQueryResult(operation(processed_response))
+            for hook in after_hooks:
+                result = hook(command, processed_response, result)
+            return result
+        return validate_processed_response
@@ -0,0 +1,227 @@
+"""
+Defines a token bucket, and middleware that uses it to rate limit the queries of a receiver, and backs off exponentially
+when responses are rejected, so that an automated client that floods a shared receiver with invalid responses can't make
+UserQueryCommand.Execute(...) re-prompt and issue error messages as fast as the CPU allows.
+
+The middleware is attached to any receiver with UserQueryReceiver.AddMiddleware(...), e.g.:
+    receiver.AddMiddleware(UserQueryRateLimiter(rate=5.0, burst=10))
+
+Exported Classes:
+    UserQueryTokenBucket -- Token bucket, refilled at a steady rate up to a capacity, which is safe to share between threads.
+    UserQueryRateLimiter -- Middleware that takes a token before each raw response is requested, and waits, backing off
+        exponentially, before asking again after a response is rejected.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+"""
+
+# Standard
+import threading
+import time
+
+# Local
+from UserResponseCollector.UserQueryMiddleware import UserQueryMiddleware, _EMPTY_DICT
+
+
+class UserQueryTokenBucket(object):
+    """
+    Token bucket, refilled at rate tokens per second, up to capacity tokens. Taking a token when the bucket is empty
+    reserves the next token to be added, so that waiting callers are served in turn, and returns how long to wait for it.
+
+    Methods:
+        Reserve() -- Takes a token, returning the number of seconds to wait before using it.
+        TryAcquire() -- Takes a token if one is available without waiting, returning True if it was taken.
+    """
+
+    def __init__(self, rate=10.0, capacity=10, clock=time.monotonic):
+        """
+        :parameter rate: The number of tokens added per second, float
+        :parameter capacity: The maximum number of tokens in the bucket, which is the size of the largest burst, int
+        :parameter clock: Function that returns a monotonic time in seconds
+        """
+        assert(rate > 0 and capacity >= 1)
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Add the tokens for the time since the last refill. Must be called with self._lock held.
+        """
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def Reserve(self):
+        """
+        :return: The number of seconds to wait before the token taken may be used, float, 0.0 if one was available
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def TryAcquire(self):
+        """
+        :return: True if a token was available and was taken, boolean
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class UserQueryRateLimiter(UserQueryMiddleware):
+    """
+    Middleware that takes a token from a UserQueryTokenBucket before each raw response is requested, waiting if there is
+    none, and, after a response is rejected, waits before asking again, doubling the wait for each further rejection in a
+    row (exponential backoff), up to a maximum. An accepted response resets the backoff, as does a query that ends with an
+    exception (e.g., cancelled, or timed out), so that the next query in the thread doesn't pay for the rejections of an
+    abandoned one. Waits end early, raising UserQueryReceiverTerminateQueryingThreadError, if the query's cancellation token
+    is cancelled.
+
+    Rejections in a row are counted separately for each thread, so that one misbehaving client doesn't slow the others,
+    while the token bucket is shared, limiting the rate of all of them together.
+
+    Methods:
+        GetStats() -- Returns the counts of attempts, throttled attempts and backoffs, and the time spent waiting.
+        ResetStats() -- Sets the counts and times to zero.
+    """
+
+    def __init__(self, rate=10.0, burst=10, backoff_base=0.1, backoff_max=5.0, clock=time.monotonic, sleep=time.sleep):
+        """
+        :parameter rate: The maximum steady number of raw responses requested per second, float
+        :parameter burst: The number of raw responses that may be requested at once, before the rate applies, int
+        :parameter backoff_base: The wait, in seconds, after the first rejected response, float, or 0 for no backoff
+        :parameter backoff_max: The longest wait, in seconds, after rejected responses, float
+        :parameter clock: Function that returns a monotonic time in seconds
+        :parameter sleep: Function that waits for a number of seconds, used when there is no cancellation token
+        """
+        self._bucket = UserQueryTokenBucket(rate, burst, clock)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._sleep = sleep
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.ResetStats()
+
+    def GetStats(self):
+        """
+        :return: The statistics, with keys 'attempts' (raw responses requested), 'throttled' (requests that waited for a
+            token), 'throttled_seconds', 'backoffs' (requests that waited after a rejected response) and 'backoff_seconds', dict
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def ResetStats(self):
+        """
+        Set the counts and times to zero.
+        :return: None
+        """
+        with self._lock:
+            self._stats = {'attempts': 0, 'throttled': 0, 'throttled_seconds': 0.0, 'backoffs': 0, 'backoff_seconds': 0.0}
+        return None
+
+    def _count(self, **increments):
+        """
+        Add to the statistics, under the lock, since the limiter may be shared by threads.
+        :parameter increments: The amount added to each statistic, keyed by the name of the statistic, int or float
+        :return: None
+        """
+        with self._lock:
+            for (key, increment) in increments.items():
+                self._stats[key] += increment
+        return None
+
+    def _wait(self, seconds=0.0, extra=_EMPTY_DICT):
+        """
+        Wait, ending early if the cancellation token in extra is cancelled.
+        :parameter seconds: The time to wait, float
+        :parameter extra: The extra dictionary of the query, dict
+        Raises UserQueryReceiverTerminateQueryingThreadError if the query is cancelled.
+        """
+        cancellation_token = extra.get('cancellation_token')
+        if cancellation_token is None:
+            self._sleep(seconds)
+        elif cancellation_token.Wait(seconds):
+            cancellation_token.RaiseIfCancelled()
+
+    def _getBackoff(self):
+        """
+        :return: The wait after the rejected responses in a row in this thread, in seconds, float
+        """
+        rejections = getattr(self._local, 'rejections', 0)
+        if rejections == 0 or self._backoff_base <= 0:
+            return 0.0
+        return min(self._backoff_max, self._backoff_base * 2 ** (rejections - 1))
+
+    def BeforeGetRawResponse(self, command=None, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Overrides UserQueryMiddleware.BeforeGetRawResponse(...). Wait after rejected responses in a row in this thread,
+        backing off, then wait for a token from the bucket.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter prompt_text: The text that prompts the user for a response, string
+        :parameter extra: The extra dictionary passed to the receiver, dict, whose 'cancellation_token' ends the waits
+        :return: None
+        Raises UserQueryReceiverTerminateQueryingThreadError if the query is cancelled while waiting.
+        """
+        self._count(attempts=1)
+        backoff = self._getBackoff()
+        if backoff > 0:
+            self._count(backoffs=1, backoff_seconds=backoff)
+            self._wait(backoff, extra)
+        throttle = self._bucket.Reserve()
+        if throttle > 0:
+            self._count(throttled=1, throttled_seconds=throttle)
+            self._wait(throttle, extra)
+        return None
+
+    def AfterProcessRawResponse(self, command=None, raw_response='', result=None):
+        """
+        Overrides UserQueryMiddleware.AfterProcessRawResponse(...). Count a raw response that couldn't be processed as
+        rejected.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter raw_response: The raw response
+        :parameter result: The result of processing the raw response, UserQueryResult
+        :return: The result, unchanged, UserQueryResult
+        """
+        if result.value is None:
+            self._local.rejections = getattr(self._local, 'rejections', 0) + 1
+        return result
+
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        """
+        Overrides UserQueryMiddleware.AfterValidateProcessedResponse(...). Reset the backoff if the response is accepted,
+        or count it as rejected.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter processed_response: The processed response
+        :parameter result: The result of validating the processed response, UserQueryResult
+        :return: The result, unchanged, UserQueryResult
+        """
+        if result.value:
+            self._local.rejections = 0
+        else:
+            self._local.rejections = getattr(self._local, 'rejections', 0) + 1
+        return result
+
+    def AfterQueryAbandoned(self, command=None, error=None):
+        """
+        Overrides UserQueryMiddleware.AfterQueryAbandoned(...). Reset the backoff of this thread, since the rejections in
+        a row belonged to a query that has ended.
+        :parameter command: The command being executed, UserQueryCommand
+        :parameter error: The exception that ended the query, BaseException
+        :return: None
+        """
+        self._local.rejections = 0
+        return None
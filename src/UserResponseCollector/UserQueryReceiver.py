@@ -5,11 +5,17 @@ Following the Command design pattern, the Receiver participant interface is defi
 
 Exported Classes:
     UserQueryReceiver -- Interface (abstract base) class for Receiver.
-    ConsoleUserQueryReceiver -- Concrete UserQueryReceiver that obtains raw (text) responses from user from a Console window.
+    ConsoleUserQueryReceiver -- Concrete UserQueryReceiver that obtains raw (text) responses from user from a Console window, or from a pipe when headless.
+    BytesConsoleUserQueryReceiver -- Concrete ConsoleUserQueryReceiver that reads raw responses as undecoded bytes, in large chunks, from a pipe.
+    ReadlineConsoleUserQueryReceiver -- Concrete ConsoleUserQueryReceiver with tab completion of menu keys and paths, and history per type of query.
+    CursesUserQueryReceiver -- Concrete ConsoleUserQueryReceiver that shows menus as a scrollable, filterable list, using curses.
+    RawConsoleUserQueryReceiver -- Concrete ConsoleUserQueryReceiver that checks each keystroke as it is typed, in raw terminal mode.
+    UserQueryCancellationToken -- Token used to cancel queries that are waiting for the user, from another thread.
 
 Exported Exceptions:
     UserQueryReceiverError -- Base exception class from which all custom exceptions specific to UserQueryReceiver should be derived.
     UserQueryReceiverTerminateQueryingThreadError -- Concrete custom exception raised if the UserQueryReceiver wants the querying Client to terminate.
+    UserQueryReceiverTimeoutError -- Concrete custom exception raised if the user does not respond within the receiver's timeout.
  
 Exported Functions:
     UserQueryReceiver_GetCommandReceiver -- Global prebound method that returns the global, single instance of a concrete UserQueryReceiver.
@@ -20,14 +26,63 @@ Exported Functions:
 
 # Standard
 import sys
+import os
 import logging
+import atexit
+import bisect
+import json
+import select
+import time
+import threading
+import weakref
 
 # Local
+import UserResponseCollector.DirectoryIndex
+import UserResponseCollector.UserQueryMiddleware
+from UserResponseCollector.UserQueryMiddleware import _EMPTY_DICT
 
 # TODO: Remove or comment out debug print for release. This was added to help understand
 # and debug package import behavior.
 # print("In module UserQueryReceiver sys.path[0], __package__ ==", sys.path[0], __package__)
 
+# Guards the set up of the logger shared by all receivers
+_logging_lock = threading.Lock()
+
+# The receivers to flush at exit, held by weak references, so that a receiver isn't kept alive until exit just to be flushed.
+# One exit handler flushes them all, registered when the first is added. See _flushAtExit(...).
+_receivers_to_flush = weakref.WeakSet()
+_receivers_to_flush_lock = threading.Lock()
+_receivers_to_flush_registered = False
+
+
+def _flushAtExit(receiver=None):
+    """
+    Flush receiver at exit, unless it has been garbage collected before then (which flushes it anyway, see
+    ConsoleUserQueryReceiver.__del__()). Only one exit handler is registered, however many receivers are added.
+    :parameter receiver: The receiver, UserQueryReceiver
+    :return: None
+    """
+    global _receivers_to_flush_registered
+    with _receivers_to_flush_lock:
+        _receivers_to_flush.add(receiver)
+        if not _receivers_to_flush_registered:
+            atexit.register(_flushReceiversAtExit)
+            _receivers_to_flush_registered = True
+    return None
+
+
+def _flushReceiversAtExit():
+    """
+    The exit handler registered by _flushAtExit(...), which flushes each receiver added that is still alive.
+    :return: None
+    """
+    with _receivers_to_flush_lock:
+        receivers = list(_receivers_to_flush)
+    for receiver in receivers:
+        receiver.Flush()
+    return None
+
+
 class UserQueryReceiverError(Exception):
     """
     Base exception class for all custom exceptions specific to UserQueryReceiver.
@@ -50,6 +105,122 @@ class UserQueryReceiverTerminateQueryingThreadError(UserQueryReceiverError):
         super().__init__(*args)
 
 
+def _closeFileDescriptors(*fds):
+    """
+    Close file descriptors, as the finalizer of an object that owns them, which must not refer to the object itself.
+    :parameter fds: The file descriptors, ints
+    :return: None
+    """
+    for fd in fds:
+        os.close(fd)
+    return None
+
+
+class UserQueryCancellationToken(object):
+    """
+    Token used to cancel queries from another thread, e.g., when a service shuts down, or a request is abandoned.
+
+    Pass the token to UserQueryCommand.Execute(...). When Cancel() is called, a receiver waiting for the user wakes up and raises
+    UserQueryReceiverTerminateQueryingThreadError, so that the querying thread is released at once. A token may be shared by
+    many queries, and once cancelled, stays cancelled. The pipe used to wake waiting receivers is closed by Close(), by the
+    with statement, or, failing those, when the token is garbage collected.
+
+    Methods:
+        Cancel() -- Cancel the queries using this token.
+        IsCancelled() -- Returns True if Cancel() has been called.
+        RaiseIfCancelled() -- Raise UserQueryReceiverTerminateQueryingThreadError if Cancel() has been called.
+        Wait(...) -- Wait until Cancel() is called, or a timeout expires.
+        GetWakeFileDescriptor() -- Returns a file descriptor that becomes readable when Cancel() is called, for use with select().
+        Close() -- Release the file descriptors used to wake waiting receivers.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        # Pipe whose read end becomes readable when cancelled, created only when a receiver needs to wait on it, and the
+        # finalizer that closes it
+        self._wake_read = None
+        self._wake_write = None
+        self._wake_finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+        return False
+
+    def Cancel(self):
+        """
+        Cancel the queries using this token, waking any receiver that is waiting for the user.
+            :return: None
+        """
+        with self._lock:
+            self._event.set()
+            if self._wake_write is not None:
+                os.write(self._wake_write, b'x')
+        return None
+
+    def IsCancelled(self):
+        """
+        :return: True if Cancel() has been called, boolean
+        """
+        return self._event.is_set()
+
+    def RaiseIfCancelled(self):
+        """
+        Raises UserQueryReceiverTerminateQueryingThreadError if Cancel() has been called.
+            :return: None
+        """
+        if self._event.is_set():
+            raise UserQueryReceiverTerminateQueryingThreadError('The query was cancelled')
+        return None
+
+    def Wait(self, timeout=None):
+        """
+        Wait until Cancel() is called, or timeout expires.
+        :parameter timeout: The maximum time to wait in seconds, float, or None to wait as long as needed
+        :return: True if cancelled, boolean
+        """
+        return self._event.wait(timeout)
+
+    def GetWakeFileDescriptor(self):
+        """
+        :return: A file descriptor that becomes readable when Cancel() is called (or already is, if it has been), int
+        """
+        with self._lock:
+            if self._wake_read is None:
+                (self._wake_read, self._wake_write) = os.pipe()
+                # Close the pipe when the token is garbage collected, if Close() is never called, so that a service creating
+                # a token per request doesn't leak file descriptors
+                self._wake_finalizer = weakref.finalize(self, _closeFileDescriptors, self._wake_read, self._wake_write)
+                if self._event.is_set():
+                    os.write(self._wake_write, b'x')
+            return self._wake_read
+
+    def Close(self):
+        """
+        Release the file descriptors used to wake waiting receivers. The token stays cancelled, if it was.
+            :return: None
+        """
+        with self._lock:
+            if self._wake_finalizer is not None:
+                # Calling the finalizer closes the pipe, and stops it from being called again when the token is collected
+                self._wake_finalizer()
+            self._wake_read = None
+            self._wake_write = None
+            self._wake_finalizer = None
+        return None
+
+
+class UserQueryReceiverTimeoutError(UserQueryReceiverError):
+    """
+    Custom exception to be raised if the user does not respond within the UserQueryReceiver's timeout, so that the query
+    (command pattern) Client can substitute its default response.
+    """
+    pass
+
+
 class UserQueryReceiver(object):
     """
     Interface (abstract base) class for Receiver of user input query.
@@ -59,10 +230,27 @@ class UserQueryReceiver(object):
     
     Each child must by convention and necessity implement these methods:
         GetCommandReceiver() -- Returns self. NOT an abstract method. Typically should NOT be overridden.
+        GetRawResponseBlock(...) -- Obtain from the user a multi-line raw response, one line at a time. NOT an abstract method. May be overridden.
+        GetRawResponseChunks(...) -- Obtain from the user a multi-line raw response, in chunks of text. NOT an abstract method. May be overridden.
+        GetRawResponseUndecoded(...) -- Obtain from the user their raw response, without decoding it to a string if possible. NOT an abstract method. May be overridden.
         GetRawResponse(...) -- Obtain from the user their actual raw response as a string of text, for example, typed into a console window. 
         IssueErrorMessage(...) -- Inform the user that their raw response does not meet requirements, for example, by printing to a console window.
+        Flush() -- Make sure any buffered output has been shown to the user. NOT an abstract method. Must be overridden by children that buffer output.
+        ReportDefaultResponse(...) -- Record and log that a default response was used because the user didn't respond. NOT an abstract method.
+        GetDefaultResponseReports() -- Returns the default responses used so far. NOT an abstract method.
+        AddMiddleware(...) -- Add middleware around the flow of every command executed with this receiver. NOT an abstract method.
+        RemoveMiddleware(...) -- Remove middleware added with AddMiddleware(...). NOT an abstract method.
+        GetMiddlewarePipeline() -- Returns the compiled middleware, or None if there is none. NOT an abstract method.
+
+    Children that support a timeout should only apply it when extra includes 'default_response' (as passed by a command that has
+    a default response), and should raise UserQueryReceiverTimeoutError when it expires.
+    Children should honor the UserQueryCancellationToken passed as extra['cancellation_token'] (see UserQueryCommand.Execute(...)),
+    raising UserQueryReceiverTerminateQueryingThreadError as soon as it is cancelled, even while waiting for the user.
     """
 
+    # Middleware compiled by AddMiddleware(...), or None if there is none
+    _middleware_pipeline = None
+
     def __init__(self, log_level = logging.INFO):
         """
         Set up logging for this class. Log a DEBUG message when instaniated, which should only ever happen once,
@@ -73,6 +261,10 @@ class UserQueryReceiver(object):
         # Get the logger 'user_query_receiver_logger'
         logger = logging.getLogger('user_query_receiver_logger')
         logger.debug(f"Instaniating: {type(self)}, ID: {id(self)}")
+        # Default responses used because the user didn't respond, as list of Tuple (query type name, default response)
+        self._default_reports = []
+        # Guards the default response reports and the middleware, which may be changed by several threads at once
+        self._lock = threading.Lock()
             
     def GetCommandReceiver(self):
         """
@@ -81,7 +273,7 @@ class UserQueryReceiver(object):
         """
         return self
     
-    def GetRawResponse(self, prompt_text='', extra={}):
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
         """
         This is an abstract method that MUST be implemented by children. If called, it will raise NotImplementedError
         Called to obtain a raw response from the user, which will always be a sting of text.
@@ -94,40 +286,335 @@ class UserQueryReceiver(object):
         raise NotImplementedError
         return raw_response
     
+    def GetRawResponseBlock(self, prompt_text='', extra=_EMPTY_DICT, terminator=''):
+        """
+        This is a concrete method, built on GetRawResponse(...), that children MAY override.
+        Called to obtain a multi-line raw response from the user, one line at a time. Lines are produced lazily, so that the
+        caller can process each line as soon as it is available. The block ends when the user enters a line equal to terminator,
+        or when no more input is available after at least one line of the block.
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+            This is only shown before the first line of the block.
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: Clients must assume that the UserQueryReceiver implementation may ignore this parameter.
+        :parameter terminator: Line of text (default='', i.e., a blank line) that ends the block, string
+        :return: Generator of raw response lines, not including the terminator line, as generator of strings
+        Raises EOFError if there is no more input before the first line of the block, as input() does, so that a command
+        doesn't ask again, forever, for a block that can never arrive.
+        """
+        yield from _readBlockLines(self.GetRawResponse, prompt_text, extra, terminator)
+
+    def GetRawResponseChunks(self, prompt_text='', extra=_EMPTY_DICT, terminator='.', chunk_size=8192):
+        """
+        This is a concrete method, built on GetRawResponseBlock(...), that children MAY override.
+        Called to obtain a multi-line raw response from the user, as a sequence of chunks of text, so that a long response
+        never needs to be held in memory all at once. The block ends when the user enters a line equal to terminator,
+        or when no more input is available after at least one line of the block. This base implementation produces one chunk
+        per line; children should override it to limit the size of each chunk to chunk_size.
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: Clients must assume that the UserQueryReceiver implementation may ignore this parameter.
+        :parameter terminator: Line of text (default='.') that ends the block, string
+        :parameter chunk_size: The maximum number of characters in each chunk, int
+        :return: Generator of chunks of the raw response, including line endings, as generator of strings
+        Raises EOFError if there is no more input before the first line of the block, as GetRawResponseBlock(...) does.
+        """
+        for line in self.GetRawResponseBlock(prompt_text, extra, terminator):
+            yield line + '\n'
+
+    def GetRawResponseUndecoded(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        This is a concrete method, built on GetRawResponse(...), that children MAY override.
+        Called to obtain a raw response from the user, without decoding it to a string, if the child is able to read bytes.
+        Intended for commands, such as UserQueryCommandNumberInteger, whose conversion (e.g., int()) accepts bytes as well as strings.
+        This base implementation returns the string from GetRawResponse(...).
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: Clients must assume that the UserQueryReceiver implementation may ignore this parameter.
+        :return: Raw response, as string, or bytes-like object (e.g., memoryview) without line ending
+        """
+        return self.GetRawResponse(prompt_text, extra)
+
     def IssueErrorMessage(self, msg=''):
         """
         This is an abstract method that MUST be implemented by children. If called, it will raise NotImplementedError
         Called to inform the user that their raw response does not meet requirements.
-            :parameter msg: Error message (default='') to be shown to the user, string
+            :parameter msg: Error message (default='') to be shown to the user, string, or UserQueryResult, which is only
+                rendered into its message with str(...) when it is shown
             :return: None       
         """
         raise NotImplementedError
         return None
 
+    def Flush(self):
+        """
+        This is a concrete method that children which buffer their output MUST override.
+        Called at an explicit flush point, to make sure that any buffered prompts and error messages have been shown to the user.
+        This base implementation does nothing, since the base receiver buffers nothing.
+            :return: None
+        """
+        return None
+
+    def ReportDefaultResponse(self, prompt_text='', default_response='', extra=_EMPTY_DICT):
+        """
+        This is a concrete method that children MAY extend.
+        Called when the user did not respond within the timeout, and a default response was used instead, to record it, and
+        log it as a warning.
+        :parameter prompt_text: The text that prompted the user for a response, string
+        :parameter default_response: The default response that was used, string
+        :parameter extra: The dictionary of extra key/value pairs for the query, dict
+        :return: None
+        """
+        query_type = extra.get('query_type')
+        name = query_type.__name__ if query_type is not None else ''
+        with self._lock:
+            self._default_reports.append((name, default_response))
+        # The first line of the prompt is usually the query preface, which identifies the question
+        question = prompt_text.strip().split('\n')[0]
+        logger = logging.getLogger('user_query_receiver_logger')
+        logger.warning(f"No response within the timeout. Using the default response '{default_response}' for: {question}")
+        return None
+
+    def GetDefaultResponseReports(self):
+        """
+        This is a concrete method. Returns the default responses used so far because the user didn't respond.
+        :return: List of Tuple (query type name, default response)
+        """
+        with self._lock:
+            return list(self._default_reports)
+
+    def AddMiddleware(self, middleware=None):
+        """
+        This is a concrete method. Add middleware around the raw response -> process -> validate flow of every command
+        executed with this receiver. The middleware of the receiver is compiled into a UserQueryMiddlewarePipeline each
+        time that it changes, rather than each time that a command is executed.
+        :parameter middleware: The middleware, UserQueryMiddleware. Its Before... hooks are called after those of
+            middleware added earlier, and its After... hooks before them.
+        :return: self, so that calls can be chained
+        """
+        with self._lock:
+            current = self.GetMiddlewarePipeline()
+            added = (current.GetMiddleware() if current is not None else ()) + (middleware,)
+            self._middleware_pipeline = UserResponseCollector.UserQueryMiddleware.UserQueryMiddlewarePipeline(added)
+        return self
+
+    def RemoveMiddleware(self, middleware=None):
+        """
+        This is a concrete method. Remove middleware added with AddMiddleware(...).
+        :parameter middleware: The middleware, UserQueryMiddleware
+        :return: None
+        Raises ValueError if the middleware was not added.
+        """
+        with self._lock:
+            current = self.GetMiddlewarePipeline()
+            remaining = list(current.GetMiddleware() if current is not None else ())
+            remaining.remove(middleware)
+            if remaining:
+                self._middleware_pipeline = UserResponseCollector.UserQueryMiddleware.UserQueryMiddlewarePipeline(remaining)
+            else:
+                self._middleware_pipeline = None
+        return None
+
+    def GetMiddlewarePipeline(self):
+        """
+        This is a concrete method.
+        :return: The compiled middleware of the receiver, UserQueryMiddlewarePipeline, or None if there is none. A pipeline
+            is never changed once compiled, so it may be used while another thread adds or removes middleware.
+        """
+        return self._middleware_pipeline
+
     def _setup_logging(self, log_level=logging.INFO):
         """
-        This method configures logging.
+        This method configures logging. The logger is shared by all receivers, so its stream handler is only added by the
+        first receiver instantiated, even if several are instantiated at once by different threads.
         :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
         :return: None
         """
         # Create a logger with name 'user_query_receiver_logger'. This is NOT the root logger, which is one level up from here, and has no name.
         logger = logging.getLogger('user_query_receiver_logger')
-        # This is the threshold level for the logger itself, before it will pass to any handlers, which can have their own threshold.
-        # Should be able to control here what the stream handler receives and thus what ends up going to stderr.
-        # Use this key for now:
-        #   DEBUG = debug messages sent to this logger will end up on stderr
-        #   INFO = info messages sent to this logger will end up on stderr
-        logger.setLevel(log_level)
-        # Set up this highest level below root logger with a stream handler
-        sh = logging.StreamHandler()
-        # Set the threshold for the stream handler itself, which will come into play only after the logger threshold is met.
-        sh.setLevel(log_level)
-        # Add the stream handler to the logger
-        logger.addHandler(sh)
+        with _logging_lock:
+            # This is the threshold level for the logger itself, before it will pass to any handlers, which can have their own threshold.
+            # Should be able to control here what the stream handler receives and thus what ends up going to stderr.
+            # Use this key for now:
+            #   DEBUG = debug messages sent to this logger will end up on stderr
+            #   INFO = info messages sent to this logger will end up on stderr
+            logger.setLevel(log_level)
+            # Set up this highest level below root logger with a stream handler, unless a receiver already has
+            sh = next((handler for handler in logger.handlers if getattr(handler, '_user_query_receiver', False)), None)
+            if sh is None:
+                sh = logging.StreamHandler()
+                sh._user_query_receiver = True
+                # Add the stream handler to the logger
+                logger.addHandler(sh)
+            # Set the threshold for the stream handler itself, which will come into play only after the logger threshold is met.
+            sh.setLevel(log_level)
             
         return None
     
     
+def _readBlockLines(read_line=None, prompt_text='', extra=_EMPTY_DICT, terminator=''):
+    """
+    Read the lines of a block, as UserQueryReceiver.GetRawResponseBlock(...) does, with read_line.
+    :parameter read_line: Function, called as read_line(prompt_text, extra), that returns the next line, without line ending,
+        string, or raises EOFError if there is no more input
+    :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        This is only shown before the first line of the block.
+    :parameter extra: Dictionary of extra key/value pairs passed to read_line, dict
+    :parameter terminator: Line of text that ends the block, string
+    :return: Generator of lines, not including the terminator line, as generator of strings
+    Raises EOFError if there is no more input before the first line of the block.
+    """
+    line_prompt = prompt_text
+    at_block_start = True
+    while True:
+        try:
+            line = read_line(line_prompt, extra)
+        except EOFError:
+            if at_block_start:
+                raise
+            # No more input is available, so treat it as the end of the block
+            return
+        at_block_start = False
+        if line == terminator:
+            return
+        yield line
+        line_prompt = ''
+
+
+def _waitReadable(stream=None, timeout=None, cancellation_token=None):
+    """
+    Wait until stream has input to read, timeout expires, or cancellation_token is cancelled.
+    Only input not yet read from the file descriptor of stream is seen, so input that a text stream has already read ahead
+    must be taken first, e.g., with _readBuffered(...).
+    :parameter stream: The stream, e.g., sys.stdin
+    :parameter timeout: The maximum time to wait in seconds, float, or None to wait as long as needed
+    :parameter cancellation_token: Token that stops the wait when cancelled, UserQueryCancellationToken, or None
+    :return: True if stream has input, or can't be waited on (e.g., io.StringIO, or stdin on Windows), otherwise False
+    Raises UserQueryReceiverTerminateQueryingThreadError if cancellation_token is cancelled.
+    """
+    if cancellation_token is not None:
+        cancellation_token.RaiseIfCancelled()
+    elif timeout is None:
+        return True
+    try:
+        fds = [stream.fileno()]
+        if cancellation_token is not None:
+            fds.append(cancellation_token.GetWakeFileDescriptor())
+        (ready, _, _) = select.select(fds, [], [], max(0.0, timeout) if timeout is not None else None)
+    except (AttributeError, OSError, ValueError):
+        # An in-memory stream always has its input ready, and select() only works for sockets on Windows
+        return True
+    if cancellation_token is not None:
+        cancellation_token.RaiseIfCancelled()
+    return len(ready) > 0
+
+
+def _readBuffered(stream=None, size=-1):
+    """
+    Read the next line from a text stream (e.g., sys.stdin) without waiting for input: a TextIOWrapper reading a pipe
+    reads ahead, and holds lines that select() can't see, since they have already been read from its file descriptor.
+    :parameter stream: The text stream
+    :parameter size: The maximum number of characters to read, int, or -1 for no limit
+    :return: The next line, including line ending, or as much of it as is available, string, which is '' if nothing is
+        available. Always '' for a terminal, which delivers one line per read, so never holds lines read ahead, or for a
+        stream without a file descriptor (e.g., io.StringIO), whose input is always ready to be read anyway.
+    """
+    try:
+        fd = stream.fileno()
+        if stream.isatty():
+            return ''
+        was_blocking = os.get_blocking(fd)
+        # Non-blocking mode only lasts for this read, so that it can't be seen by other readers of the pipe
+        os.set_blocking(fd, False)
+    except (AttributeError, OSError, ValueError):
+        # Not a stream with a file descriptor, or one whose mode can't be changed (e.g., a pipe before Python 3.12 on Windows)
+        return ''
+    try:
+        return stream.readline(size)
+    except (BlockingIOError, TypeError):
+        # Some streams report that nothing is available with an error, rather than by returning ''
+        return ''
+    finally:
+        os.set_blocking(fd, was_blocking)
+
+
+class _ReadAheadLineReader(object):
+    """
+    Reads lines from a stream, requesting large chunks at a time, so that answers already waiting in a pipe are consumed
+    in bulk rather than with one read per line. For a binary stream each line is returned as a memoryview of the chunk,
+    so that lines are split without copying. Only the partial line left at the end of a chunk is copied, when the next
+    chunk is read. A text stream (e.g., io.StringIO) is also accepted, in which case each line is returned as a string.
+    """
+
+    def __init__(self, stream=None, chunk_size=65536):
+        """
+        :parameter stream: The binary or text stream to read from, e.g., sys.stdin.buffer
+        :parameter chunk_size: The maximum number of bytes (or characters) to request from stream at a time, int
+        """
+        # Prefer read1(), which returns whatever is available, rather than blocking until chunk_size bytes have arrived
+        self._stream = stream
+        self._read = getattr(stream, 'read1', stream.read)
+        self._chunk_size = chunk_size
+        self._chunk = b''
+        self._view = memoryview(self._chunk)
+        self._newline = b'\n'
+        self._cr = b'\r'
+        self._pos = 0
+        self._eof = False
+
+    def ReadLine(self, timeout=None, cancellation_token=None):
+        """
+        Returns the next line, without line ending. Raises EOFError if there are no more lines.
+        :parameter timeout: The maximum time to wait for the line in seconds, float, or None to wait as long as needed.
+            Raises UserQueryReceiverTimeoutError if the line has not arrived in time.
+        :parameter cancellation_token: Token that stops the wait when cancelled, UserQueryCancellationToken, or None.
+            Raises UserQueryReceiverTerminateQueryingThreadError if it is cancelled before the line has arrived.
+        :return: The next line, as memoryview of bytes for a binary stream, or as string for a text stream
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            end = self._chunk.find(self._newline, self._pos)
+            if end >= 0:
+                start = self._pos
+                self._pos = end + 1
+                if end > start and self._chunk.startswith(self._cr, end-1):
+                    # Drop the '\r' of a '\r\n' line ending
+                    end -= 1
+                return self._view[start:end]
+            if self._eof:
+                if self._pos < len(self._chunk):
+                    # Last line, without line ending
+                    start = self._pos
+                    self._pos = len(self._chunk)
+                    return self._view[start:]
+                raise EOFError
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if not _waitReadable(self._stream, remaining, cancellation_token):
+                raise UserQueryReceiverTimeoutError(f"No response within {timeout} seconds")
+            self._fill()
+
+    def _fill(self):
+        """
+        Read the next chunk from the stream, keeping any partial line left over from the current chunk.
+        :return: None
+        """
+        data = self._read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return None
+        remainder = self._chunk[self._pos:]
+        if isinstance(data, str):
+            self._chunk = remainder + data if remainder else data
+            # Slicing a string copies it anyway, so there is no need for a memoryview
+            self._view = self._chunk
+            self._newline = '\n'
+            self._cr = '\r'
+        else:
+            self._chunk = remainder + data if remainder else bytes(data)
+            self._view = memoryview(self._chunk)
+        self._pos = 0
+        return None
+
+
 class ConsoleUserQueryReceiver(UserQueryReceiver):
     """
     Implements Reciever for user input provided in a Console window.
@@ -135,19 +622,112 @@ class ConsoleUserQueryReceiver(UserQueryReceiver):
     Following the Command design pattern, this is a concrete implementation of a UserQueryReceiver, that a concrete UserQueryCommand object
     can use to obtain raw (text) responses from the user through a console window.
 
+    With headless=True (e.g., when answers are piped in by a script, and nothing else reads stdin), the receiver runs headless:
+    answers are read ahead from sys.stdin.buffer in large chunks rather than with one input() call each, and prompts are not
+    written (or are written to prompt_stream). Otherwise, even when stdin is not a terminal, each answer is read with one line
+    from sys.stdin, so that the client can also read sys.stdin itself, before or after a query.
+
     Methods:
         GetRawResponse(...) --- Obtain from the user their actual raw response as a string of text typed into a console window.
+        GetRawResponseChunks(...) --- Obtain from the user a multi-line raw response typed into a console window, in chunks of limited size.
+        GetRawResponseUndecoded(...) --- When headless, obtain the next answer without decoding it to a string.
         IssueErrorMessage(...) -- Inform the user that their raw response does not meet requirements, by printing message to a console window.
+        IsHeadless() -- Returns True if answers are read ahead from a pipe or file, rather than one line at a time.
+        Flush() -- Write any buffered prompts and error messages.
+
+    With buffer_output=True, prompts and error messages are collected in a buffer and written together, with one write per stream,
+    only when input is actually needed from the user, when the buffer is full, at an explicit Flush(), or at exit.
+    When headless, input is never needed from the user, so output is written only when the buffer is full, at Flush(), or at exit.
+
+    With a timeout, a query that has a default response (extra includes 'default_response') raises UserQueryReceiverTimeoutError
+    if no response arrives within timeout seconds, so that the command uses its default. Waiting for input with a timeout
+    requires select() to work on stdin, which is not the case on Windows, where the receiver waits as long as needed.
+
+    A receiver may be shared by several threads. Buffered output and reading from stdin are each guarded by a lock, so that
+    each response is read by exactly one query, and queries that need input wait their turn for it. All the lines of a block
+    (see GetRawResponseBlock(...) and GetRawResponseChunks(...)) are read under one hold of the input lock, so that a query in
+    another thread can't take lines from the middle of the block.
     """
 
-    def __init__(self, log_level = logging.INFO):
+    def __init__(self, log_level = logging.INFO, headless = False, prompt_stream = None, chunk_size = 65536, buffer_output = False, output_buffer_size = 65536,
+                 timeout = None):
         """
         Extends UserQueryReceiver.__init__().
         :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
+        :param headless: True to read ahead from stdin in large chunks, without writing prompts, or False (default) to read
+            each response with one line from sys.stdin, as input() does. Read ahead only if nothing else reads stdin, since
+            the lines read ahead are no longer available from sys.stdin.
+        :param prompt_stream: The text stream to write prompts to when headless, e.g., sys.stderr. If None, then prompts are not written.
+        :param chunk_size: The maximum number of bytes to read from stdin at a time when headless, int
+        :param buffer_output: If True, prompts and error messages are buffered, and written together, boolean
+        :param output_buffer_size: The number of buffered characters at which output is written, even if input is not needed, int
+        :param timeout: The time in seconds to wait for a response to a query that has a default response, float,
+            or None (default) to wait as long as needed.
         """
         UserQueryReceiver.__init__(self, log_level)
+        self._timeout = timeout
+        self._buffer_output = buffer_output
+        self._output_buffer_size = output_buffer_size
+        # Buffered output, as list of (stream, list of strings), with consecutive output to the same stream kept together
+        self._pending_output = []
+        self._pending_output_size = 0
+        # Guards the buffered output. Reentrant, since adding to a full buffer flushes it.
+        self._output_lock = threading.RLock()
+        # Guards reading from stdin, so that each line, and each block of lines, is read by exactly one query. Not reentrant,
+        # so methods called with it held (e.g., _readResponseLine(...)) must not take it again.
+        self._input_lock = threading.Lock()
+        if buffer_output:
+            # Make sure nothing buffered is lost if the client never calls Flush()
+            _flushAtExit(self)
+        self._headless = headless
+        self._prompt_stream = prompt_stream
+        self._chunk_size = chunk_size
+        # The stdin that the terminal check was made for, and its result, so that isatty() is only called when stdin changes
+        self._checked_stdin = None
+        self._checked_isatty = False
+        # The line reader used when headless, and the stream it reads
+        self._reader = None
+        self._reader_stream = None
+        # The start of a line read from sys.stdin when the wait for the rest of it timed out or was cancelled, and the
+        # sys.stdin it was read from, so that it starts the next response. See _readLine(...).
+        self._partial_line = ''
+        self._partial_stdin = None
     
-    def GetRawResponse(self, prompt_text='', extra={}):
+    def __del__(self):
+        """
+        Write anything still buffered when the receiver is garbage collected, since it is then no longer flushed at exit.
+        """
+        try:
+            self.Flush()
+        except Exception:
+            # Late in interpreter shutdown, the streams may already be gone, and there is no one left to tell
+            pass
+
+    def IsHeadless(self):
+        """
+        Returns True if answers are read ahead from a pipe or file, rather than one line at a time.
+        :return: True if headless, boolean
+        """
+        return bool(self._headless)
+
+    def _isInteractive(self):
+        """
+        Returns True if answers are typed into a console window: the receiver is not headless, and stdin is a terminal.
+        Child classes use this to decide whether line editing, full screen menus, or raw mode can be used.
+        :return: True if interactive, boolean
+        """
+        if self.IsHeadless():
+            return False
+        if sys.stdin is not self._checked_stdin:
+            self._checked_stdin = sys.stdin
+            try:
+                self._checked_isatty = sys.stdin.isatty()
+            except (AttributeError, ValueError):
+                # A stdin without isatty(), or one that is closed, is certainly not an interactive console
+                self._checked_isatty = False
+        return self._checked_isatty
+
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
         """
         Obtains response to query from the user through console window.
 
@@ -157,25 +737,1048 @@ class ConsoleUserQueryReceiver(UserQueryReceiver):
             NOTE: This implementation ignores this parameter.
         :return: Raw response, string        
         """
-        # Ask the user to type a text response into the console window, which will be in the form of a string
-        raw_response = input(prompt_text)
-        return raw_response
+        # Queries from other threads wait until this one has been answered, so that prompts and responses aren't interleaved
+        with self._input_lock:
+            return self._readResponseLine(prompt_text, extra)
+
+    def GetRawResponseUndecoded(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Obtains response to query from the user, without decoding it, when headless.
+
+        Overrides UserQueryReceiver.GetRawResponseUndecoded(...). When not headless, the response is typed into the console
+        window and returned as a string.
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: This implementation ignores this parameter.
+        :return: Raw response, as memoryview of bytes (or string, if stdin has no binary buffer), without line ending
+        Raises EOFError if there is no more input, as input() does.
+        """
+        with self._input_lock:
+            if not self.IsHeadless():
+                return self._input(prompt_text, self._getTimeout(extra), extra.get('cancellation_token'))
+            return self._readAheadLine(prompt_text, extra)
+
+    def GetRawResponseBlock(self, prompt_text='', extra=_EMPTY_DICT, terminator=''):
+        """
+        Obtains a multi-line response to query from the user through console window, one line at a time.
+
+        Overrides UserQueryReceiver.GetRawResponseBlock(...). The whole block is read while holding the input lock, so that
+        a query in another thread can't take lines from the middle of it (e.g., rows of a pasted table), and waits until the
+        block has ended. Each line is read with _readResponseLine(...), which children extend rather than GetRawResponse(...).
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+            This is only shown before the first line of the block.
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+        :parameter terminator: Line of text (default='', i.e., a blank line) that ends the block, string
+        :return: Generator of raw response lines, not including the terminator line, as generator of strings
+        Raises EOFError if there is no more input before the first line of the block, as input() does.
+        """
+        with self._input_lock:
+            yield from _readBlockLines(self._readResponseLine, prompt_text, extra, terminator)
+
+    def GetRawResponseChunks(self, prompt_text='', extra=_EMPTY_DICT, terminator='.', chunk_size=8192):
+        """
+        Obtains a multi-line response to query from the user through console window, in chunks of no more than chunk_size characters.
+
+        Overrides UserQueryReceiver.GetRawResponseChunks(...). Lines are read with a size limit, so that even a single very long
+        line is never read into memory all at once. When headless, lines are read ahead, and each line is then split into chunks.
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: This implementation ignores this parameter.
+        :parameter terminator: Line of text (default='.') that ends the block, string
+        :parameter chunk_size: The maximum number of characters in each chunk, int
+            Must be longer than the terminator plus a line ending, so that a terminator line is always read as a single chunk.
+        :return: Generator of chunks of the raw response, including line endings, as generator of strings
+        Raises EOFError if there is no more input before the first chunk, as GetRawResponseBlock(...) does.
+        """
+        assert(chunk_size > len(terminator) + 1)
+        if self.IsHeadless():
+            for line in self.GetRawResponseBlock(prompt_text, extra, terminator):
+                line += '\n'
+                for start in range(0, len(line), chunk_size):
+                    yield line[start:start+chunk_size]
+            return
+        # The whole block is read while holding the input lock, as by GetRawResponseBlock(...)
+        with self._input_lock:
+            if self._buffer_output:
+                # Input is needed from the user, so write any buffered output along with the prompt
+                self._bufferOutput(sys.stdout, prompt_text)
+                self.Flush()
+            else:
+                sys.stdout.write(prompt_text)
+                sys.stdout.flush()
+            terminator_line = terminator + '\n'
+            # A chunk can only be a terminator line if it starts a new line
+            at_line_start = True
+            at_block_start = True
+            cancellation_token = extra.get('cancellation_token')
+            while True:
+                if at_line_start:
+                    chunk = self._readLine(chunk_size, None, cancellation_token)
+                else:
+                    chunk = sys.stdin.readline(chunk_size)
+                if chunk == '':
+                    if at_block_start:
+                        raise EOFError
+                    # No more input is available, so treat it as the end of the block
+                    return
+                at_block_start = False
+                if at_line_start and (chunk == terminator_line or chunk == terminator):
+                    return
+                at_line_start = chunk.endswith('\n')
+                yield chunk
     
     def IssueErrorMessage(self, msg=''):
         """
         Inform the user that their raw response does not meet requirements.
 
         Overrides UserQueryReciever.IssueErrorMessage(...). Prints message to user in console window:
-            :parameter msg: Error message (default='') to be shown to the user, string
+            :parameter msg: Error message (default='') to be shown to the user, string, or UserQueryResult, which is only
+                rendered into its message with str(...) when it is shown
             :return: None       
         """
         # Let the user know that there was a problem with their response, by printing an error message to the console window
-        print(msg)
+        if self._buffer_output:
+            self._bufferOutput(sys.stdout, f"{msg}\n")
+        else:
+            print(msg)
+        return None
+
+    def Flush(self):
+        """
+        Write any buffered prompts and error messages, with one write per stream.
+
+        Overrides UserQueryReceiver.Flush().
+            :return: None
+        """
+        with self._output_lock:
+            pending_output = self._pending_output
+            self._pending_output = []
+            self._pending_output_size = 0
+            for (stream, texts) in pending_output:
+                stream.write(''.join(texts))
+                stream.flush()
+        return None
+
+    def _input(self, prompt_text='', timeout=None, cancellation_token=None):
+        """
+        Ask the user to type a response into the console window, as input() does. When output is buffered, any buffered output
+        is written together with the prompt, since input is now needed from the user. Must be called with self._input_lock held,
+        so that queries from other threads wait until this one has been answered, and prompts and responses aren't interleaved.
+        :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        :parameter timeout: The maximum time to wait for the response in seconds, float, or None to wait as long as needed.
+            Raises UserQueryReceiverTimeoutError if the response has not arrived in time.
+        :parameter cancellation_token: Token that stops the wait when cancelled, UserQueryCancellationToken, or None.
+            Raises UserQueryReceiverTerminateQueryingThreadError if it is cancelled before the response has arrived.
+        :return: Raw response, string
+        """
+        if timeout is not None or cancellation_token is not None:
+            # input() can't time out or be woken, so wait for the line to be ready before reading it
+            self._writeOutput(sys.stdout, prompt_text)
+            self.Flush()
+            try:
+                line = self._readLine(-1, timeout, cancellation_token)
+            except UserQueryReceiverTimeoutError:
+                self._writeOutput(sys.stdout, '\n')
+                raise
+            if line == '':
+                raise EOFError
+            return line.rstrip('\r\n')
+        partial_line = self._takePartialLine()
+        if self._buffer_output:
+            self._bufferOutput(sys.stdout, prompt_text)
+            self.Flush()
+            return partial_line + input()
+        return partial_line + input(prompt_text)
+
+    def _readAheadLine(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Write the prompt to the prompt stream, if there is one, and take the next line read ahead when headless.
+        Must be called with self._input_lock held.
+        :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: Raw response, as memoryview of bytes (or string, if stdin has no binary buffer), without line ending
+        Raises EOFError if there is no more input.
+        """
+        if self._prompt_stream is not None:
+            self._writeOutput(self._prompt_stream, prompt_text)
+        return self._getReader().ReadLine(self._getTimeout(extra), extra.get('cancellation_token'))
+
+    def _readResponseLine(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Read one line of response, as GetRawResponse(...) does, without taking self._input_lock, which must be held, so that
+        GetRawResponseBlock(...) can read all the lines of a block under one hold of the lock. Children that change how a
+        line is read from the console window extend this.
+        :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: Raw response, string
+        Raises EOFError if there is no more input.
+        """
+        if self.IsHeadless():
+            raw_response = self._readAheadLine(prompt_text, extra)
+            if not isinstance(raw_response, str):
+                raw_response = str(raw_response, self._getEncoding())
+            return raw_response
+        # Ask the user to type a text response into the console window, which will be in the form of a string
+        return self._input(prompt_text, self._getTimeout(extra), extra.get('cancellation_token'))
+
+    def _readLine(self, size=-1, timeout=None, cancellation_token=None):
+        """
+        Read a line from sys.stdin, waiting no longer than timeout, or until cancellation_token is cancelled. Any line that
+        sys.stdin has already read ahead is taken at once, since select() can't see it, and only then is select() used.
+        :parameter size: The maximum number of characters to read, int, or -1 for no limit
+        :parameter timeout: The maximum time to wait for the line in seconds, float, or None to wait as long as needed.
+            Raises UserQueryReceiverTimeoutError if the line has not arrived in time.
+        :parameter cancellation_token: Token that stops the wait when cancelled, UserQueryCancellationToken, or None.
+            Raises UserQueryReceiverTerminateQueryingThreadError if it is cancelled before the line has arrived.
+        :return: The line, including line ending, string, or '' if there is no more input
+        """
+        stdin = sys.stdin
+        line = self._takePartialLine()
+        line += _readBuffered(stdin, size - len(line) if size >= 0 else -1)
+        if line.endswith('\n') or (size >= 0 and len(line) >= size):
+            return line
+        try:
+            ready = _waitReadable(stdin, timeout, cancellation_token)
+        except UserQueryReceiverTerminateQueryingThreadError:
+            (self._partial_line, self._partial_stdin) = (line, stdin)
+            raise
+        if not ready:
+            (self._partial_line, self._partial_stdin) = (line, stdin)
+            raise UserQueryReceiverTimeoutError(f"No response within {timeout} seconds")
+        return line + stdin.readline(size - len(line) if size >= 0 else -1)
+
+    def _takePartialLine(self):
+        """
+        :return: The start of a line left by _readLine(...) when its wait timed out or was cancelled, if it was read from
+            the current sys.stdin, string, or '' if there is none
+        """
+        partial_line = self._partial_line if self._partial_stdin is sys.stdin else ''
+        (self._partial_line, self._partial_stdin) = ('', None)
+        return partial_line
+
+    def _getTimeout(self, extra=_EMPTY_DICT):
+        """
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: The timeout for the query in seconds, float, or None if the query has no default response, or there is no timeout
+        """
+        if 'default_response' not in extra:
+            return None
+        return self._timeout
+
+    def _writeOutput(self, stream=None, text=''):
+        """
+        Write text to stream, or add it to the buffered output if output is buffered.
+        :parameter stream: The text stream to write to
+        :parameter text: The text to write, string
+        :return: None
+        """
+        if self._buffer_output:
+            self._bufferOutput(stream, text)
+        else:
+            stream.write(text)
+            stream.flush()
+        return None
+
+    def _bufferOutput(self, stream=None, text=''):
+        """
+        Add text for stream to the buffered output, and write the buffered output if the buffer is full.
+        :parameter stream: The text stream that the text is for
+        :parameter text: The text, string
+        :return: None
+        """
+        with self._output_lock:
+            if self._pending_output and self._pending_output[-1][0] is stream:
+                self._pending_output[-1][1].append(text)
+            else:
+                self._pending_output.append((stream, [text]))
+            self._pending_output_size += len(text)
+            if self._pending_output_size >= self._output_buffer_size:
+                self.Flush()
+        return None
+
+    def _getInputStream(self):
+        """
+        Returns the stream that is read ahead when headless: the binary buffer of stdin if it has one, otherwise stdin itself.
+        :return: Binary or text stream
+        """
+        return getattr(sys.stdin, 'buffer', sys.stdin)
+
+    def _getEncoding(self):
+        """
+        Returns the encoding used to decode headless responses read as bytes.
+        :return: Encoding name, string
+        """
+        return getattr(sys.stdin, 'encoding', None) or 'utf-8'
+
+    def _getReader(self):
+        """
+        Returns the line reader for the current input stream, creating a new one if the input stream has changed
+        (e.g., sys.stdin has been replaced).
+        :return: _ReadAheadLineReader
+        """
+        stream = self._getInputStream()
+        if self._reader is None or stream is not self._reader_stream:
+            self._reader = _ReadAheadLineReader(stream, self._chunk_size)
+            self._reader_stream = stream
+        return self._reader
+
+
+class BytesConsoleUserQueryReceiver(ConsoleUserQueryReceiver):
+    """
+    Implements Reciever for raw responses piped in as bytes, for example from another program rather than a person.
+
+    Following the Command design pattern, this is a concrete implementation of a UserQueryReceiver. It is a ConsoleUserQueryReceiver
+    that is always headless, and reads sys.stdin.buffer (or another binary stream) in large chunks, splitting it into lines without
+    copying. Commands that call GetRawResponseUndecoded(...), such as UserQueryCommandNumberInteger and UserQueryCommandNumberFloat,
+    parse each line directly from bytes, without it ever being decoded to a string.
+
+    Prompts are not written, unless a prompt_stream is provided. Error messages are printed, as for ConsoleUserQueryReceiver.
+    """
+
+    def __init__(self, log_level = logging.INFO, stream = None, chunk_size = 65536, encoding = 'utf-8', prompt_stream = None, buffer_output = False,
+                 timeout = None):
+        """
+        Extends ConsoleUserQueryReceiver.__init__().
+        :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
+        :param stream: The binary stream to read responses from. If None, then sys.stdin.buffer is used.
+        :param chunk_size: The maximum number of bytes to read from the stream at a time, int
+        :param encoding: The encoding used to decode responses for GetRawResponse(...), string
+        :param prompt_stream: The text stream to write prompts to, e.g., sys.stderr. If None, then prompts are not written.
+        :param buffer_output: If True, prompts and error messages are buffered, and written together, boolean
+        :param timeout: The time in seconds to wait for a response to a query that has a default response, float,
+            or None (default) to wait as long as needed.
+        """
+        ConsoleUserQueryReceiver.__init__(self, log_level, headless=True, prompt_stream=prompt_stream, chunk_size=chunk_size,
+                                          buffer_output=buffer_output, timeout=timeout)
+        self._stream = stream
+        self._encoding = encoding
+
+    def _getInputStream(self):
+        """
+        Overrides ConsoleUserQueryReceiver._getInputStream(), to read the stream provided to __init__(), or else sys.stdin.buffer.
+        :return: Binary stream
+        """
+        if self._stream is not None:
+            return self._stream
+        return sys.stdin.buffer
+
+    def _getEncoding(self):
+        """
+        Overrides ConsoleUserQueryReceiver._getEncoding(), to use the encoding provided to __init__().
+        :return: Encoding name, string
+        """
+        return self._encoding
+
+
+class _CompletionIndex(object):
+    """
+    Sorted index of completion candidates, so that the candidates starting with a prefix are found with a binary search,
+    however many candidates there are.
+    """
+
+    def __init__(self, words=()):
+        """
+        :parameter words: The completion candidates, iterable of strings
+        """
+        self._words = sorted(set(words))
+
+    def Complete(self, prefix=''):
+        """
+        :parameter prefix: The start of a candidate, string
+        :return: The candidates that start with prefix, sorted, as list of strings
+        """
+        start = bisect.bisect_left(self._words, prefix)
+        # '\U0010ffff' is the largest character, so every candidate starting with prefix sorts before prefix + '\U0010ffff'
+        end = bisect.bisect_left(self._words, prefix + '\U0010ffff', start)
+        return self._words[start:end]
+
+
+class ReadlineConsoleUserQueryReceiver(ConsoleUserQueryReceiver):
+    """
+    Implements Reciever for user input typed into a Console window with line editing, tab completion, and history.
+
+    Following the Command design pattern, this is a concrete implementation of a UserQueryReceiver. It is a ConsoleUserQueryReceiver
+    that uses the readline module, when it is available, to offer:
+        (1) Tab completion of menu keys, when extra includes 'query_dic' (as passed by UserQueryCommandMenu), using a sorted index
+            that is built once per menu, so that completion stays fast for large menus.
+        (2) Tab completion of file system paths, when extra includes 'completion' with value 'path' (as passed by the path
+            commands), using the shared DirectoryIndexCache.
+        (3) A separate history of responses for each type of query (the 'query_type' in extra), saved to history_file at Flush()
+            and at exit, so that it persists between runs.
+
+    If readline is not available (e.g., on Windows), when stdin is not a terminal, or when headless, it behaves as a
+    ConsoleUserQueryReceiver.
+
+    Methods:
+        GetRawResponse(...) --- Obtain from the user their actual raw response as a string of text typed into a console window.
+        GetHistory(...) -- Returns the history of responses for a type of query.
+        Flush() -- Write any buffered prompts and error messages, and save the history.
+    """
+    # The maximum number of path completions offered at once
+    _MAX_PATH_COMPLETIONS = 1000
+
+    def __init__(self, log_level = logging.INFO, history_file = None, history_length = 1000, buffer_output = False):
+        """
+        Extends ConsoleUserQueryReceiver.__init__().
+        :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
+        :param history_file: The file where the history of responses is kept between runs, string or Path.
+            If None, then '.UserResponseCollector_history.json' in the user's home directory is used.
+        :param history_length: The maximum number of responses kept in the history of each type of query, int
+        :param buffer_output: If True, prompts and error messages are buffered, and written together, boolean
+        """
+        ConsoleUserQueryReceiver.__init__(self, log_level, buffer_output=buffer_output)
+        if history_file is None:
+            history_file = os.path.join(os.path.expanduser('~'), '.UserResponseCollector_history.json')
+        self._history_file = history_file
+        self._history_length = history_length
+        # Maps query type name to list of responses, loaded from self._history_file when first needed
+        self._history = None
+        self._history_changed = False
+        # The menu keys that self._menu_index was built for, and the index
+        self._menu_keys = None
+        self._menu_index = None
+        # The completion function for the current query, and its candidates for the text being completed
+        self._completer = None
+        self._completions = []
+        try:
+            import readline
+        except ImportError:
+            # readline is not available on all platforms
+            readline = None
+        self._readline = readline
+        if readline is not None:
+            if 'libedit' in (readline.__doc__ or ''):
+                readline.parse_and_bind('bind ^I rl_complete')
+            else:
+                readline.parse_and_bind('tab: complete')
+        # Flush() saves the history
+        _flushAtExit(self)
+
+    def _readResponseLine(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Obtains response to query from the user through console window, with tab completion and history.
+
+        Extends ConsoleUserQueryReceiver._readResponseLine(...), which reads each response of GetRawResponse(...), and each
+        line of GetRawResponseBlock(...).
+        :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+            NOTE: This implementation uses the 'query_type', 'query_dic', and 'completion' keys, if present.
+        :return: Raw response, string
+        """
+        if self._readline is None or not self._isInteractive():
+            return ConsoleUserQueryReceiver._readResponseLine(self, prompt_text, extra)
+        history = self._getHistory(extra)
+        readline = self._readline
+        old_completer = readline.get_completer()
+        old_delims = readline.get_completer_delims()
+        self._completer = self._getCompleter(extra)
+        readline.set_completer(self._complete)
+        # Complete the whole response, since menu keys and paths may contain spaces and separators
+        readline.set_completer_delims('')
+        # readline has one history for the whole process, so keep that of the application, to restore it afterwards
+        old_history = [readline.get_history_item(i) for i in range(1, readline.get_current_history_length() + 1)]
+        readline.clear_history()
+        for response in history:
+            readline.add_history(response)
+        try:
+            raw_response = ConsoleUserQueryReceiver._readResponseLine(self, prompt_text, extra)
+        finally:
+            readline.set_completer(old_completer)
+            readline.set_completer_delims(old_delims)
+            readline.clear_history()
+            for response in old_history:
+                readline.add_history(response)
+            self._completer = None
+        self._addHistory(history, raw_response)
+        return raw_response
+
+    def Flush(self):
+        """
+        Write any buffered prompts and error messages, and save the history if it has changed.
+
+        Extends ConsoleUserQueryReceiver.Flush().
+            :return: None
+        """
+        ConsoleUserQueryReceiver.Flush(self)
+        self._saveHistory()
+        return None
+
+    def GetHistory(self, query_type=None):
+        """
+        :parameter query_type: The type of query, e.g., UserQueryCommandMenu, or None for queries without a type
+        :return: The responses in the history of the type of query, oldest first, as list of strings
+        """
+        return list(self._getHistory({'query_type': query_type} if query_type is not None else {}))
+
+    def _getCompleter(self, extra=_EMPTY_DICT):
+        """
+        Returns the completion function for a query, which maps the text being completed to a list of candidates.
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: Function, or None if no completion is offered
+        """
+        if 'query_dic' in extra:
+            keys = tuple(str(key) for key in extra['query_dic'])
+            if keys != self._menu_keys:
+                self._menu_keys = keys
+                self._menu_index = _CompletionIndex(keys)
+            return self._menu_index.Complete
+        if extra.get('completion') == 'path':
+            cache = UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache()
+            return lambda text: cache.CompletePath(text, self._MAX_PATH_COMPLETIONS)
+        return None
+
+    def _complete(self, text='', state=0):
+        """
+        The completion function called by readline, for each candidate in turn (state = 0, 1, 2, ...) until None is returned.
+        :parameter text: The text being completed, string
+        :parameter state: The number of the candidate to return, int
+        :return: The candidate, string, or None if there are no more
+        """
+        if state == 0:
+            self._completions = self._completer(text) if self._completer is not None else []
+        if state < len(self._completions):
+            return self._completions[state]
+        return None
+
+    def _getHistory(self, extra=_EMPTY_DICT):
+        """
+        Returns the history of responses for the type of query, loading the history file if it has not been loaded.
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: The history, oldest first, as list of strings
+        """
+        if self._history is None:
+            self._history = {}
+            try:
+                with open(self._history_file, encoding='utf-8') as file:
+                    history = json.load(file)
+                if isinstance(history, dict):
+                    self._history = history
+            except (OSError, ValueError):
+                # No history has been saved yet, or it can't be read, so start a new one
+                pass
+        query_type = extra.get('query_type')
+        name = query_type.__name__ if query_type is not None else ''
+        return self._history.setdefault(name, [])
+
+    def _addHistory(self, history=None, raw_response=''):
+        """
+        Add a response to a history, unless it is blank or the same as the last response, keeping at most self._history_length.
+        :parameter history: The history, as list of strings
+        :parameter raw_response: The response, string
+        :return: None
+        """
+        if raw_response.strip() == '' or (history and history[-1] == raw_response):
+            return None
+        history.append(raw_response)
+        del history[:-self._history_length]
+        self._history_changed = True
+        return None
+
+    def _saveHistory(self):
+        """
+        Save the history to self._history_file, if it has changed.
+        :return: None
+        """
+        if not self._history_changed:
+            return None
+        try:
+            with open(self._history_file, 'w', encoding='utf-8') as file:
+                json.dump(self._history, file)
+            self._history_changed = False
+        except OSError as err:
+            logger = logging.getLogger('user_query_receiver_logger')
+            logger.warning(f"The history of responses could not be saved to {self._history_file}: {err}")
+        return None
+
+
+class _MenuViewport(object):
+    """
+    The options of a menu, as shown in a scrollable viewport of limited height, narrowed by a filter text.
+
+    Only the lines in the viewport are ever formatted for display, so the cost of drawing does not depend on the number of
+    options. When the filter is extended, only the options that matched the previous filter are searched again.
+    """
+
+    def __init__(self, query_dic=_EMPTY_DICT, height=1):
+        """
+        :parameter query_dic: Values are string descriptions of the options. Keys are the values returned when selected.
+        :parameter height: The number of lines in the viewport, int
+        """
+        self._keys = [str(key) for key in query_dic]
+        self._labels = [f"({key}) {value}" for (key, value) in query_dic.items()]
+        self._folded = [label.casefold() for label in self._labels]
+        self._height = max(1, height)
+        self._filter = ''
+        # Positions in self._keys of the options that match the filter
+        self._matches = list(range(len(self._keys)))
+        # Position in self._matches of the selected option, and of the option on the top line of the viewport
+        self._selected = 0
+        self._top = 0
+
+    def SetHeight(self, height=1):
+        """
+        :parameter height: The number of lines in the viewport, int
+        :return: None
+        """
+        self._height = max(1, height)
+        self.MoveBy(0)
+        return None
+
+    def GetHeight(self):
+        """
+        :return: The number of lines in the viewport, int
+        """
+        return self._height
+
+    def GetFilter(self):
+        """
+        :return: The filter text, string
+        """
+        return self._filter
+
+    def SetFilter(self, text=''):
+        """
+        Show only the options that contain text, ignoring case, and select the first of them.
+        :parameter text: The filter text, string
+        :return: None
+        """
+        folded = text.casefold()
+        if text.startswith(self._filter):
+            # Options that didn't match the shorter filter can't match the longer one
+            candidates = self._matches
+        else:
+            candidates = range(len(self._keys))
+        self._matches = [i for i in candidates if folded in self._folded[i]]
+        self._filter = text
+        self._selected = 0
+        self._top = 0
+        return None
+
+    def MoveBy(self, count=0):
+        """
+        Move the selection by count options (negative to move up), scrolling the viewport to keep it visible.
+        :parameter count: The number of options to move, int
+        :return: None
+        """
+        return self.MoveTo(self._selected + count)
+
+    def MoveTo(self, position=0):
+        """
+        Select the option at position among those that match the filter, scrolling the viewport to keep it visible.
+        :parameter position: The position, int. Positions outside the options are moved to the first or last option.
+        :return: None
+        """
+        self._selected = max(0, min(position, len(self._matches) - 1))
+        if self._selected < self._top:
+            self._top = self._selected
+        elif self._selected >= self._top + self._height:
+            self._top = self._selected - self._height + 1
+        return None
+
+    def GetSelectedKey(self):
+        """
+        :return: The key of the selected option, string, or None if no options match the filter
+        """
+        if not self._matches:
+            return None
+        return self._keys[self._matches[self._selected]]
+
+    def GetLines(self):
+        """
+        :return: The lines of the viewport, as list of Tuple (text, selected? True/False), padded with blank lines to the height
+        """
+        lines = []
+        for position in range(self._top, min(self._top + self._height, len(self._matches))):
+            lines.append((self._labels[self._matches[position]], position == self._selected))
+        lines.extend([('', False)] * (self._height - len(lines)))
+        return lines
+
+    def GetStatus(self):
+        """
+        :return: A line describing the number of options shown, and the filter, string
+        """
+        return f"{len(self._matches)} of {len(self._keys)} options. Type to filter: {self._filter}"
+
+
+class _LineRenderer(object):
+    """
+    Draws lines of text in a curses window, redrawing only the lines that have changed since they were last drawn.
+    """
+
+    def __init__(self, window=None):
+        """
+        :parameter window: The curses window to draw in
+        """
+        self._window = window
+        # The lines last drawn, as list of Tuple (text, attribute)
+        self._drawn = []
+
+    def Draw(self, lines=()):
+        """
+        Draw lines from the top of the window, skipping lines that are the same as those already drawn.
+        :parameter lines: The lines, as list of Tuple (text, curses attribute)
+        :return: The number of lines redrawn, int
+        """
+        (height, width) = self._window.getmaxyx()
+        lines = lines[:height]
+        redrawn = 0
+        for (row, line) in enumerate(lines):
+            if row < len(self._drawn) and self._drawn[row] == line:
+                continue
+            self._window.move(row, 0)
+            self._window.clrtoeol()
+            # Never write to the last column, since curses raises an error after writing the bottom right corner
+            self._window.addnstr(row, 0, line[0], max(0, width - 1), line[1])
+            redrawn += 1
+        for row in range(len(lines), min(len(self._drawn), height)):
+            self._window.move(row, 0)
+            self._window.clrtoeol()
+            redrawn += 1
+        self._drawn = list(lines)
+        return redrawn
+
+    def Invalidate(self):
+        """
+        Forget the lines drawn, so that every line is drawn again, e.g., after the window has been cleared or resized.
+        :return: None
+        """
+        self._drawn = []
+        return None
+
+
+class CursesUserQueryReceiver(ConsoleUserQueryReceiver):
+    """
+    Implements Reciever for user input in a terminal, with menus shown as a scrollable, filterable list, using curses.
+
+    Following the Command design pattern, this is a concrete implementation of a UserQueryReceiver. It is a ConsoleUserQueryReceiver
+    that, when extra includes 'query_dic' (as passed by UserQueryCommandMenu), shows the options of the menu in a full screen
+    viewport, rather than as one prompt string. The user moves the selection with the arrow, Page Up/Down, Home and End keys,
+    types to filter the options, and presses Enter to choose. Only the lines that change are redrawn, so interaction is smooth
+    however many options there are. Other queries, and all queries when stdin is not a terminal,
+    are handled as by ConsoleUserQueryReceiver.
+
+    The last line of a menu prompt (the 'Choose ...' list of options) is replaced by the viewport; the lines before it are
+    shown above the viewport.
+
+    Methods:
+        GetRawResponse(...) --- Obtain from the user their actual raw response as a string of text.
+    """
+    # How often, in milliseconds, a cancellation token is checked while waiting for a key
+    _CANCELLATION_POLL_MS = 100
+
+    def __init__(self, log_level = logging.INFO, buffer_output = False):
+        """
+        Extends ConsoleUserQueryReceiver.__init__().
+        :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
+        :param buffer_output: If True, prompts and error messages are buffered, and written together, boolean
+        """
+        ConsoleUserQueryReceiver.__init__(self, log_level, buffer_output=buffer_output)
+
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Obtains response to query from the user, choosing from a full screen menu if extra includes 'query_dic'.
+
+        Extends ConsoleUserQueryReceiver.GetRawResponse(...).
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: This implementation uses the 'query_dic' key, if present.
+        :return: Raw response, string
+        """
+        if 'query_dic' not in extra or not self._isInteractive():
+            return ConsoleUserQueryReceiver.GetRawResponse(self, prompt_text, extra)
+        import curses
+        # Show any buffered output before the screen is taken over
+        self.Flush()
+        return curses.wrapper(self._runMenu, prompt_text, extra['query_dic'], extra.get('cancellation_token'))
+
+    def _runMenu(self, screen=None, prompt_text='', query_dic=_EMPTY_DICT, cancellation_token=None):
+        """
+        Show the menu in screen, and handle keys until the user chooses an option.
+        :parameter screen: The curses window for the whole screen
+        :parameter prompt_text: The prompt, whose lines before the last are shown above the menu, string
+        :parameter query_dic: The menu options, dict
+        :parameter cancellation_token: Token that stops the wait for keys when cancelled, UserQueryCancellationToken, or None
+        :return: The key of the option chosen, string
+        """
+        import curses
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            # Not all terminals can hide the cursor
+            pass
+        header = [(line, curses.A_BOLD) for line in prompt_text.split('\n')[:-1] if line != '']
+        viewport = _MenuViewport(query_dic, screen.getmaxyx()[0] - len(header) - 1)
+        renderer = _LineRenderer(screen)
+        if cancellation_token is not None:
+            # Wait for keys for no more than this many milliseconds at a time, so that cancellation is noticed
+            screen.timeout(self._CANCELLATION_POLL_MS)
+        while True:
+            lines = list(header)
+            for (text, selected) in viewport.GetLines():
+                lines.append((text, curses.A_REVERSE if selected else curses.A_NORMAL))
+            lines.append((viewport.GetStatus(), curses.A_DIM))
+            renderer.Draw(lines)
+            screen.refresh()
+            try:
+                key = screen.get_wch()
+            except curses.error:
+                if cancellation_token is None:
+                    raise
+                # No key was pressed before the wait timed out
+                cancellation_token.RaiseIfCancelled()
+                continue
+            if key == curses.KEY_RESIZE:
+                screen.clear()
+                renderer.Invalidate()
+                viewport.SetHeight(screen.getmaxyx()[0] - len(header) - 1)
+                continue
+            chosen = self._handleKey(viewport, key)
+            if chosen is not None:
+                return chosen
+
+    def _handleKey(self, viewport=None, key=''):
+        """
+        Update the viewport for a key pressed by the user.
+        :parameter viewport: The menu viewport, _MenuViewport
+        :parameter key: The key, as returned by the curses get_wch() method, string or int
+        :return: The key of the selected option if the user chose it, string, otherwise None
+        """
+        import curses
+        if key in ('\n', '\r', curses.KEY_ENTER):
+            return viewport.GetSelectedKey()
+        match key:
+            case curses.KEY_UP:
+                viewport.MoveBy(-1)
+            case curses.KEY_DOWN:
+                viewport.MoveBy(1)
+            case curses.KEY_PPAGE:
+                viewport.MoveBy(-viewport.GetHeight())
+            case curses.KEY_NPAGE:
+                viewport.MoveBy(viewport.GetHeight())
+            case curses.KEY_HOME:
+                viewport.MoveTo(0)
+            case curses.KEY_END:
+                viewport.MoveTo(sys.maxsize)
+            case curses.KEY_BACKSPACE | '\x7f' | '\b':
+                viewport.SetFilter(viewport.GetFilter()[:-1])
+            case '\x1b':
+                viewport.SetFilter('')
+            case str() if key.isprintable():
+                viewport.SetFilter(viewport.GetFilter() + key)
         return None
 
 
-# Here is the global (intended to be private), single instance
-_instance = ConsoleUserQueryReceiver()
+def _editLine(read_char=None, write=None, accept=None):
+    """
+    Edit a line of text one keystroke at a time, as in a terminal in raw mode, rejecting keystrokes that accept(...) refuses.
+    :parameter read_char: Function that returns the next character typed, string, or '' if there is no more input
+    :parameter write: Function that echoes text to the user, taking a string
+    :parameter accept: Function that returns True if the text typed so far, including the latest keystroke, is acceptable
+    :return: The line, without line ending, string
+    Raises EOFError if there is no more input (or Ctrl-D is typed) before anything is typed, as input() does.
+    Raises KeyboardInterrupt if Ctrl-C is typed.
+    """
+    text = ''
+    while True:
+        char = read_char()
+        if char == '' or (char == '\x04' and text == ''):
+            if text == '':
+                raise EOFError
+            return text
+        if char in ('\r', '\n'):
+            write('\n')
+            return text
+        if char == '\x03':
+            raise KeyboardInterrupt
+        if char in ('\x7f', '\b'):
+            if text:
+                text = text[:-1]
+                write('\b \b')
+            continue
+        if char == '\x1b':
+            # Skip the rest of an escape sequence (e.g., an arrow key), which is not part of the response
+            char = read_char()
+            if char in ('[', 'O'):
+                while char != '' and not ('@' <= char <= '~' and char not in ('[', 'O')):
+                    char = read_char()
+            continue
+        if not char.isprintable():
+            continue
+        if accept(text + char):
+            text += char
+            write(char)
+        else:
+            # Let the user know that the keystroke was rejected
+            write('\a')
+
+
+class RawConsoleUserQueryReceiver(ConsoleUserQueryReceiver):
+    """
+    Implements Reciever for user input typed into a Console window, checking each keystroke as it is typed.
+
+    Following the Command design pattern, this is a concrete implementation of a UserQueryReceiver. It is a ConsoleUserQueryReceiver
+    that, when extra includes 'accept_partial' (as passed by UserQueryCommandNumberInteger, UserQueryCommandNumberFloat,
+    UserQueryCommandStr and UserQueryCommandMenu), puts the terminal in raw mode and reads the response one keystroke at a
+    time, rejecting (with a bell) any keystroke that makes the response unacceptable, e.g., a letter in an integer. This saves
+    a round trip of error message and prompt for each mistake. Backspace erases, Enter ends the response.
+
+    Raw mode requires the termios module, which is only available on POSIX platforms. Otherwise, when stdin is not a terminal,
+    or for queries that don't pass 'accept_partial', responses are read as by ConsoleUserQueryReceiver.
+
+    With a timeout, as for ConsoleUserQueryReceiver, a query that has a default response raises UserQueryReceiverTimeoutError
+    if the whole response has not been typed within timeout seconds.
+
+    Methods:
+        GetRawResponse(...) --- Obtain from the user their actual raw response as a string of text typed into a console window.
+        GetRawResponseUndecoded(...) --- Obtain from the user their raw response, checked as for GetRawResponse(...) when not headless.
+        GetRejectedKeystrokeCount() -- Returns the number of keystrokes rejected so far.
+    """
+
+    def __init__(self, log_level = logging.INFO, buffer_output = False, timeout = None):
+        """
+        Extends ConsoleUserQueryReceiver.__init__().
+        :param log_level: The logging level to set for the logger, e.g., logging.DEBUG, logging.INFO, etc.
+        :param buffer_output: If True, prompts and error messages are buffered, and written together, boolean
+        :param timeout: The time in seconds to wait for a response to a query that has a default response, float,
+            or None (default) to wait as long as needed.
+        """
+        ConsoleUserQueryReceiver.__init__(self, log_level, buffer_output=buffer_output, timeout=timeout)
+        self._rejected_keystrokes = 0
+
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Obtains response to query from the user through console window, checking each keystroke if extra includes 'accept_partial'.
 
-# Here are the global prebound method(s)
-UserQueryReceiver_GetCommandReceiver = _instance.GetCommandReceiver
+        Extends ConsoleUserQueryReceiver.GetRawResponse(...).
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: This implementation uses the 'accept_partial' key, if present.
+        :return: Raw response, string
+        """
+        if self._canUseRawMode(extra):
+            return self._readRawLine(prompt_text, extra['accept_partial'], self._getTimeout(extra), extra.get('cancellation_token'))
+        return ConsoleUserQueryReceiver.GetRawResponse(self, prompt_text, extra)
+
+    def GetRawResponseUndecoded(self, prompt_text='', extra=_EMPTY_DICT):
+        """
+        Obtains response to query from the user, checking each keystroke if extra includes 'accept_partial' and not headless.
+
+        Extends ConsoleUserQueryReceiver.GetRawResponseUndecoded(...).
+        :parameter prompt_text: String of text (default='') to use to tell the user what response is requrired, string
+        :parameter extra: Optional dictionary of key/value pairs (default={}) that may be used to pass additional information to the method.
+            NOTE: This implementation uses the 'accept_partial' key, if present.
+        :return: Raw response, as string when typed, or as memoryview of bytes when headless
+        """
+        if self._canUseRawMode(extra):
+            return self._readRawLine(prompt_text, extra['accept_partial'], self._getTimeout(extra), extra.get('cancellation_token'))
+        return ConsoleUserQueryReceiver.GetRawResponseUndecoded(self, prompt_text, extra)
+
+    def GetRejectedKeystrokeCount(self):
+        """
+        :return: The number of keystrokes rejected so far, int
+        """
+        return self._rejected_keystrokes
+
+    def _canUseRawMode(self, extra=_EMPTY_DICT):
+        """
+        :parameter extra: Dictionary of extra key/value pairs passed to GetRawResponse(...), dict
+        :return: True if the response can be read one keystroke at a time, and should be, boolean
+        """
+        if 'accept_partial' not in extra or not self._isInteractive():
+            return False
+        try:
+            import termios
+            sys.stdin.fileno()
+        except (ImportError, AttributeError, OSError, ValueError):
+            # Not a POSIX platform, or stdin is not a real file
+            return False
+        return True
+
+    def _readRawLine(self, prompt_text='', accept=None, timeout=None, cancellation_token=None):
+        """
+        Write the prompt, and read the response one keystroke at a time, with the terminal in raw mode.
+        :parameter prompt_text: String of text to use to tell the user what response is requrired, string
+        :parameter accept: Function that returns True if the text typed so far is acceptable
+        :parameter timeout: The maximum time to wait for the whole response in seconds, float, or None to wait as long as needed.
+            Raises UserQueryReceiverTimeoutError if the response has not been completed in time.
+        :parameter cancellation_token: Token that stops the wait for keystrokes when cancelled, UserQueryCancellationToken, or None
+        :return: Raw response, string
+        """
+        import termios
+        import tty
+        import codecs
+        # Queries from other threads wait until this one has been answered, as for GetRawResponse(...), so that keystrokes go
+        # to one query at a time. Rejected keystrokes are only counted while holding the lock, so the count needs no other lock.
+        with self._input_lock:
+            if self._buffer_output:
+                self._bufferOutput(sys.stdout, prompt_text)
+                self.Flush()
+            else:
+                self._echo(prompt_text)
+            fd = sys.stdin.fileno()
+            decoder = codecs.getincrementaldecoder(self._getEncoding())('replace')
+            deadline = time.monotonic() + timeout if timeout is not None else None
+
+            def read_char():
+                # Read bytes until they decode to a character, since one character may be several bytes
+                while True:
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if not _waitReadable(sys.stdin, remaining, cancellation_token):
+                        self._echo('\n')
+                        raise UserQueryReceiverTimeoutError(f"No response within {timeout} seconds")
+                    data = os.read(fd, 1)
+                    if data == b'':
+                        return ''
+                    char = decoder.decode(data)
+                    if char:
+                        return char
+
+            def accept_and_count(text):
+                accepted = accept(text)
+                if not accepted:
+                    self._rejected_keystrokes += 1
+                return accepted
+
+            old_attributes = termios.tcgetattr(fd)
+            try:
+                # Keep Ctrl-C working, but stop the terminal from echoing and collecting lines itself
+                tty.setcbreak(fd)
+                return _editLine(read_char, self._echo, accept_and_count)
+            finally:
+                termios.tcsetattr(fd, termios.TCSADRAIN, old_attributes)
+
+    def _echo(self, text=''):
+        """
+        Write text to the console window immediately.
+        :parameter text: The text, string
+        :return: None
+        """
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return None
+
+
+# Here are the global (intended to be private), single instance, and the global prebound method(s). So that importing
+# this module has no side effects (instantiating a receiver sets up logging), they are created by __getattr__(...) when either is first used.
+_instance_lock = threading.Lock()
+
+
+def __getattr__(name=''):
+    """
+    Create the global, single instance and the global prebound method(s) when either is first used. Once created, they are
+    ordinary module attributes, so this is not called for them again, and they may be replaced as before, e.g.:
+        UserResponseCollector.UserQueryReceiver._instance = ReadlineConsoleUserQueryReceiver()
+        UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver = UserResponseCollector.UserQueryReceiver._instance.GetCommandReceiver
+    :parameter name: The name of the module attribute, string
+    :return: The module attribute
+    Raises AttributeError if the module has no attribute name.
+    """
+    if name not in ('_instance', 'UserQueryReceiver_GetCommandReceiver'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _instance_lock:
+        module_globals = globals()
+        if '_instance' not in module_globals:
+            module_globals['_instance'] = ConsoleUserQueryReceiver()
+        if 'UserQueryReceiver_GetCommandReceiver' not in module_globals:
+            module_globals['UserQueryReceiver_GetCommandReceiver'] = module_globals['_instance'].GetCommandReceiver
+        return module_globals[name]
@@ -0,0 +1,177 @@
+"""
+Defines UserQueryResult, the compact object returned by the _doProcessRawResponse(...) and
+_doValidateProcessedResponse(...) primitive operations of UserQueryCommand, and by PathValidator.Validate(...).
+
+A result carries a value, and, if the response was rejected, an error code and the parameters of the error message. The
+message itself is only rendered, from the template registered for the code, when it is shown to the user (e.g., by
+UserQueryReceiver.IssueErrorMessage(...)), so that responses that are rejected and never shown, or checked in bulk (e.g.,
+by UserQueryCommandTable), don't pay for building message strings.
+
+For compatibility with the (value, error message) tuples that were returned before, a result unpacks, indexes and compares
+like a 2-tuple of (value, rendered error message).
+
+Exported Classes:
+    UserQueryResult -- Value, error code, and error message parameters, with a lazily rendered error message.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    registerUserQueryMessage(...) -- Register the template of the error message for an error code.
+    asUserQueryResult(...) -- Convert a (value, error message) tuple, as returned by older commands, to a UserQueryResult.
+"""
+
+# Standard
+
+# Local
+
+
+def _listPaths(paths=()):
+    """
+    :parameter paths: The paths to list, sequence
+    :return: The paths, quoted and separated by commas, string
+    """
+    return ', '.join(f"\'{path}\'" for path in paths)
+
+
+# Templates of error messages, keyed by error code. A template is either a format string, filled in with the parameters
+# of the result by position, or a function called with the parameters, which returns the message.
+_MESSAGES = {
+    'message': '{0}',
+    'invalid_response': "\n\'{0}\' is not a valid response. Please try again.",
+    'not_an_integer': "\n\'{0}\' is not an integer. Please try again.",
+    'not_a_float': "\n\'{0}\' is not a floating point number. Please try again.",
+    'less_than_minimum': "\n\'{0}\' is less than {1}. Please try again.",
+    'greater_than_maximum': "\n\'{0}\' is greater than {1}. Please try again.",
+    'invalid_string': "\n\'{0}\' is not a valid string of text. Please try again.",
+    'string_too_long': "\n\'{0}\' is longer than {1} characters. Please try again.",
+    'text_too_long': "\nThe text is longer than {0} characters. Please try again.",
+    'invalid_path': "\n\'{0}\' is not a valid file path. Please try again.",
+    'not_overwritten': 'Please enter a path to a new file or file that you wish to overwrite.',
+    'is_directory': "\n\'{0}\' is a directory, not a file. Please try again.",
+    'not_existing_file': lambda path, suggestions=(): (
+        f"\n\'{path}\' is not an existing file." +
+        (f" Did you mean: {_listPaths(suggestions)}?" if suggestions else '') +
+        ' Please try again.'),
+    'no_pattern': '\nNo pattern was entered. Please try again.',
+    'no_matches': "\nNo files match \'{0}\'. Please try again.",
+    'pattern_not_confirmed': 'Please enter another pattern.',
+    'not_existing_directory': "\n\'{0}\' is no longer an existing directory. Please try again.",
+    'no_rows': '\nNo rows of values were entered. Please try again.',
+    'missing_column': "\nThe header row does not include the column \'{0}\'. Please try again.",
+    'wrong_value_count': '\nLine {0} has {1} values, but {2} are required. Please try again.',
+    'invalid_cell': "\nLine {0}, column \'{1}\':{2}",
+    'integer_too_large': '\nLine {0} has an integer that is too large to store. Please try again.',
+    'file_too_large': "\n\'{0}\' is {1} bytes, which is larger than {2} bytes. Please try again.",
+    'file_empty': "\n\'{0}\' is empty. Please try again.",
+    'not_text_file': "\n\'{0}\' is not a text file. Please try again.",
+    'wrong_signature': "\n\'{0}\' is not {1}. Please try again.",
+    'not_csv_file': "\n\'{0}\' is not a CSV file. Please try again.",
+    'unreadable_file': "\n\'{0}\' can't be read ({1}). Please try again.",
+}
+
+
+def registerUserQueryMessage(code='', template=''):
+    """
+    Register the template of the error message for an error code, so that children of UserQueryCommand or PathValidator
+    can return results with their own error codes. Registering an existing code replaces its template.
+    :parameter code: The error code, string
+    :parameter template: A format string, filled in with the parameters of the result by position, or a function called
+        with the parameters, which returns the message
+    :return: None
+    """
+    _MESSAGES[code] = template
+    return None
+
+
+class UserQueryResult(object):
+    """
+    The value returned by a primitive operation of UserQueryCommand (the processed response, or whether the processed
+    response is valid), and, if the response was rejected, an error code and the parameters of the error message.
+
+    Results are treated as immutable once returned, so that a single result can be shared, e.g., UserQueryResult.VALID.
+
+    Attributes:
+        value -- The processed response (None if the raw response couldn't be processed), or True/False for validation
+        code -- The error code, a key of the registered message templates, string, or None if there is no error
+        params -- The parameters of the error message, tuple
+
+    Methods:
+        IsError() -- Returns True if the result has an error code.
+        GetMessage() -- Renders and returns the error message, or '' if there is no error.
+    """
+    __slots__ = ('value', 'code', 'params')
+
+    def __init__(self, value=None, code=None, params=()):
+        """
+        :parameter value: The processed response, or True/False for validation
+        :parameter code: The error code, string, or None if there is no error
+        :parameter params: The parameters of the error message, tuple
+        """
+        self.value = value
+        self.code = code
+        self.params = params
+
+    def IsError(self):
+        """
+        :return: True if the result has an error code, boolean
+        """
+        return self.code is not None
+
+    def GetMessage(self):
+        """
+        Render the error message from the template registered for the error code. This is only done when the message
+        is needed, e.g., to show it to the user.
+        :return: The error message, string, or '' if there is no error
+        """
+        if self.code is None:
+            return ''
+        template = _MESSAGES[self.code]
+        if callable(template):
+            return template(*self.params)
+        return template.format(*self.params)
+
+    def __str__(self):
+        return self.GetMessage()
+
+    def __repr__(self):
+        return f"UserQueryResult({self.value!r}, {self.code!r}, {self.params!r})"
+
+    def __iter__(self):
+        # Unpacks as the (value, error message) tuple returned by older commands
+        yield self.value
+        yield self.GetMessage()
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self.value, self.GetMessage())[index]
+
+    def __eq__(self, other):
+        if isinstance(other, UserQueryResult):
+            return (self.value, self.code, self.params) == (other.value, other.code, other.params)
+        if isinstance(other, tuple):
+            return (self.value, self.GetMessage()) == other
+        return NotImplemented
+
+    __hash__ = None
+
+
+# Shared result of a successful validation
+UserQueryResult.VALID = UserQueryResult(True)
+
+
+def asUserQueryResult(result=None):
+    """
+    Convert a (value, error message) tuple, as returned by commands and validators written before UserQueryResult, to a
+    UserQueryResult. A UserQueryResult is returned unchanged.
+    :parameter result: The value returned by a primitive operation, UserQueryResult or Tuple (object, string)
+    :return: The result, as UserQueryResult
+    """
+    if isinstance(result, UserQueryResult):
+        return result
+    (value, msg) = result
+    if msg:
+        return UserQueryResult(value, 'message', (msg,))
+    return UserQueryResult(value)
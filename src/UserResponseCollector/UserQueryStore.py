@@ -0,0 +1,332 @@
+"""
+Defines a store of the validated answers of many respondents (e.g., operators who all answer the same questionnaire), kept in
+array-backed columns, one per question, and the summary statistics of the answers, computed with NumPy.
+
+Answers are appended to array.array columns, as UserQueryTable stores its columns: the answers to a menu question as the
+category code (the position of the key in the menu) of the key selected, and the answers to a number question as float64,
+each with the code of its respondent in a parallel column. Recording answers needs only the standard library. The statistics
+(counts, histograms, means and quantiles) view the columns as NumPy arrays, and are computed without Python loops over the
+answers. NumPy is an optional dependency, installed with the 'stats' extra, e.g., pip install UserResponseCollector[stats].
+
+Answers are recorded with UserQueryResponseStore.Record(...), or by adding a recorder, as middleware, to the receiver of each
+respondent, e.g.:
+    store = UserQueryResponseStore().AddQuestion('colour', colour_command).AddQuestion('weight', weight_command)
+    receiver.AddMiddleware(store.GetRecorder('operator 17'))
+
+Exported Classes:
+    UserQueryResponseStore -- Array-backed columns of the answers to each question, and their statistics.
+    UserQueryResponseRecorder -- Middleware that records each validated answer to a question of a store.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+"""
+
+# Standard
+import threading
+import weakref
+from array import array
+
+# Local
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+from UserResponseCollector.UserQueryMiddleware import UserQueryMiddleware
+
+
+def _importNumpy():
+    """
+    :return: The numpy module
+    Raises ImportError, explaining how to install NumPy, if it isn't installed.
+    """
+    try:
+        import numpy
+    except ImportError as err:
+        raise ImportError("The statistics of UserQueryResponseStore require NumPy, which is installed with "
+                          "pip install UserResponseCollector[stats]") from err
+    return numpy
+
+
+class _ResponseColumn(object):
+    """
+    The answers to one question, as an array of category codes (for a menu question) or of float64 values (for a number
+    question), and a parallel array of respondent codes.
+    """
+    __slots__ = ('categories', 'codes', 'values', 'respondents')
+
+    def __init__(self, categories=None):
+        """
+        :parameter categories: The keys of the menu, in order, sequence, or None for a number question
+        """
+        self.categories = tuple(categories) if categories is not None else None
+        # Maps each key of the menu to its category code, or None for a number question
+        self.codes = {key: code for (code, key) in enumerate(self.categories)} if categories is not None else None
+        self.values = array('i') if categories is not None else array('d')
+        self.respondents = array('i')
+
+
+class UserQueryResponseStore(object):
+    """
+    Array-backed columns of the validated answers to each question, from many respondents, and their statistics, which are
+    computed with NumPy. Safe to share between threads.
+
+    Methods:
+        AddQuestion(...) -- Adds a question answered by a menu, integer or floating point command.
+        AddCategoryQuestion(...) -- Adds a question whose answers are one of a fixed set of keys.
+        AddNumberQuestion(...) -- Adds a question whose answers are numbers.
+        GetQuestion(...) -- Returns the question that a command was added for, or None.
+        GetQuestions() -- Returns the questions, in the order that they were added.
+        GetCategories(...) -- Returns the keys of a category question, in category code order.
+        GetRespondents() -- Returns the respondents, in respondent code order.
+        GetRecorder(...) -- Returns middleware that records the answers of a respondent.
+        Record(...) -- Records an answer to a question.
+        GetCount(...) -- Returns the number of answers to a question.
+        GetValues(...) -- Returns the answers to a question, as a NumPy array.
+        GetCounts(...) -- Returns the number of answers of each key of a category question.
+        GetHistogram(...) -- Returns the histogram of the answers to a number question.
+        GetMean(...) -- Returns the mean of the answers to a number question.
+        GetQuantiles(...) -- Returns quantiles of the answers to a number question.
+    """
+
+    def __init__(self):
+        # Maps question to _ResponseColumn, in the order that the questions were added
+        self._columns = {}
+        # Maps command to the question that it asks. The commands are weakly referenced, so that a store kept for the
+        # life of a service doesn't keep alive every command that was added (e.g., one per respondent, or per record).
+        self._questions_by_command = weakref.WeakKeyDictionary()
+        # Maps respondent to respondent code
+        self._respondents = {}
+        self._lock = threading.Lock()
+
+    def AddQuestion(self, question='', command=None):
+        """
+        Add a question, whose answers are those validated by command: the keys of its menu for a UserQueryCommandMenu, or
+        numbers for a UserQueryCommandNumberInteger or UserQueryCommandNumberFloat. A question may be added for several
+        commands, e.g., one for each respondent, with the respondent's receiver, in which case the menu of the first
+        command added gives the categories. The store doesn't keep the command alive; once it is garbage collected, its
+        answers remain, but GetQuestion(...) no longer finds it.
+        :parameter question: The name of the question, hashable, e.g., string
+        :parameter command: The command that asks the question, UserQueryCommandMenu, UserQueryCommandNumberInteger, or
+            UserQueryCommandNumberFloat
+        :return: self, so that calls can be chained
+        Raises ValueError if the question was already added for a different kind of command (menu or number).
+        """
+        assert(isinstance(command, (UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat)))
+        is_menu = isinstance(command, UserQueryCommandMenu)
+        column = _ResponseColumn(command.GetQueryDic().keys() if is_menu else None)
+        with self._lock:
+            column = self._columns.setdefault(question, column)
+            if (column.categories is not None) != is_menu:
+                raise ValueError(f"Question '{question}' was added for a different kind of command")
+            self._questions_by_command[command] = question
+        return self
+
+    def AddCategoryQuestion(self, question='', categories=()):
+        """
+        :parameter question: The name of the question, hashable, e.g., string
+        :parameter categories: The keys that the answers may be, in the order of their category codes, iterable
+        :return: self, so that calls can be chained
+        """
+        self._addColumn(question, _ResponseColumn(categories))
+        return self
+
+    def AddNumberQuestion(self, question=''):
+        """
+        :parameter question: The name of the question, hashable, e.g., string
+        :return: self, so that calls can be chained
+        """
+        self._addColumn(question, _ResponseColumn())
+        return self
+
+    def GetQuestion(self, command=None):
+        """
+        :parameter command: The command, UserQueryCommand
+        :return: The question that command was added for with AddQuestion(...), or None if there is none
+        """
+        with self._lock:
+            return self._questions_by_command.get(command)
+
+    def GetQuestions(self):
+        """
+        :return: The questions, in the order that they were added, list
+        """
+        with self._lock:
+            return list(self._columns)
+
+    def GetCategories(self, question=''):
+        """
+        :parameter question: The name of a category question
+        :return: The keys that the answers may be, in category code order, tuple
+        Raises KeyError if there is no such question, and ValueError if it is a number question.
+        """
+        return self._getColumn(question, categories=True).categories
+
+    def GetRespondents(self):
+        """
+        :return: The respondents that have answered, in respondent code order, list
+        """
+        with self._lock:
+            return list(self._respondents)
+
+    def GetRecorder(self, respondent=''):
+        """
+        :parameter respondent: The respondent whose answers are recorded, hashable, e.g., string
+        :return: Middleware to add to the receiver of the respondent, UserQueryResponseRecorder
+        """
+        return UserQueryResponseRecorder(self, respondent)
+
+    def Record(self, question='', answer=None, respondent=''):
+        """
+        Append an answer to the column of a question.
+        :parameter question: The name of the question
+        :parameter answer: The answer, one of the keys of a category question, or a number
+        :parameter respondent: The respondent who answered, hashable, e.g., string
+        :return: None
+        Raises KeyError if there is no such question, and ValueError if answer isn't one of the keys of a category question.
+        """
+        with self._lock:
+            column = self._columns[question]
+            if column.codes is not None:
+                value = column.codes.get(answer)
+                if value is None:
+                    raise ValueError(f"'{answer}' is not a category of question '{question}'")
+            else:
+                value = float(answer)
+            respondent_code = self._respondents.setdefault(respondent, len(self._respondents))
+            column.values.append(value)
+            column.respondents.append(respondent_code)
+        return None
+
+    def GetCount(self, question='', respondent=None):
+        """
+        :parameter question: The name of the question
+        :parameter respondent: The respondent whose answers are counted, or None to count the answers of all respondents
+        :return: The number of answers, int
+        """
+        if respondent is None:
+            with self._lock:
+                return len(self._columns[question].values)
+        return int(self.GetValues(question, respondent).size)
+
+    def GetValues(self, question='', respondent=None):
+        """
+        :parameter question: The name of the question
+        :parameter respondent: The respondent whose answers are returned, or None for the answers of all respondents
+        :return: A copy of the answers, in the order that they were recorded, as NumPy array of category codes (int32) for a
+            category question, or of float64 for a number question
+        Raises KeyError if there is no such question.
+        """
+        numpy = _importNumpy()
+        with self._lock:
+            column = self._columns[question]
+            # Copied while the lock is held, since the columns may be appended to (and so moved) by other threads
+            values = numpy.frombuffer(column.values, dtype=column.values.typecode).copy()
+            if respondent is None:
+                return values
+            respondent_code = self._respondents.get(respondent, -1)
+            respondents = numpy.frombuffer(column.respondents, dtype=column.respondents.typecode).copy()
+        return values[respondents == respondent_code]
+
+    def GetCounts(self, question='', respondent=None):
+        """
+        :parameter question: The name of a category question
+        :parameter respondent: The respondent whose answers are counted, or None to count the answers of all respondents
+        :return: The number of answers of each key, including keys never answered, dict
+        Raises KeyError if there is no such question, and ValueError if it is a number question.
+        """
+        numpy = _importNumpy()
+        categories = self._getColumn(question, categories=True).categories
+        counts = numpy.bincount(self.GetValues(question, respondent), minlength=len(categories))
+        return dict(zip(categories, counts.tolist()))
+
+    def GetHistogram(self, question='', bins=10, value_range=None, respondent=None):
+        """
+        :parameter question: The name of a number question
+        :parameter bins: The number of equal width bins, int, or the edges of the bins, sequence of numbers
+        :parameter value_range: The lowest and highest edges of the bins, Tuple (float, float), or None for the lowest and
+            highest answers
+        :parameter respondent: The respondent whose answers are counted, or None to count the answers of all respondents
+        :return: Tuple (the number of answers in each bin, the edges of the bins), as Tuple (NumPy array, NumPy array)
+        Raises KeyError if there is no such question, and ValueError if it is a category question.
+        """
+        numpy = _importNumpy()
+        self._getColumn(question, categories=False)
+        return numpy.histogram(self.GetValues(question, respondent), bins=bins, range=value_range)
+
+    def GetMean(self, question='', respondent=None):
+        """
+        :parameter question: The name of a number question
+        :parameter respondent: The respondent whose answers are averaged, or None to average the answers of all respondents
+        :return: The mean of the answers, float, or None if there are none
+        Raises KeyError if there is no such question, and ValueError if it is a category question.
+        """
+        self._getColumn(question, categories=False)
+        values = self.GetValues(question, respondent)
+        if values.size == 0:
+            return None
+        return float(values.mean())
+
+    def GetQuantiles(self, question='', quantiles=(0.25, 0.5, 0.75), respondent=None):
+        """
+        :parameter question: The name of a number question
+        :parameter quantiles: The quantiles to compute, each between 0 and 1, sequence of floats
+        :parameter respondent: The respondent whose answers are used, or None to use the answers of all respondents
+        :return: The quantiles of the answers, interpolated linearly between answers, as NumPy array of float64, or None if
+            there are no answers
+        Raises KeyError if there is no such question, and ValueError if it is a category question.
+        """
+        numpy = _importNumpy()
+        self._getColumn(question, categories=False)
+        values = self.GetValues(question, respondent)
+        if values.size == 0:
+            return None
+        return numpy.quantile(values, quantiles)
+
+    def _addColumn(self, question='', column=None):
+        """
+        :parameter question: The name of the question
+        :parameter column: The empty column for the answers to the question, _ResponseColumn
+        :return: None
+        """
+        with self._lock:
+            assert(question not in self._columns)
+            self._columns[question] = column
+        return None
+
+    def _getColumn(self, question='', categories=True):
+        """
+        :parameter question: The name of the question
+        :parameter categories: True if the question must be a category question, False if it must be a number question
+        :return: The column of the question, _ResponseColumn
+        Raises KeyError if there is no such question, and ValueError if it is not of the kind required.
+        """
+        with self._lock:
+            column = self._columns[question]
+        if (column.categories is not None) != categories:
+            kind = 'category' if categories else 'number'
+            raise ValueError(f"Question '{question}' is not a {kind} question")
+        return column
+
+
+class UserQueryResponseRecorder(UserQueryMiddleware):
+    """
+    Middleware that records each answer that passes validation, to a question added to a UserQueryResponseStore with
+    AddQuestion(...), as an answer of one respondent. Answers to commands that weren't added (e.g., a menu that confirms
+    overwriting a file) are ignored. One recorder is added to the receiver of each respondent.
+    """
+
+    def __init__(self, store=None, respondent=''):
+        """
+        :parameter store: The store to record answers in, UserQueryResponseStore
+        :parameter respondent: The respondent whose answers are recorded, hashable, e.g., string
+        """
+        assert(isinstance(store, UserQueryResponseStore))
+        self._store = store
+        self._respondent = respondent
+
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        if result.value:
+            question = self._store.GetQuestion(command)
+            if question is not None:
+                self._store.Record(question, processed_response, self._respondent)
+        return result
@@ -0,0 +1,199 @@
+"""
+Defines an opt-in tracer that records how long UserQueryCommand.Execute(...) and each of its primitive operations take,
+as nested spans, and writes them to a Chrome trace-event JSON file, which can be opened in a trace viewer (e.g.,
+chrome://tracing, or https://ui.perfetto.dev, which loads the file locally) to see the timeline of a query session.
+
+Tracing is off until a tracer is installed with setUserQueryTracer(...), or by using a UserQueryTracer as a context
+manager. While no tracer is installed, Execute(...) calls the primitive operations directly, so there is no overhead.
+Spans of commands executed on behalf of another (e.g., the confirmation menu of UserQueryCommandPathSave) are nested within
+the span of the outer command. Spans are recorded separately for each thread.
+
+Exported Classes:
+    UserQueryTraceSpan -- A timed span: its name, category, start, duration, thread, and nesting depth.
+    UserQueryTracer -- Records spans, and exports them in the Chrome trace-event format.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    setUserQueryTracer(...) -- Install the tracer used by UserQueryCommand.Execute(...), or None to stop tracing.
+    getUserQueryTracer() -- Returns the installed tracer, or None if tracing is off.
+"""
+
+# Standard
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Local
+
+
+class UserQueryTraceSpan(object):
+    """
+    A timed span recorded by UserQueryTracer.
+
+    Attributes:
+        name -- The name of the span, e.g., 'UserQueryCommandNumberInteger._doProcessRawResponse', string
+        category -- The category of the span, e.g., 'command', 'primitive', or 'receiver', string
+        start_ns -- The start of the span, in nanoseconds since the tracer was created, int
+        duration_ns -- The duration of the span, in nanoseconds, int
+        thread_id -- The identifier of the thread that the span was recorded in, int
+        depth -- The number of spans that enclose the span, in the same thread, int
+        args -- Extra information about the span, shown by trace viewers, dict
+    """
+    __slots__ = ('name', 'category', 'start_ns', 'duration_ns', 'thread_id', 'depth', 'args')
+
+    def __init__(self, name='', category='', start_ns=0, duration_ns=0, thread_id=0, depth=0, args=None):
+        self.name = name
+        self.category = category
+        self.start_ns = start_ns
+        self.duration_ns = duration_ns
+        self.thread_id = thread_id
+        self.depth = depth
+        self.args = args if args is not None else {}
+
+    def __repr__(self):
+        return f"UserQueryTraceSpan({self.name!r}, {self.category!r}, depth={self.depth}, duration_ns={self.duration_ns})"
+
+
+class UserQueryTracer(object):
+    """
+    Records timed spans, and exports them in the Chrome trace-event format. Spans may be recorded from several threads.
+
+    A tracer is a context manager, which installs it with setUserQueryTracer(...) on entry, and restores the tracer that was
+    installed before on exit, e.g.:
+        with UserQueryTracer() as tracer:
+            command.Execute()
+        tracer.WriteChromeTrace('session_trace.json')
+
+    Methods:
+        Span(...) -- Context manager that records a span around the code that it encloses.
+        Wrap(...) -- Returns a function that records a span around each call of another function.
+        GetSpans() -- Returns the spans recorded so far, in the order that they ended.
+        Clear() -- Discards the spans recorded so far.
+        GetChromeTrace() -- Returns the spans in the Chrome trace-event format.
+        WriteChromeTrace(...) -- Writes the spans to a Chrome trace-event JSON file.
+    """
+
+    def __init__(self, clock=time.perf_counter_ns):
+        """
+        :parameter clock: Function that returns a monotonic time in nanoseconds, used to time spans
+        """
+        self._clock = clock
+        self._origin = clock()
+        self._spans = []
+        self._lock = threading.Lock()
+        # The depth of the innermost open span, per thread
+        self._local = threading.local()
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getUserQueryTracer()
+        setUserQueryTracer(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        setUserQueryTracer(self._previous)
+        self._previous = None
+        return False
+
+    @contextmanager
+    def Span(self, name='', category='', args=None):
+        """
+        Context manager that records a span around the code that it encloses. The span is recorded even if the code
+        raises an exception, with the name of the exception added to its args.
+        :parameter name: The name of the span, string
+        :parameter category: The category of the span, string
+        :parameter args: Extra information about the span, dict, or None
+        """
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        start = self._clock()
+        try:
+            yield
+        except BaseException as err:
+            args = dict(args or {})
+            args['exception'] = type(err).__name__
+            raise
+        finally:
+            end = self._clock()
+            self._local.depth = depth
+            span = UserQueryTraceSpan(name, category, start - self._origin, end - start, threading.get_ident(), depth, args)
+            with self._lock:
+                self._spans.append(span)
+
+    def Wrap(self, function=None, name='', category=''):
+        """
+        :parameter function: The function to trace, callable
+        :parameter name: The name of the span recorded for each call, string
+        :parameter category: The category of the span recorded for each call, string
+        :return: A function that calls function with the same arguments, recording a span around each call, callable
+        """
+        def traced(*args, **kwargs):
+            with self.Span(name, category):
+                return function(*args, **kwargs)
+        return traced
+
+    def GetSpans(self):
+        """
+        :return: The spans recorded so far, in the order that they ended, list of UserQueryTraceSpan
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def Clear(self):
+        """
+        Discard the spans recorded so far.
+        :return: None
+        """
+        with self._lock:
+            self._spans.clear()
+        return None
+
+    def GetChromeTrace(self):
+        """
+        :return: The spans as complete ('X') events of the Chrome trace-event format, with times in microseconds, dict
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.GetSpans():
+            events.append({'name': span.name, 'cat': span.category, 'ph': 'X', 'ts': span.start_ns / 1000,
+                           'dur': span.duration_ns / 1000, 'pid': pid, 'tid': span.thread_id, 'args': span.args})
+        # Trace viewers nest spans correctly when enclosing spans come first
+        events.sort(key=lambda event: (event['tid'], event['ts'], -event['dur']))
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def WriteChromeTrace(self, path=''):
+        """
+        Write the spans to a Chrome trace-event JSON file.
+        :parameter path: The path of the file, string or Path
+        :return: The number of spans written, int
+        """
+        trace = self.GetChromeTrace()
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(trace, file, default=str)
+        return len(trace['traceEvents'])
+
+
+# The installed tracer, or None if tracing is off
+_tracer = None
+
+
+def setUserQueryTracer(tracer=None):
+    """
+    Install the tracer used by UserQueryCommand.Execute(...), for all threads.
+    :parameter tracer: The tracer, UserQueryTracer, or None to stop tracing
+    :return: None
+    """
+    global _tracer
+    _tracer = tracer
+    return None
+
+
+def getUserQueryTracer():
+    """
+    :return: The installed tracer, UserQueryTracer, or None if tracing is off
+    """
+    return _tracer
@@ -0,0 +1,84 @@
+"""
+UserResponseCollector facilitates the collection of user responses from the command line.
+
+The public classes and functions of the package's modules can be imported from the package itself, e.g.:
+    from UserResponseCollector import askForInt
+
+So that a short-lived script pays only for what it uses, nothing is imported with the package. Each module is imported by
+__getattr__(...) when one of its names is first used, and the name is then kept as an ordinary package attribute. The
+global prebound method UserQueryReceiver_GetCommandReceiver is not exported here, since the global receiver may be replaced;
+obtain it from UserResponseCollector.UserQueryReceiver. Nor are the classes with the same name as their module (e.g.,
+UserQueryCommand), since UserResponseCollector.UserQueryCommand is the module.
+
+Exported Classes:
+    See _EXPORTS, which maps each exported name to the module that defines it.
+
+Exported Exceptions:
+    UserQueryReceiverError, UserQueryReceiverTerminateQueryingThreadError, UserQueryReceiverTimeoutError
+
+Exported Functions:
+    See _EXPORTS, which maps each exported name to the module that defines it.
+"""
+
+# Standard
+
+# Local
+
+
+def _exports(module='', names=''):
+    """
+    :parameter module: The name of the module in the package, string
+    :parameter names: The exported names defined by the module, separated by whitespace, string
+    :return: Dictionary mapping each name to the module, dict
+    """
+    return dict.fromkeys(names.split(), module)
+
+
+# Maps each exported name to the module in the package that defines it
+_EXPORTS = {
+    **_exports('UserQueryCommand', """
+        UserQueryCommandMenu UserQueryCommandNumberInteger UserQueryCommandNumberFloat UserQueryCommandStr
+        UserQueryCommandText UserQueryCommandPathSave UserQueryCommandPathOpen UserQueryCommandPathGlob
+        UserQueryCommandPathDirectory UserQueryCommandTable UserQueryTable UserQueryPathMatches OverwritePolicy
+        askForMenuSelection askForInt askForFloat askForStr askForText askForPathSave resolvePathSaveBatch askForPathOpen
+        askForPathGlob askForPathDirectory askForTable"""),
+    **_exports('UserQueryReceiver', """
+        ConsoleUserQueryReceiver BytesConsoleUserQueryReceiver ReadlineConsoleUserQueryReceiver
+        CursesUserQueryReceiver RawConsoleUserQueryReceiver UserQueryCancellationToken UserQueryReceiverError
+        UserQueryReceiverTerminateQueryingThreadError UserQueryReceiverTimeoutError"""),
+    **_exports('PathValidator', """
+        PathValidatorMaxSize PathValidatorNotEmpty PathValidatorText PathValidatorSignature PathValidatorCSV
+        validatePath"""),
+    **_exports('UserQueryResult', 'registerUserQueryMessage asUserQueryResult'),
+    **_exports('UserQueryMiddleware', 'UserQueryMiddlewarePipeline'),
+    **_exports('UserQueryMemo', 'UserQueryResponseMemo'),
+    **_exports('UserQueryRateLimiter', 'UserQueryTokenBucket'),
+    **_exports('UserQueryStore', 'UserQueryResponseStore UserQueryResponseRecorder'),
+    **_exports('UserQueryTracer', 'UserQueryTraceSpan setUserQueryTracer getUserQueryTracer'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name=''):
+    """
+    Import the module that defines an exported name when the name is first used, and keep the name as a package attribute,
+    so that this is not called for it again.
+    :parameter name: The name of the package attribute, string
+    :return: The package attribute
+    Raises AttributeError if the package has no attribute name.
+    """
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__(...) rather than importlib.import_module(...), so that the import is included in -X importtime output
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    :return: The names of the package attributes, including the exported names not yet imported, list of strings
+    """
+    return sorted(set(globals()) | set(_EXPORTS))
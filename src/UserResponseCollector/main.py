@@ -18,6 +18,10 @@ Exported Functions:
     do_StringQuery -- Use UserQueryReceiver and UserQueryCommandStr to make a Str query.
     do_PathSaveQuery -- Use UserQueryReceiver and UserQueryCommandPathSave to make a PathSave query.
     do_PathOpenQuery -- Use UserQueryReceiver and UserQueryCommandPathOpen to make a PathOpen query.
+    do_TableQuery -- Use UserQueryReceiver and UserQueryCommandTable to make a Table query.
+    do_TextQuery -- Use UserQueryReceiver and UserQueryCommandText to make a Text query.
+    do_PathGlobQuery -- Use UserQueryReceiver and UserQueryCommandPathGlob to make a PathGlob query.
+    do_PathDirectoryQuery -- Use UserQueryReceiver and UserQueryCommandPathDirectory to make a PathDirectory query.
     do_Debug -- Change the code inside this function to facilitate debugging.
 """
 
@@ -25,7 +29,8 @@ Exported Functions:
 
 # Local
 from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandPathOpen, UserQueryCommandPathSave, UserQueryCommandNumberInteger
-from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberFloat, UserQueryCommandStr
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberFloat, UserQueryCommandStr, UserQueryCommandTable
+from UserResponseCollector.UserQueryCommand import UserQueryCommandText, UserQueryCommandPathGlob, UserQueryCommandPathDirectory
 import UserResponseCollector.UserQueryReceiver
 
 
@@ -136,6 +141,67 @@ def do_PathOpenQuery():
 
     return None
 
+def do_TableQuery():
+    """
+    Use UserQueryReceiver to make a Table query.
+    """
+    # Build a query for the user to obtain a table of comma separated values
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    query_preface = 'Paste the widgets you want to order.'
+    command = UserQueryCommandTable(receiver, query_preface, {'widget':str, 'quantity':int, 'price':float})
+
+    table = command.Execute()
+
+    print(f"You entered {len(table)} rows, with a total quantity of {sum(table.GetColumn('quantity'))}.")
+
+    return None
+
+def do_TextQuery():
+    """
+    Use UserQueryReceiver to make a Text query.
+    """
+    # Build a query for the user to obtain multiple lines of text
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    query_preface = 'Paste the text you want to keep.'
+    command = UserQueryCommandText(receiver, query_preface, max_length = 10000)
+
+    with command.Execute() as text_file:
+        line_count = sum(1 for line in text_file)
+
+    print(f"You entered {line_count} lines of text.")
+
+    return None
+
+def do_PathGlobQuery():
+    """
+    Use UserQueryReceiver to make a PathGlob query.
+    """
+    # Build a query for the user to obtain a glob pattern for a set of files to open
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    query_preface = 'Which files do you want to open?'
+    command = UserQueryCommandPathGlob(receiver, query_preface)
+
+    file_count = sum(1 for path in command.Execute())
+
+    print(f"Your pattern matches {file_count} files.")
+
+    return None
+
+def do_PathDirectoryQuery():
+    """
+    Use UserQueryReceiver to make a PathDirectory query.
+    """
+    # Build a query for the user to choose a directory
+    receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+    query_preface = 'Which directory do you want to use?'
+    command = UserQueryCommandPathDirectory(receiver, query_preface)
+
+    directory = command.Execute()
+
+    print(f"You chose this directory: {str(directory)}")
+
+    return None
+
 if __name__ == '__main__':
     
     """
@@ -150,7 +216,7 @@ if __name__ == '__main__':
     receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
     print(f"Receiver ID: {id(receiver)}")
     query_preface = 'How do you want to use the workbench?'
-    query_dic = {'q':'Quit', 'i':'Integer Query', 'f':'Float Query', 't':'text string', 'm':'Menu Query', 'o':'File Open', 's':'File Save', 'd':'Debug'}
+    query_dic = {'q':'Quit', 'i':'Integer Query', 'f':'Float Query', 't':'text string', 'm':'Menu Query', 'o':'File Open', 'g':'Files Open (Glob)', 'r':'Directory', 's':'File Save', 'c':'CSV Table', 'x':'Multi-line Text', 'd':'Debug'}
     command = UserQueryCommandMenu(receiver, query_preface, query_dic)    
 
     response = command.Execute() 
@@ -177,8 +243,20 @@ if __name__ == '__main__':
             case 'o':
                 do_PathOpenQuery()
 
+            case 'g':
+                do_PathGlobQuery()
+
+            case 'r':
+                do_PathDirectoryQuery()
+
             case 's':
                 do_PathSaveQuery()
+
+            case 'c':
+                do_TableQuery()
+
+            case 'x':
+                do_TextQuery()
         
         print('--------------------')
         response = command.Execute() 
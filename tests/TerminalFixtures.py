@@ -0,0 +1,23 @@
+"""
+This module provides fixtures shared by the unit tests:
+    (1) TerminalStdin and (2) TerminalStdinFileno classes
+"""
+
+# Standard
+import io
+
+
+class TerminalStdin(io.StringIO):
+    """
+    Text stream that claims to be a terminal.
+    """
+    def isatty(self):
+        return True
+
+
+class TerminalStdinFileno(TerminalStdin):
+    """
+    Text stream that claims to be a terminal, with a file descriptor.
+    """
+    def fileno(self):
+        return 0
@@ -0,0 +1,198 @@
+"""
+This module provides allocation regression tests for:
+    (1) UserQueryCommand.Execute(...) of every concrete UserQueryCommand class, run under a scripted receiver
+
+Each command is executed many times, answered first with invalid responses and then with a valid one, so that error messages
+are issued. tracemalloc measures the peak memory allocated during a single query, and the memory retained per query after
+the response is discarded (which should be about 0, or memory is leaking). Both are checked against the baselines checked
+in to allocation_baselines.json, for the running minor version of Python, and a test fails if a measurement exceeds its
+baseline by more than _TOLERANCE (plus _SLACK_BYTES, so that small baselines aren't failed by noise).
+
+Tests fail if there are no baselines for the running version of Python, rather than being skipped, so that a version
+without baselines (e.g., a newly supported one) isn't silently left unchecked. To record baselines for a new version, or
+after checking that an increase is intended, run with the environment variable UPDATE_ALLOCATION_BASELINES=1, e.g.:
+    UPDATE_ALLOCATION_BASELINES=1 python -m pytest tests/test_Allocations.py
+"""
+
+# Standard
+import unittest
+import gc
+import itertools
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Local
+from UserResponseCollector.UserQueryReceiver import UserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+from UserResponseCollector.UserQueryCommand import UserQueryCommandStr, UserQueryCommandText, UserQueryCommandPathSave
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathOpen, UserQueryCommandPathGlob, UserQueryCommandPathDirectory
+from UserResponseCollector.UserQueryCommand import UserQueryCommandTable
+from UserResponseCollector.UserQueryMiddleware import _EMPTY_DICT
+
+
+_BASELINES_PATH = Path(__file__).with_name('allocation_baselines.json')
+_PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+# A measurement may exceed its baseline by this fraction of the baseline, plus _SLACK_BYTES
+_TOLERANCE = 0.25
+_SLACK_BYTES = 512
+
+# Queries executed before measuring, so that caches (e.g., of directories and regular expressions) are filled
+_WARM_UP_QUERIES = 20
+# Queries executed while measuring
+_MEASURED_QUERIES = 200
+
+
+class ScriptedUserQueryReceiver(UserQueryReceiver):
+    """
+    Receiver that answers every query from a script of responses, repeated as often as needed, and discards error
+    messages once they have been rendered, as a receiver showing them would.
+    """
+    def __init__(self, script=()):
+        """
+        :parameter script: The raw responses, in the order that they are requested, sequence of strings
+        """
+        UserQueryReceiver.__init__(self)
+        self._script = itertools.cycle(script)
+
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        return next(self._script)
+
+    def IssueErrorMessage(self, msg=''):
+        str(msg)
+        return None
+
+
+def measureAllocations(command=None, query_count=_MEASURED_QUERIES):
+    """
+    Execute command query_count times, measuring its allocations with tracemalloc.
+    :parameter command: The command to execute, UserQueryCommand
+    :parameter query_count: The number of queries, int
+    :return: Tuple (peak bytes allocated during a query, bytes retained per query), as Tuple (int, float)
+    """
+    # Collect garbage from reference cycles before and after, so that only memory that is still reachable is retained
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        peak = 0
+        for i in range(query_count):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _closeResponse(command.Execute())
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        gc.collect()
+        retained = (tracemalloc.get_traced_memory()[0] - start) / query_count
+    finally:
+        tracemalloc.stop()
+    return (peak, retained)
+
+
+def _closeResponse(response=None):
+    """
+    Close a response that holds resources (e.g., the spooled text of UserQueryCommandText), as an application would.
+    :parameter response: The response returned by Execute()
+    :return: None
+    """
+    close = getattr(response, 'Close', None) or getattr(response, 'close', None)
+    if close is not None:
+        close()
+    return None
+
+
+def _loadBaselines():
+    """
+    :return: The baselines for all versions of Python, keyed by version, then by command class name, dict
+    """
+    if not _BASELINES_PATH.exists():
+        return {}
+    with open(_BASELINES_PATH, encoding='utf-8') as file:
+        return json.load(file)
+
+
+class Test_Allocations(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.measurements = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.environ.get('UPDATE_ALLOCATION_BASELINES') and cls.measurements:
+            baselines = _loadBaselines()
+            baselines.setdefault(_PYTHON_VERSION, {}).update(cls.measurements)
+            with open(_BASELINES_PATH, 'w', encoding='utf-8') as file:
+                json.dump(baselines, file, indent=4, sort_keys=True)
+                file.write('\n')
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        (self.root / 'data.csv').write_text('a,b\n1,2\n')
+        (self.root / 'subdirectory').mkdir()
+        # Old enough that cached directory listings are trusted
+        for path in (self.root / 'data.csv', self.root / 'subdirectory', self.root):
+            os.utime(path, (0, 0))
+
+    def checkAllocations(self, command_class=None, script=(), *args):
+        """
+        Measure the allocations of command_class, answered by script, and check them against the baselines.
+        :parameter command_class: The concrete UserQueryCommand class
+        :parameter script: The raw responses for each query, sequence of strings
+        :parameter args: The arguments of command_class, after the receiver and query preface
+        """
+        receiver = ScriptedUserQueryReceiver(script)
+        command = command_class(receiver, 'Please respond.', *args)
+        for i in range(_WARM_UP_QUERIES):
+            _closeResponse(command.Execute())
+        (peak, retained) = measureAllocations(command)
+        name = command_class.__name__
+        self.measurements[name] = {'peak_bytes': peak, 'retained_bytes_per_query': round(retained, 1)}
+        if os.environ.get('UPDATE_ALLOCATION_BASELINES'):
+            return
+        baseline = _loadBaselines().get(_PYTHON_VERSION, {}).get(name)
+        if baseline is None:
+            self.fail(f"No allocation baseline for {name} on Python {_PYTHON_VERSION} in {_BASELINES_PATH.name}; record the "
+                      f"baselines for this version by running the tests with UPDATE_ALLOCATION_BASELINES=1")
+        for (key, value) in self.measurements[name].items():
+            limit = baseline[key] * (1 + _TOLERANCE) + _SLACK_BYTES
+            self.assertLessEqual(value, limit, f"{name} {key} is {value}, but the baseline is {baseline[key]}")
+
+    def test_Menu(self):
+        self.checkAllocations(UserQueryCommandMenu, ['x', 'a'], {'a':'Accept', 'r':'Reject', 's':'Skip'})
+
+    def test_NumberInteger(self):
+        self.checkAllocations(UserQueryCommandNumberInteger, ['ten', '0', '10'], 1, 100)
+
+    def test_NumberFloat(self):
+        self.checkAllocations(UserQueryCommandNumberFloat, ['x', '2.5', '0.5'], 0.0, 1.0)
+
+    def test_Str(self):
+        self.checkAllocations(UserQueryCommandStr, ['x' * 30, 'name'], 25)
+
+    def test_Text(self):
+        self.checkAllocations(UserQueryCommandText, ['x' * 30, 'y' * 30, '.', 'line one', 'line two', '.'], 50)
+
+    def test_PathSave(self):
+        self.checkAllocations(UserQueryCommandPathSave, [str(self.root / 'new_file')])
+
+    def test_PathOpen(self):
+        self.checkAllocations(UserQueryCommandPathOpen, [str(self.root / 'data'), str(self.root / 'data.csv')], True)
+
+    def test_PathGlob(self):
+        self.checkAllocations(UserQueryCommandPathGlob, [str(self.root / '*.txt'), str(self.root / '*.csv')], 10, False)
+
+    def test_PathDirectory(self):
+        self.checkAllocations(UserQueryCommandPathDirectory, ['x', '1', 'u', 's'], str(self.root))
+
+    def test_Table(self):
+        self.checkAllocations(UserQueryCommandTable, ['name,count', 'a,x', '', 'name,count', 'a,1', 'b,2', ''], {'name':str, 'count':int})
+
+
+if __name__ == '__main__':
+    unittest.main()
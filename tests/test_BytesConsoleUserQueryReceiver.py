@@ -0,0 +1,68 @@
+"""
+This module provides unit tests for:
+    (1) BytesConsoleUserQueryReceiver class
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+
+# Local
+from UserResponseCollector.UserQueryReceiver import BytesConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandNumberFloat, UserQueryCommandMenu
+
+
+class Test_BytesConsoleUserQueryReceiver(unittest.TestCase):
+
+    def test_GetRawResponseUndecoded(self):
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b'10\r\n2.5\nlast'))
+        act_val = receiver.GetRawResponseUndecoded('How many?')
+        # The line is a view of the chunk read from the stream, not a copy
+        self.assertIsInstance(act_val, memoryview)
+        self.assertEqual(b'10', act_val.tobytes())
+        self.assertEqual(b'2.5', receiver.GetRawResponseUndecoded().tobytes())
+        self.assertEqual(b'last', receiver.GetRawResponseUndecoded().tobytes())
+        self.assertRaises(EOFError, receiver.GetRawResponseUndecoded)
+
+    def test_GetRawResponse_lines_span_chunks(self):
+        # A chunk size smaller than the lines forces lines to be split across chunks
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO('café au lait\nsecond line\n'.encode('utf-8')), chunk_size=4)
+        self.assertEqual('café au lait', receiver.GetRawResponse())
+        self.assertEqual('second line', receiver.GetRawResponse())
+
+    def test_GetRawResponse_prompt_stream(self):
+        prompt_stream = io.StringIO()
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b'a\n'), prompt_stream=prompt_stream)
+        receiver.GetRawResponse('Choose:  ')
+        self.assertEqual('Choose:  ', prompt_stream.getvalue())
+
+    def test_GetRawResponseChunks(self):
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b'line 1\nline 2\n.\nnext\n'))
+        exp_val = ['line 1\n', 'line 2\n']
+        act_val = list(receiver.GetRawResponseChunks('Paste some lines.'))
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual('next', receiver.GetRawResponse())
+
+    # Apply a patch() decorator to capture the printed error messages.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_numeric_commands(self, mock_stdout):
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b'ten\n0\n10\nx\n2.5\nb\n'))
+        command = UserQueryCommandNumberInteger(receiver, '', minimum=1, maximum=20)
+        self.assertEqual(10, command.Execute())
+        command = UserQueryCommandNumberFloat(receiver, '')
+        self.assertEqual(2.5, command.Execute())
+        command = UserQueryCommandMenu(receiver, '', {'a':'Option A', 'b':'Option B'})
+        self.assertEqual('b', command.Execute())
+        # Error messages show the raw response decoded, rather than as bytes
+        self.assertEqual("\n'ten' is not an integer. Please try again.\n\n'0' is less than 1. Please try again.\n"
+                         "\n'x' is not a floating point number. Please try again.\n", mock_stdout.getvalue())
+
+    def test_NumberInteger_command_doProcessRawResponse_bytes(self):
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b''))
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertEqual((42, ''), command._doProcessRawResponse(memoryview(b'42')))
+
+
+if __name__ == '__main__':
+    unittest.main()
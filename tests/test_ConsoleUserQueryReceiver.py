@@ -7,9 +7,13 @@ This module provides unit tests for:
 import unittest
 from unittest.mock import patch
 import io
+import gc
+import weakref
 
 # Local
-from UserResponseCollector.UserQueryReceiver import _instance, UserQueryReceiver_GetCommandReceiver
+from UserResponseCollector.UserQueryReceiver import _instance, UserQueryReceiver_GetCommandReceiver, ConsoleUserQueryReceiver
+import UserResponseCollector.UserQueryReceiver
+from TerminalFixtures import TerminalStdin
 
 
 class Test_ConsoleUserQueryReceiver(unittest.TestCase):
@@ -37,6 +41,30 @@ class Test_ConsoleUserQueryReceiver(unittest.TestCase):
         act_val = receiver.GetRawResponse('Please type a text response and hit enter.', {'key':'value'})
         self.assertEqual(exp_val, act_val)
         
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    @patch('sys.stdin', io.StringIO('first line\nsecond line\nEND\nnot in block\n'))
+    def test_GetRawResponseBlock(self):
+        exp_val = ['first line', 'second line']
+        receiver = UserQueryReceiver_GetCommandReceiver() 
+        act_val = list(receiver.GetRawResponseBlock('Please paste some lines.', {}, 'END'))
+        self.assertEqual(exp_val, act_val)
+        # The line after the terminator is left for the next response
+        self.assertEqual('not in block', receiver.GetRawResponse())
+
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    @patch('sys.stdin', io.StringIO('abcdefghij\n.\n.x\n.\nnot in block\n'))
+    def test_GetRawResponseChunks(self):
+        # The long line is split into chunks, and '.x' is not mistaken for the terminator
+        exp_val = ['abcd', 'efgh', 'ij\n']
+        receiver = UserQueryReceiver_GetCommandReceiver() 
+        act_val = list(receiver.GetRawResponseChunks('Please paste some lines.', {}, '.', 4))
+        self.assertEqual(exp_val, act_val)
+        exp_val = ['.x\n']
+        act_val = list(receiver.GetRawResponseChunks('Please paste some lines.', {}, '.', 4))
+        self.assertEqual(exp_val, act_val)
+        # The line after the terminator is left for the next response
+        self.assertEqual('not in block', receiver.GetRawResponse())
+
     # Apply a patch() decorator to replace keyboard input from user with a string.
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_IssueErrorMessage(self, mock_stdout):
@@ -46,5 +74,151 @@ class Test_ConsoleUserQueryReceiver(unittest.TestCase):
         self.assertEqual(exp_val, mock_stdout.getvalue())
 
 
+class _CountingReader(io.BytesIO):
+    """
+    Binary stream that counts the number of read requests made of it.
+    """
+    def __init__(self, data=b''):
+        super().__init__(data)
+        self.read_count = 0
+
+    def read1(self, size=-1):
+        self.read_count += 1
+        return super().read1(size)
+
+
+class Test_ConsoleUserQueryReceiver_headless(unittest.TestCase):
+
+    # Apply a patch() decorator to replace keyboard input from user with a string, which is not a terminal.
+    @patch('sys.stdin', io.StringIO('answer\n'))
+    def test_IsHeadless_pipe(self):
+        # Reading ahead is only ever turned on explicitly
+        receiver = ConsoleUserQueryReceiver()
+        self.assertFalse(receiver.IsHeadless())
+        self.assertFalse(receiver._isInteractive())
+        self.assertTrue(ConsoleUserQueryReceiver(headless=True).IsHeadless())
+
+    # Apply a patch() decorator to replace keyboard input from user with a string that claims to be a terminal.
+    @patch('sys.stdin', TerminalStdin('answer\n'))
+    def test_IsHeadless_terminal(self):
+        receiver = ConsoleUserQueryReceiver()
+        self.assertFalse(receiver.IsHeadless())
+        self.assertTrue(receiver._isInteractive())
+        self.assertFalse(ConsoleUserQueryReceiver(headless=True)._isInteractive())
+
+    # Apply a patch() decorator to capture the console output.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_pipe_shared_with_stdin(self, mock_stdout):
+        # Without headless=True, a piped stdin is read one line per query, so the client can also read sys.stdin itself
+        receiver = ConsoleUserQueryReceiver()
+        with patch('sys.stdin', io.TextIOWrapper(io.BytesIO(b'1\n2\n3\n'), encoding='ascii')):
+            self.assertEqual('1', receiver.GetRawResponse('Prompt: '))
+            self.assertEqual('2', input())
+            self.assertEqual('3', receiver.GetRawResponse('Prompt: '))
+
+    # Apply patch() decorators to replace keyboard input from user with a string, and to capture the console output.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('sys.stdin', io.StringIO('first\nsecond\n'))
+    def test_GetRawResponse_headless_no_prompt(self, mock_stdout):
+        prompt_stream = io.StringIO()
+        receiver = ConsoleUserQueryReceiver(headless=True, prompt_stream=prompt_stream)
+        self.assertEqual('first', receiver.GetRawResponse('Prompt 1: '))
+        self.assertEqual('second', receiver.GetRawResponse('Prompt 2: '))
+        self.assertRaises(EOFError, receiver.GetRawResponse, 'Prompt 3: ')
+        # Prompts go to the prompt stream, not to the console
+        self.assertEqual('', mock_stdout.getvalue())
+        self.assertEqual('Prompt 1: Prompt 2: Prompt 3: ', prompt_stream.getvalue())
+
+    # Apply patch() decorators to replace keyboard input from user with a string, and to capture the console output.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('sys.stdin', io.StringIO('typed\n'))
+    def test_GetRawResponse_not_headless(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(headless=False)
+        self.assertEqual('typed', receiver.GetRawResponse('Prompt: '))
+        self.assertEqual('Prompt: ', mock_stdout.getvalue())
+
+    def test_GetRawResponse_headless_reads_ahead(self):
+        stdin = io.TextIOWrapper(_CountingReader(''.join(f"{i}\n" for i in range(1000)).encode('ascii')), encoding='ascii')
+        receiver = ConsoleUserQueryReceiver(headless=True)
+        with patch('sys.stdin', stdin):
+            act_val = [int(receiver.GetRawResponseUndecoded()) for i in range(1000)]
+        self.assertEqual(list(range(1000)), act_val)
+        # All of the queued answers were consumed with a single read of the pipe
+        self.assertEqual(1, stdin.buffer.read_count)
+
+
+class _RecordingStdout(io.StringIO):
+    """
+    Text stream that records each separate write made to it.
+    """
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, s):
+        self.writes.append(s)
+        return super().write(s)
+
+
+class Test_ConsoleUserQueryReceiver_buffered_output(unittest.TestCase):
+
+    # Apply a patch() decorator to capture the console output.
+    @patch('sys.stdout', new_callable=_RecordingStdout)
+    def test_IssueErrorMessage_buffered(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(buffer_output=True)
+        receiver.IssueErrorMessage('First error')
+        receiver.IssueErrorMessage('Second error')
+        # Nothing is written until the explicit flush point, and then everything is written at once
+        self.assertEqual([], mock_stdout.writes)
+        receiver.Flush()
+        self.assertEqual(['First error\nSecond error\n'], mock_stdout.writes)
+
+    # Apply patch() decorators to replace keyboard input from user with a string, and to capture the console output.
+    @patch('sys.stdout', new_callable=_RecordingStdout)
+    @patch('sys.stdin', io.StringIO('typed\n'))
+    def test_GetRawResponse_buffered_not_headless(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(headless=False, buffer_output=True)
+        receiver.IssueErrorMessage('An error')
+        # Input is needed, so the error message and the prompt are written together
+        self.assertEqual('typed', receiver.GetRawResponse('Prompt: '))
+        self.assertEqual(['An error\nPrompt: '], mock_stdout.writes)
+
+    # Apply patch() decorators to replace keyboard input from user with a string, and to capture the console output.
+    @patch('sys.stdout', new_callable=_RecordingStdout)
+    @patch('sys.stdin', io.StringIO('1\n2\n'))
+    def test_GetRawResponse_buffered_headless(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(headless=True, prompt_stream=mock_stdout, buffer_output=True, output_buffer_size=20)
+        receiver.GetRawResponse('Prompt 1: ')
+        receiver.IssueErrorMessage('An error')
+        # Input is never needed from a person, so nothing is written until the buffer is full
+        self.assertEqual([], mock_stdout.writes)
+        receiver.GetRawResponse('Prompt 2: ')
+        self.assertEqual(['Prompt 1: An error\nPrompt 2: '], mock_stdout.writes)
+
+    # Apply patch() decorators to capture the console output, and the exit handlers registered.
+    @patch('sys.stdout', new_callable=_RecordingStdout)
+    @patch('atexit.register')
+    def test_flush_at_exit(self, mock_register, mock_stdout):
+        with patch.object(UserResponseCollector.UserQueryReceiver, '_receivers_to_flush_registered', False):
+            receivers = [ConsoleUserQueryReceiver(buffer_output=True) for i in range(3)]
+            receivers[0].IssueErrorMessage('An error')
+            # One exit handler for all of the receivers, which flushes them
+            mock_register.assert_called_once_with(UserResponseCollector.UserQueryReceiver._flushReceiversAtExit)
+            UserResponseCollector.UserQueryReceiver._flushReceiversAtExit()
+        self.assertEqual(['An error\n'], mock_stdout.writes)
+
+    # Apply a patch() decorator to capture the console output.
+    @patch('sys.stdout', new_callable=_RecordingStdout)
+    def test_flush_when_collected(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(buffer_output=True)
+        receiver.IssueErrorMessage('An error')
+        reference = weakref.ref(receiver)
+        del receiver
+        gc.collect()
+        # Being flushed at exit doesn't keep the receiver alive, and what it buffered is written when it is collected
+        self.assertIsNone(reference())
+        self.assertEqual(['An error\n'], mock_stdout.writes)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,159 @@
+"""
+This module provides unit tests for:
+    (1) CursesUserQueryReceiver class
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+
+try:
+    import curses
+except ImportError:
+    curses = None
+
+# Local
+from UserResponseCollector.UserQueryReceiver import CursesUserQueryReceiver, _MenuViewport, _LineRenderer
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu
+from TerminalFixtures import TerminalStdin
+
+
+class _FakeWindow(object):
+    """
+    Stands in for a curses window, recording what is drawn, and returning keys from a list.
+    """
+    def __init__(self, height=10, width=40, keys=()):
+        self.height = height
+        self.width = width
+        self.keys = list(keys)
+        self.rows = {}
+        self.writes = 0
+
+    def getmaxyx(self):
+        return (self.height, self.width)
+
+    def move(self, row, column):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def addnstr(self, row, column, text, count, attribute=0):
+        self.rows[row] = text[:count]
+        self.writes += 1
+
+    def refresh(self):
+        pass
+
+    def clear(self):
+        self.rows = {}
+
+    def get_wch(self):
+        return self.keys.pop(0)
+
+
+class Test_MenuViewport(unittest.TestCase):
+
+    def setUp(self):
+        self.query_dic = {str(i): f"Option {i}" for i in range(5000)}
+
+    def test_GetLines(self):
+        viewport = _MenuViewport({'a':'Apple', 'b':'Banana'}, 3)
+        exp_val = [('(a) Apple', True), ('(b) Banana', False), ('', False)]
+        self.assertEqual(exp_val, viewport.GetLines())
+        self.assertEqual('a', viewport.GetSelectedKey())
+
+    def test_MoveBy_scrolls(self):
+        viewport = _MenuViewport(self.query_dic, 10)
+        viewport.MoveBy(15)
+        self.assertEqual('15', viewport.GetSelectedKey())
+        lines = viewport.GetLines()
+        self.assertEqual(('(6) Option 6', False), lines[0])
+        self.assertEqual(('(15) Option 15', True), lines[-1])
+        viewport.MoveBy(-100)
+        self.assertEqual('0', viewport.GetSelectedKey())
+        viewport.MoveTo(10000)
+        self.assertEqual('4999', viewport.GetSelectedKey())
+
+    def test_SetFilter(self):
+        viewport = _MenuViewport(self.query_dic, 10)
+        viewport.SetFilter('OPTION 499')
+        self.assertEqual('499', viewport.GetSelectedKey())
+        self.assertEqual('11 of 5000 options. Type to filter: OPTION 499', viewport.GetStatus())
+        viewport.SetFilter('OPTION 4999')
+        self.assertEqual('1 of 5000 options. Type to filter: OPTION 4999', viewport.GetStatus())
+        # A shorter filter searches every option again
+        viewport.SetFilter('Option 49')
+        self.assertEqual('111 of 5000 options. Type to filter: Option 49', viewport.GetStatus())
+        viewport.SetFilter('nothing')
+        self.assertIsNone(viewport.GetSelectedKey())
+
+
+class Test_LineRenderer(unittest.TestCase):
+
+    def test_Draw_only_changed_lines(self):
+        window = _FakeWindow(height=5)
+        renderer = _LineRenderer(window)
+        self.assertEqual(3, renderer.Draw([('a', 0), ('b', 0), ('c', 0)]))
+        self.assertEqual(1, renderer.Draw([('a', 0), ('b', 1), ('c', 0)]))
+        # Lines no longer drawn are cleared
+        self.assertEqual(1, renderer.Draw([('a', 0), ('b', 1)]))
+        renderer.Invalidate()
+        self.assertEqual(2, renderer.Draw([('a', 0), ('b', 1)]))
+
+    def test_Draw_clips_to_window(self):
+        window = _FakeWindow(height=2, width=4)
+        renderer = _LineRenderer(window)
+        renderer.Draw([('abcdef', 0), ('b', 0), ('c', 0)])
+        self.assertEqual({0:'abc', 1:'b'}, window.rows)
+
+
+@unittest.skipIf(curses is None, 'curses is not available')
+class Test_CursesUserQueryReceiver(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('sys.stdin', TerminalStdin(''))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('curses.curs_set')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _execute(self, window, query_dic):
+        receiver = CursesUserQueryReceiver()
+        command = UserQueryCommandMenu(receiver, 'Pick one', query_dic)
+        with patch('curses.wrapper', lambda function, *args: function(window, *args)):
+            return command.Execute()
+
+    def test_menu_navigation(self):
+        window = _FakeWindow(height=10, keys=[curses.KEY_DOWN, curses.KEY_NPAGE, curses.KEY_UP, '\n'])
+        query_dic = {str(i): f"Option {i}" for i in range(5000)}
+        self.assertEqual('8', self._execute(window, query_dic))
+        self.assertEqual('Pick one', window.rows[0])
+        # Scrolling redraws the viewport, but the prompt is drawn only once
+        self.assertLess(window.writes, 4 * 10)
+
+    def test_menu_filter(self):
+        query_dic = {str(i): f"Option {i}" for i in range(1000)}
+        window = _FakeWindow(height=10, keys=['9', '9', '9', curses.KEY_BACKSPACE, curses.KEY_ENTER])
+        self.assertEqual('99', self._execute(window, query_dic))
+        self.assertEqual('19 of 1000 options. Type to filter: 99', window.rows[9])
+        # Escape clears the filter
+        window = _FakeWindow(height=10, keys=['9', '\x1b', 'O', 'p', curses.KEY_END, curses.KEY_HOME, curses.KEY_DOWN, '\n'])
+        self.assertEqual('1', self._execute(window, query_dic))
+
+    def test_enter_with_no_matches(self):
+        window = _FakeWindow(height=10, keys=['x', 'y', '\n', '\x1b', '\n'])
+        self.assertEqual('a', self._execute(window, {'a':'Apple', 'b':'Banana'}))
+
+    @patch('builtins.input', return_value='42')
+    def test_not_a_menu(self, mock_input):
+        # Queries without a menu are typed, as for ConsoleUserQueryReceiver
+        receiver = CursesUserQueryReceiver()
+        with patch('curses.wrapper') as mock_wrapper:
+            self.assertEqual('42', receiver.GetRawResponse('How many?', {}))
+            mock_wrapper.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+This module provides unit tests for:
+    (1) Default responses of UserQueryCommand, used when a receiver times out
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+import os
+
+# Local
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver, BytesConsoleUserQueryReceiver, UserQueryReceiverTimeoutError
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandMenu, UserQueryCommandStr
+from TerminalFixtures import TerminalStdin
+
+
+class Test_DefaultResponse(unittest.TestCase):
+
+    def setUp(self):
+        # A pipe that nobody writes to, like a terminal that nobody is at
+        (read_fd, self.write_fd) = os.pipe()
+        self.stream = os.fdopen(read_fd, 'rb')
+        self.addCleanup(self.stream.close)
+        self.addCleanup(os.close, self.write_fd)
+        self.receiver = BytesConsoleUserQueryReceiver(stream=self.stream, timeout=0.01)
+
+    def test_doGetExtraDict(self):
+        command = UserQueryCommandStr(self.receiver, '')
+        self.assertNotIn('default_response', command._doGetExtraDict())
+        self.assertIs(command, command.SetDefaultResponse('none'))
+        self.assertEqual('none', command._doGetExtraDict()['default_response'])
+        self.assertEqual('none', command.GetDefaultResponse())
+
+    def test_timeout_uses_default(self):
+        command = UserQueryCommandNumberInteger(self.receiver, 'How many widgets?', minimum=1, maximum=100)
+        command.SetDefaultResponse('10')
+        with self.assertLogs('user_query_receiver_logger', 'WARNING') as logs:
+            self.assertEqual(10, command.Execute())
+        self.assertIn("Using the default response '10' for: How many widgets?", logs.output[0])
+        command = UserQueryCommandMenu(self.receiver, 'Continue?', {'y':'Yes', 'n':'No'}).SetDefaultResponse('y')
+        with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+            self.assertEqual('y', command.Execute())
+        exp_val = [('UserQueryCommandNumberInteger', '10'), ('UserQueryCommandMenu', 'y')]
+        self.assertEqual(exp_val, self.receiver.GetDefaultResponseReports())
+
+    def test_response_before_timeout(self):
+        os.write(self.write_fd, b'42\n')
+        command = UserQueryCommandNumberInteger(self.receiver, '').SetDefaultResponse('10')
+        self.assertEqual(42, command.Execute())
+        self.assertEqual([], self.receiver.GetDefaultResponseReports())
+
+    def test_invalid_default(self):
+        command = UserQueryCommandNumberInteger(self.receiver, '', minimum=1, maximum=100).SetDefaultResponse('1000')
+        with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+            self.assertRaises(ValueError, command.Execute)
+        command = UserQueryCommandNumberInteger(self.receiver, '').SetDefaultResponse('ten')
+        with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+            self.assertRaises(ValueError, command.Execute)
+
+    def test_no_default_no_timeout(self):
+        # Without a default response, the receiver waits as long as needed
+        receiver = ConsoleUserQueryReceiver(timeout=0.01)
+        self.assertIsNone(receiver._getTimeout({}))
+        self.assertEqual(0.01, receiver._getTimeout({'default_response':'x'}))
+
+    def test_timeout_error_without_default(self):
+        self.assertRaises(UserQueryReceiverTimeoutError, self.receiver.GetRawResponseUndecoded, '', {'default_response':'x'})
+
+    # Apply a patch() decorator to capture the prompts written to the console window.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_timeout_lines_read_ahead(self, mock_stdout):
+        # Reading the first line from a pipe makes sys.stdin read ahead the second, which select() then can't see
+        stdin = io.TextIOWrapper(self.stream, encoding='utf-8')
+        os.write(self.write_fd, b'first\nsecond\nthi')
+        receiver = ConsoleUserQueryReceiver(timeout=0.5)
+        command = UserQueryCommandStr(receiver, 'Name?').SetDefaultResponse('anonymous')
+        with patch('sys.stdin', stdin):
+            self.assertEqual('first', command.Execute())
+            self.assertEqual('second', command.Execute())
+            # The start of a line that times out is kept for the next response
+            receiver._timeout = 0.01
+            with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+                self.assertEqual('anonymous', command.Execute())
+            os.write(self.write_fd, b'rd\n')
+            self.assertEqual('third', command.Execute())
+
+    # Apply a patch() decorator to capture the prompt written to the console window.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('sys.stdin', TerminalStdin(''))
+    def test_timeout_interactive(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver(timeout=0.01)
+        command = UserQueryCommandStr(receiver, 'Name?').SetDefaultResponse('anonymous')
+        with patch('UserResponseCollector.UserQueryReceiver._waitReadable', return_value=False):
+            with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+                self.assertEqual('anonymous', command.Execute())
+        self.assertTrue(mock_stdout.getvalue().startswith('Name?'))
+
+
+if __name__ == '__main__':
+    unittest.main()
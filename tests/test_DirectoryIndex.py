@@ -0,0 +1,267 @@
+"""
+This module provides unit tests for:
+    (1) DirectoryIndex, (2) DirectoryListing, and (3) DirectoryIndexCache classes
+    (4) iterGlobPaths function
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+from pathlib import Path
+
+# Local
+from UserResponseCollector.DirectoryIndex import DirectoryIndex, DirectoryIndexCache, DirectoryIndexCache_GetCache, iterGlobPaths
+from UserResponseCollector.DirectoryIndex import DirectoryListing
+import UserResponseCollector.DirectoryIndex
+
+
+class Test_DirectoryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        for name in ('beta.txt', 'alpha.txt', 'alpine.csv'):
+            Path(self.temp_dir.name, name).touch()
+        Path(self.temp_dir.name, 'alps').mkdir()
+
+    def test_Contains(self):
+        index = DirectoryIndex(self.temp_dir.name)
+        self.assertEqual(4, len(index))
+        self.assertTrue(index.Contains('beta.txt'))
+        self.assertFalse(index.Contains('gamma.txt'))
+        self.assertFalse(index.Contains('alp'))
+
+    def test_IsDirectory(self):
+        index = DirectoryIndex(self.temp_dir.name)
+        self.assertTrue(index.IsDirectory('alps'))
+        self.assertFalse(index.IsDirectory('alpha.txt'))
+        self.assertFalse(index.IsDirectory('missing'))
+
+    def test_Complete(self):
+        index = DirectoryIndex(self.temp_dir.name)
+        self.assertEqual(['alpha.txt', 'alpine.csv', 'alps'], index.Complete('alp'))
+        self.assertEqual(['alpha.txt', 'alpine.csv'], index.Complete('alp', limit=2))
+        self.assertEqual([], index.Complete('z'))
+        self.assertEqual(['alpha.txt', 'alpine.csv', 'alps', 'beta.txt'], index.GetNames())
+
+    def test_not_a_directory(self):
+        self.assertRaises(OSError, DirectoryIndex, os.path.join(self.temp_dir.name, 'alpha.txt'))
+
+
+class Test_DirectoryListing(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        for i in range(5):
+            Path(self.temp_dir.name, f"dir_{i}").mkdir()
+        Path(self.temp_dir.name, '.hidden').mkdir()
+        Path(self.temp_dir.name, 'file.txt').touch()
+
+    def test_GetPage(self):
+        listing = DirectoryListing(self.temp_dir.name)
+        self.addCleanup(listing.Close)
+        pages = [listing.GetPage(page, 2) for page in range(3)]
+        self.assertEqual([2, 2, 1], [len(names) for names in pages])
+        exp_val = [f"dir_{i}" for i in range(5)]
+        act_val = sorted(sum(pages, []))
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual([], listing.GetPage(3, 2))
+
+    def test_HasPage(self):
+        listing = DirectoryListing(self.temp_dir.name)
+        self.addCleanup(listing.Close)
+        self.assertTrue(listing.HasPage(2, 2))
+        self.assertFalse(listing.HasPage(3, 2))
+
+    def test_lazy(self):
+        listing = DirectoryListing(self.temp_dir.name)
+        self.addCleanup(listing.Close)
+        listing.GetPage(0, 2)
+        # Only enough entries for the first page have been read
+        self.assertGreaterEqual(len(listing._names), 2)
+        self.assertLess(len(listing._names), 5)
+
+    def test_closed_listing_scans_again(self):
+        # A listing closed while another thread is still paging through it lists the rest of the directory anyway
+        listing = DirectoryListing(self.temp_dir.name)
+        first_page = listing.GetPage(0, 2)
+        listing.Close()
+        pages = [first_page] + [listing.GetPage(page, 2) for page in range(1, 3)]
+        self.assertEqual(first_page, listing.GetPage(0, 2))
+        self.assertEqual([f"dir_{i}" for i in range(5)], sorted(sum(pages, [])))
+
+
+class Test_DirectoryIndexCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        Path(self.temp_dir.name, 'alpha.txt').touch()
+        # Make the directory look like it was last modified long ago, so that its index is trusted
+        os.utime(self.temp_dir.name, ns=(0, 0))
+
+    def test_GetCache(self):
+        exp_val = id(UserResponseCollector.DirectoryIndex._instance)
+        act_val = id(DirectoryIndexCache_GetCache())
+        self.assertEqual(exp_val, act_val)
+
+    def test_GetIndex_cached(self):
+        cache = DirectoryIndexCache()
+        index = cache.GetIndex(self.temp_dir.name)
+        with patch('UserResponseCollector.DirectoryIndex.DirectoryIndex') as mock_index:
+            # The directory has not changed, so it is not scanned again
+            self.assertIs(index, cache.GetIndex(self.temp_dir.name))
+            mock_index.assert_not_called()
+
+    def test_GetIndex_invalidated_by_mtime(self):
+        cache = DirectoryIndexCache()
+        self.assertFalse(cache.GetIndex(self.temp_dir.name).Contains('beta.txt'))
+        Path(self.temp_dir.name, 'beta.txt').touch()
+        self.assertTrue(cache.GetIndex(self.temp_dir.name).Contains('beta.txt'))
+
+    def test_GetIndex_racy_directory_not_trusted(self):
+        cache = DirectoryIndexCache()
+        index = cache.GetIndex(self.temp_dir.name)
+        # Recently modified, so the next use scans the directory again, even if its modification time is unchanged
+        os.utime(self.temp_dir.name)
+        index = cache.GetIndex(self.temp_dir.name)
+        self.assertIsNot(index, cache.GetIndex(self.temp_dir.name))
+
+    def test_GetIndex_evicts_least_recently_used(self):
+        cache = DirectoryIndexCache(max_directories=1)
+        other_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(other_dir.cleanup)
+        os.utime(other_dir.name, ns=(0, 0))
+        index = cache.GetIndex(self.temp_dir.name)
+        cache.GetIndex(other_dir.name)
+        self.assertIsNot(index, cache.GetIndex(self.temp_dir.name))
+
+    def test_GetIndex_not_a_directory(self):
+        cache = DirectoryIndexCache()
+        self.assertIsNone(cache.GetIndex(os.path.join(self.temp_dir.name, 'missing')))
+        self.assertIsNone(cache.GetIndex(os.path.join(self.temp_dir.name, 'alpha.txt')))
+
+    def test_GetListing_cached(self):
+        cache = DirectoryIndexCache()
+        self.addCleanup(cache.Clear)
+        listing = cache.GetListing(self.temp_dir.name)
+        self.assertIs(listing, cache.GetListing(self.temp_dir.name))
+        self.assertIsNone(cache.GetListing(os.path.join(self.temp_dir.name, 'alpha.txt')))
+
+    def test_GetListing_invalidated_by_mtime(self):
+        cache = DirectoryIndexCache()
+        self.addCleanup(cache.Clear)
+        self.assertEqual([], cache.GetListing(self.temp_dir.name).GetPage())
+        Path(self.temp_dir.name, 'alps').mkdir()
+        self.assertEqual(['alps'], cache.GetListing(self.temp_dir.name).GetPage())
+
+    def test_GetListing_evicts_least_recently_used(self):
+        cache = DirectoryIndexCache(max_listings=1)
+        self.addCleanup(cache.Clear)
+        other_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(other_dir.cleanup)
+        os.utime(other_dir.name, ns=(0, 0))
+        listing = cache.GetListing(self.temp_dir.name)
+        cache.GetListing(other_dir.name)
+        self.assertIsNot(listing, cache.GetListing(self.temp_dir.name))
+
+    def test_Exists(self):
+        cache = DirectoryIndexCache()
+        self.assertTrue(cache.Exists(os.path.join(self.temp_dir.name, 'alpha.txt')))
+        self.assertFalse(cache.Exists(os.path.join(self.temp_dir.name, 'beta.txt')))
+
+    def test_CompletePath(self):
+        Path(self.temp_dir.name, 'alps').mkdir()
+        cache = DirectoryIndexCache()
+        prefix = os.path.join(self.temp_dir.name, 'al')
+        exp_val = [os.path.join(self.temp_dir.name, 'alpha.txt'), os.path.join(self.temp_dir.name, 'alps') + os.sep]
+        act_val = cache.CompletePath(prefix)
+        self.assertEqual(exp_val, act_val)
+
+
+class Test_iterGlobPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        for name in ('a.csv', 'b.csv', 'c.txt', '.hidden.csv', 'sub/d.csv', 'sub/deeper/e.csv', '.dot/f.csv'):
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def test_pattern(self):
+        exp_val = [self.root / 'a.csv', self.root / 'b.csv']
+        act_val = sorted(iterGlobPaths(self.root / '*.csv'))
+        self.assertEqual(exp_val, act_val)
+
+    def test_recursive_pattern(self):
+        exp_val = [self.root / 'a.csv', self.root / 'b.csv', self.root / 'sub' / 'd.csv', self.root / 'sub' / 'deeper' / 'e.csv']
+        act_val = sorted(iterGlobPaths(self.root / '**' / '*.csv'))
+        self.assertEqual(exp_val, act_val)
+
+    def test_dot_pattern(self):
+        exp_val = [self.root / '.hidden.csv']
+        act_val = sorted(iterGlobPaths(self.root / '.*.csv'))
+        self.assertEqual(exp_val, act_val)
+
+    def test_directory(self):
+        # The files in the directory, but not its subdirectories
+        exp_val = [self.root / 'sub' / 'd.csv']
+        act_val = sorted(iterGlobPaths(self.root / 'sub'))
+        self.assertEqual(exp_val, act_val)
+
+    def test_no_pattern_characters(self):
+        self.assertEqual([self.root / 'c.txt'], list(iterGlobPaths(self.root / 'c.txt')))
+        self.assertEqual([], list(iterGlobPaths(self.root / 'missing.txt')))
+        self.assertEqual([], list(iterGlobPaths('')))
+
+    def test_lazy(self):
+        # Only the directories needed to produce the first path have been scanned
+        with patch('os.scandir', wraps=os.scandir) as mock_scandir:
+            paths = iterGlobPaths(self.root / '**' / '*.csv')
+            mock_scandir.assert_not_called()
+            next(paths)
+            self.assertEqual(1, mock_scandir.call_count)
+            paths.close()
+
+    def test_recursive_pattern_unexaminable_entry(self):
+        # An entry that can't be examined isn't searched, and the others still are
+        class _Entry:
+            def __init__(self, entry):
+                self._entry = entry
+                self.name = entry.name
+
+            def is_dir(self, follow_symlinks=True):
+                if self.name == 'sub':
+                    raise PermissionError('unexaminable')
+                return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+            def is_file(self, follow_symlinks=True):
+                return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+        class _Scandir:
+            def __init__(self, path):
+                self._it = os_scandir(path)
+
+            def __enter__(self):
+                return self
+
+            def __iter__(self):
+                return (_Entry(entry) for entry in self._it)
+
+            def __exit__(self, *exc_info):
+                self._it.close()
+
+        os_scandir = os.scandir
+        exp_val = [self.root / 'a.csv', self.root / 'b.csv']
+        with patch('os.scandir', _Scandir):
+            act_val = sorted(iterGlobPaths(self.root / '**' / '*.csv'))
+        self.assertEqual(exp_val, act_val)
+
+
+if __name__ == '__main__':
+    unittest.main()
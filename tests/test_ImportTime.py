@@ -0,0 +1,110 @@
+"""
+This module provides import-time regression tests for:
+    (1) The UserResponseCollector package, whose public names are imported lazily
+    (2) UserResponseCollector.UserQueryCommand, as imported by a short-lived script that only needs askForInt
+
+Each test imports the module in a fresh interpreter, run with -X importtime, and checks the modules listed in its output,
+so that a heavy or unneeded dependency added at module level (e.g., multiprocessing) fails a test, rather than silently
+slowing the start of every script that uses the package. Times vary too much between machines to be checked, but the
+slowest imports are included in the failure message.
+"""
+
+# Standard
+import unittest
+import os
+import subprocess
+import sys
+
+# Local
+import UserResponseCollector
+
+
+# The directory that UserResponseCollector is imported from, so that the fresh interpreter imports the same package
+_IMPORT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(UserResponseCollector.__file__)))
+
+
+def runWithImportTime(code=''):
+    """
+    Run code in a fresh interpreter, with -X importtime.
+    :parameter code: The Python code to run, string
+    :return: Tuple (standard output, imports), where imports is a dict mapping each module imported to its cumulative
+        import time in microseconds, as Tuple (string, dict)
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_IMPORT_ROOT, env.get('PYTHONPATH')]))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, capture_output=True, text=True,
+                               check=True)
+    imports = {}
+    for line in completed.stderr.splitlines():
+        # e.g., 'import time:       194 |       1477 |     json', after a header line ending with 'imported package'
+        if not line.startswith('import time:') or line.endswith('| imported package'):
+            continue
+        (self_us, cumulative_us, name) = line[len('import time:'):].split('|')
+        imports[name.strip()] = int(cumulative_us)
+    return (completed.stdout, imports)
+
+
+def _slowest(imports=None, count=10):
+    """
+    :parameter imports: Dictionary mapping each module imported to its cumulative import time in microseconds, dict
+    :parameter count: The number of modules to list, int
+    :return: The slowest imports, one per line, for a failure message, string
+    """
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:count]
+    return '\n'.join(f"{cumulative_us:>8} us  {name}" for (name, cumulative_us) in slowest)
+
+
+class Test_ImportTime(unittest.TestCase):
+
+    def test_package_imports_nothing(self):
+        (output, imports) = runWithImportTime('import UserResponseCollector')
+        submodules = [name for name in imports if name.startswith('UserResponseCollector.')]
+        self.assertEqual([], submodules)
+        self.assertNotIn('logging', imports, _slowest(imports))
+
+    def test_package_name_imports_its_module(self):
+        (output, imports) = runWithImportTime('from UserResponseCollector import askForInt; print(askForInt.__module__)')
+        self.assertEqual('UserResponseCollector.UserQueryCommand', output.strip())
+        self.assertIn('UserResponseCollector.UserQueryCommand', imports)
+        # Only the modules that the name needs are imported, not every module of the package
+        self.assertNotIn('UserResponseCollector.UserQueryRateLimiter', imports)
+
+    def test_UserQueryCommand_unneeded_modules(self):
+        (output, imports) = runWithImportTime('import UserResponseCollector.UserQueryCommand')
+        for name in ('multiprocessing', 'tempfile', 'readline', 'curses', 'termios'):
+            self.assertNotIn(name, imports, f"{name} is imported\n{_slowest(imports)}")
+
+    def test_UserQueryCommand_no_side_effects(self):
+        # Importing doesn't instantiate the global receiver, which would set up logging, or the directory index cache
+        code = '\n'.join([
+            'import logging',
+            'import UserResponseCollector.UserQueryCommand as command',
+            "print(len(logging.getLogger('user_query_receiver_logger').handlers))",
+            "print('_instance' in vars(command.UserResponseCollector.UserQueryReceiver))",
+            "print('_instance' in vars(command.UserResponseCollector.DirectoryIndex))",
+            'receiver = command.UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()',
+            "print(receiver is command.UserResponseCollector.UserQueryReceiver._instance)",
+        ])
+        (output, imports) = runWithImportTime(code)
+        self.assertEqual(['0', 'False', 'False', 'True'], output.split())
+
+    def test_lazy_global_instances(self):
+        import UserResponseCollector.UserQueryReceiver
+        import UserResponseCollector.DirectoryIndex
+        self.assertIs(UserResponseCollector.UserQueryReceiver._instance,
+                      UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver())
+        self.assertIs(UserResponseCollector.DirectoryIndex._instance,
+                      UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache())
+        with self.assertRaises(AttributeError):
+            UserResponseCollector.UserQueryReceiver.no_such_attribute
+        with self.assertRaises(AttributeError):
+            UserResponseCollector.no_such_attribute
+
+    def test_package_exports(self):
+        for name in UserResponseCollector.__all__:
+            self.assertEqual(name, getattr(UserResponseCollector, name).__name__)
+        self.assertIn('askForInt', dir(UserResponseCollector))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+This module provides unit tests for:
+    (1) PathValidator classes
+    (2) validatePath function
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import tempfile
+from pathlib import Path
+
+# Local
+from UserResponseCollector.PathValidator import PathValidatorMaxSize, PathValidatorNotEmpty, PathValidatorText
+from UserResponseCollector.PathValidator import PathValidatorSignature, PathValidatorCSV, validatePath
+
+
+class Test_PathValidator(unittest.TestCase):
+
+    def test_MaxSize(self):
+        validator = PathValidatorMaxSize(10)
+        self.assertEqual((True, ''), validator.Validate(Path('a.csv'), 10))
+        exp_val = (False, "\n'a.csv' is 11 bytes, which is larger than 10 bytes. Please try again.")
+        self.assertEqual(exp_val, validator.Validate(Path('a.csv'), 11))
+
+    def test_NotEmpty(self):
+        validator = PathValidatorNotEmpty()
+        self.assertEqual((True, ''), validator.Validate(Path('a.csv'), 1, b'x'))
+        exp_val = (False, "\n'a.csv' is empty. Please try again.")
+        self.assertEqual(exp_val, validator.Validate(Path('a.csv'), 0))
+
+    def test_Text(self):
+        validator = PathValidatorText(sample_size=4)
+        self.assertEqual((True, ''), validator.Validate(Path('a.txt'), 4, b'text'))
+        # A multi-byte character cut off by the end of the header is still text
+        self.assertEqual((True, ''), validator.Validate(Path('a.txt'), 5, 'café'.encode('utf-8')[:4]))
+        exp_val = (False, "\n'a.txt' is not a text file. Please try again.")
+        self.assertEqual(exp_val, validator.Validate(Path('a.txt'), 4, b'ab\x00c'))
+        self.assertEqual(exp_val, validator.Validate(Path('a.txt'), 4, b'\xff\xfe\xfa\xfb'))
+
+    def test_Signature(self):
+        validator = PathValidatorSignature([b'%PDF-', b'PK\x03\x04'], 'a PDF or zip file')
+        self.assertEqual(5, validator.GetHeaderSize())
+        self.assertEqual((True, ''), validator.Validate(Path('a.pdf'), 100, b'%PDF-'))
+        self.assertEqual((True, ''), validator.Validate(Path('a.zip'), 100, b'PK\x03\x04\x14'))
+        exp_val = (False, "\n'a.pdf' is not a PDF or zip file. Please try again.")
+        self.assertEqual(exp_val, validator.Validate(Path('a.pdf'), 100, b'hello'))
+
+    def test_CSV(self):
+        validator = PathValidatorCSV(min_columns=2)
+        header = b'name,age\n"Smith, J",42\n'
+        self.assertEqual((True, ''), validator.Validate(Path('a.csv'), len(header), header))
+        # The incomplete last line of a header that doesn't hold the whole file is ignored
+        self.assertEqual((True, ''), validator.Validate(Path('a.csv'), 1000, header + b'Jones'))
+        exp_val = (False, "\n'a.csv' is not a CSV file. Please try again.")
+        header = b'name,age\nSmith\n'
+        self.assertEqual(exp_val, validator.Validate(Path('a.csv'), len(header), header))
+        header = b'one column\nonly\n'
+        self.assertEqual(exp_val, validator.Validate(Path('a.csv'), len(header), header))
+        self.assertEqual(exp_val, validator.Validate(Path('a.csv'), 3, b'\x00\x01\x02'))
+
+    def test_CSV_default(self):
+        # By default, plain text, which is one value per line, is not a CSV file
+        validator = PathValidatorCSV()
+        header = b'Dear Sir\nThank you for your letter\n'
+        exp_val = (False, "\n'a.txt' is not a CSV file. Please try again.")
+        self.assertEqual(exp_val, validator.Validate(Path('a.txt'), len(header), header))
+        header = b'name,age\nSmith,42\n'
+        self.assertEqual((True, ''), validator.Validate(Path('a.csv'), len(header), header))
+        self.assertEqual((True, ''), PathValidatorCSV(min_columns=1).Validate(Path('a.txt'), 9, b'Dear Sir\n'))
+
+
+class Test_validatePath(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name, 'data.csv')
+        self.path.write_bytes(b'a,b\n' * 10000)
+
+    def test_validatePath(self):
+        self.assertEqual((True, ''), validatePath(self.path, [PathValidatorNotEmpty(), PathValidatorCSV()]))
+        exp_val = (False, f"\n'{self.path}' is 40000 bytes, which is larger than 100 bytes. Please try again.")
+        act_val = validatePath(self.path, [PathValidatorCSV(), PathValidatorMaxSize(100), PathValidatorNotEmpty()])
+        self.assertEqual(exp_val, act_val)
+
+    def test_validatePath_reads_header_once(self):
+        validators = [PathValidatorText(sample_size=16), PathValidatorSignature([b'a,b'], 'a CSV file')]
+        with patch('builtins.open', wraps=open) as mock_open:
+            self.assertEqual((True, ''), validatePath(self.path, validators))
+        mock_open.assert_called_once()
+
+    def test_validatePath_missing(self):
+        path = Path(self.temp_dir.name, 'missing.csv')
+        (is_valid, msg) = validatePath(path, [PathValidatorNotEmpty()])
+        self.assertFalse(is_valid)
+        self.assertTrue(msg.startswith(f"\n'{path}' can't be read"))
+
+    def test_validatePath_no_validators(self):
+        self.assertEqual((True, ''), validatePath(Path(self.temp_dir.name, 'missing.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
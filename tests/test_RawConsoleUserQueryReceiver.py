@@ -0,0 +1,184 @@
+"""
+This module provides unit tests for:
+    (1) RawConsoleUserQueryReceiver class
+    (2) Partial response checks of the UserQueryCommandX classes
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+
+# Local
+from UserResponseCollector.UserQueryReceiver import RawConsoleUserQueryReceiver, _editLine
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+from UserResponseCollector.UserQueryCommand import UserQueryCommandStr, UserQueryCommandMenu, UserQueryCommandPathSave
+import UserResponseCollector.UserQueryReceiver
+from TerminalFixtures import TerminalStdinFileno
+
+
+def _edit(keys, accept=lambda text: True):
+    """
+    Run _editLine(...) with keys typed, returning Tuple (line, echoed text).
+    """
+    keys = list(keys)
+    echoed = []
+    line = _editLine(lambda: keys.pop(0) if keys else '', echoed.append, accept)
+    return (line, ''.join(echoed))
+
+
+class Test_editLine(unittest.TestCase):
+
+    def test_accept_and_reject(self):
+        (line, echoed) = _edit('1a2\r', str.isdigit)
+        self.assertEqual('12', line)
+        self.assertEqual('1\a2\n', echoed)
+
+    def test_backspace(self):
+        (line, echoed) = _edit('ab\x7fc\x7f\x7f\x7fd\n')
+        self.assertEqual('d', line)
+        self.assertEqual('ab\b \bc\b \b\b \bd\n', echoed)
+
+    def test_escape_sequence_ignored(self):
+        (line, echoed) = _edit('1\x1b[A\x1b[1;5C2\n')
+        self.assertEqual('12', line)
+
+    def test_end_of_input(self):
+        self.assertRaises(EOFError, _edit, '')
+        self.assertRaises(EOFError, _edit, '\x04')
+        self.assertEqual('ab', _edit('ab')[0])
+        self.assertRaises(KeyboardInterrupt, _edit, 'a\x03')
+
+
+class Test_doIsAcceptablePartialResponse(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+
+    def test_NumberInteger(self):
+        command = UserQueryCommandNumberInteger(self.receiver, '')
+        self.assertTrue(all(command._doIsAcceptablePartialResponse(text) for text in ('-', '-12', ' 3', '+4 ')))
+        self.assertFalse(any(command._doIsAcceptablePartialResponse(text) for text in ('a', '1.', '1-', '1 2')))
+        # A minus sign can't start a valid response if the minimum isn't negative
+        command = UserQueryCommandNumberInteger(self.receiver, '', minimum=0, maximum=10)
+        self.assertFalse(command._doIsAcceptablePartialResponse('-'))
+        self.assertTrue(command._doIsAcceptablePartialResponse('7'))
+
+    def test_NumberFloat(self):
+        command = UserQueryCommandNumberFloat(self.receiver, '')
+        for text in ('-', '.', '1.', '.5', '1e', '1.5e-', '2E+10'):
+            self.assertTrue(command._doIsAcceptablePartialResponse(text), text)
+        for text in ('a', 'e', '1..', '1e1.', '1ee'):
+            self.assertFalse(command._doIsAcceptablePartialResponse(text), text)
+
+    def test_Str(self):
+        command = UserQueryCommandStr(self.receiver, '', max_length=3)
+        self.assertTrue(command._doIsAcceptablePartialResponse('abc'))
+        self.assertFalse(command._doIsAcceptablePartialResponse('abcd'))
+
+    def test_Menu(self):
+        command = UserQueryCommandMenu(self.receiver, '', {'ab':'Option AB', 'b':'Option B', 10:'Option 10'})
+        extra = command._doGetExtraDict()
+        accept = extra['accept_partial']
+        self.assertTrue(all(accept(text) for text in ('a', 'ab', 'b', '1', '10')))
+        self.assertFalse(any(accept(text) for text in ('c', 'abc', 'ba', '2')))
+        # Without the sorted keys of a query, every key is checked
+        self.assertTrue(command._doIsAcceptablePartialResponse('1'))
+        self.assertFalse(command._doIsAcceptablePartialResponse('ba'))
+
+    def test_Menu_keys_per_query(self):
+        query_dic = {'a':'Option A'}
+        command = UserQueryCommandMenu(self.receiver, '', query_dic)
+        first = command._doGetExtraDict()['accept_partial']
+        query_dic['c'] = 'Option C'
+        second = command._doGetExtraDict()['accept_partial']
+        # A later query, e.g., in another thread, doesn't change the keys checked by an earlier one
+        self.assertFalse(first('c'))
+        self.assertTrue(second('c'))
+
+    def test_not_offered(self):
+        # Commands that can't check partial responses don't pass a check to the receiver
+        command = UserQueryCommandPathSave(self.receiver, '')
+        self.assertNotIn('accept_partial', command._doGetExtraDict())
+
+
+class Test_RawConsoleUserQueryReceiver(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('sys.stdin', TerminalStdinFileno(''))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for target in ('termios.tcgetattr', 'termios.tcsetattr', 'tty.setcbreak'):
+            patcher = patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _type(self, keys):
+        """
+        Make os.read(...) return keys, one byte at a time.
+        """
+        data = [bytes([b]) for b in keys.encode('utf-8')]
+        patcher = patch('os.read', side_effect=lambda fd, n: data.pop(0) if data else b'')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_NumberInteger_command(self, mock_stdout):
+        self._type('4x2\n')
+        receiver = RawConsoleUserQueryReceiver()
+        command = UserQueryCommandNumberInteger(receiver, 'How many?')
+        self.assertEqual(42, command.Execute())
+        self.assertEqual(1, receiver.GetRejectedKeystrokeCount())
+        # The bad keystroke was rejected at once, with a bell, rather than with an error message after Enter
+        self.assertTrue(mock_stdout.getvalue().endswith('4\a2\n'))
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_input_lock(self, mock_stdout):
+        receiver = RawConsoleUserQueryReceiver()
+        data = [b'4', b'x', b'\n']
+        locked = []
+        def read(fd, n):
+            # Keystrokes are read, and rejected keystrokes counted, only by the query holding the input lock
+            locked.append(receiver._input_lock.locked())
+            return data.pop(0)
+        with patch('os.read', side_effect=read):
+            command = UserQueryCommandNumberInteger(receiver, 'How many?')
+            self.assertEqual(4, command.Execute())
+        self.assertEqual([True, True, True], locked)
+        self.assertEqual(1, receiver.GetRejectedKeystrokeCount())
+        self.assertFalse(receiver._input_lock.locked())
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Str_command_multibyte(self, mock_stdout):
+        self._type('café!\n')
+        receiver = RawConsoleUserQueryReceiver()
+        command = UserQueryCommandStr(receiver, '', max_length=4)
+        self.assertEqual('café', command.Execute())
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_timeout(self, mock_stdout):
+        # The user types one keystroke, and then nothing more before the timeout
+        self._type('4')
+        receiver = RawConsoleUserQueryReceiver(timeout=0.01)
+        command = UserQueryCommandNumberInteger(receiver, 'How many?').SetDefaultResponse('10')
+        with patch('UserResponseCollector.UserQueryReceiver._waitReadable', side_effect=[True, False]):
+            with self.assertLogs('user_query_receiver_logger', 'WARNING'):
+                self.assertEqual(10, command.Execute())
+
+    @patch('builtins.input', return_value='out.txt')
+    def test_not_checked(self, mock_input):
+        # Queries without a partial response check are read as by ConsoleUserQueryReceiver
+        receiver = RawConsoleUserQueryReceiver()
+        self.assertEqual('out.txt', receiver.GetRawResponse('Save as?', {}))
+
+    @patch('sys.stdin', io.StringIO('7\n'))
+    def test_headless(self):
+        receiver = RawConsoleUserQueryReceiver()
+        command = UserQueryCommandNumberInteger(receiver, '')
+        with patch('os.read') as mock_read:
+            self.assertEqual(7, command.Execute())
+            mock_read.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+This module provides unit tests for:
+    (1) ReadlineConsoleUserQueryReceiver class
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch, Mock, call
+import io
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Local
+from UserResponseCollector.UserQueryReceiver import ReadlineConsoleUserQueryReceiver, _CompletionIndex
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandStr, UserQueryCommandPathOpen
+from TerminalFixtures import TerminalStdin
+
+
+class Test_CompletionIndex(unittest.TestCase):
+
+    def test_Complete(self):
+        index = _CompletionIndex(['beta', 'alpha', 'alps', 'al', 'b'])
+        self.assertEqual(['al', 'alpha', 'alps'], index.Complete('al'))
+        self.assertEqual(['alpha', 'alps'], index.Complete('alp'))
+        self.assertEqual(['al', 'alpha', 'alps', 'b', 'beta'], index.Complete(''))
+        self.assertEqual([], index.Complete('c'))
+
+
+class Test_ReadlineConsoleUserQueryReceiver(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.history_file = os.path.join(self.temp_dir.name, 'history.json')
+        self.receiver = ReadlineConsoleUserQueryReceiver(history_file=self.history_file)
+        # Save any history before the directory is removed, rather than at exit
+        self.addCleanup(self.receiver.Flush)
+        # Replace readline, so that the tests don't depend on the platform, or change the real history
+        self.receiver._readline = Mock()
+        self.receiver._readline.get_completer.return_value = None
+        self.receiver._readline.get_completer_delims.return_value = ' '
+        self.receiver._readline.get_current_history_length.return_value = 0
+        patcher = patch('sys.stdin', TerminalStdin(''))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _complete_all(self, text=''):
+        completions = []
+        while (completion := self.receiver._complete(text, len(completions))) is not None:
+            completions.append(completion)
+        return completions
+
+    def test_menu_completion(self):
+        query_dic = {f"k{i}": f"Option {i}" for i in range(1000)}
+        extra = UserQueryCommandMenu(self.receiver, '', query_dic)._doGetExtraDict()
+        self.receiver._completer = self.receiver._getCompleter(extra)
+        exp_val = ['k99'] + [f"k99{i}" for i in range(10)]
+        self.assertEqual(exp_val, self._complete_all('k99'))
+        # The index is built only once for the same menu
+        index = self.receiver._menu_index
+        self.receiver._getCompleter(extra)
+        self.assertIs(index, self.receiver._menu_index)
+
+    def test_path_completion(self):
+        Path(self.temp_dir.name, 'report.csv').touch()
+        Path(self.temp_dir.name, 'reports').mkdir()
+        extra = UserQueryCommandPathOpen(self.receiver, '')._doGetExtraDict()
+        self.receiver._completer = self.receiver._getCompleter(extra)
+        prefix = os.path.join(self.temp_dir.name, 'rep')
+        exp_val = [os.path.join(self.temp_dir.name, 'report.csv'), os.path.join(self.temp_dir.name, 'reports') + os.sep]
+        self.assertEqual(exp_val, self._complete_all(prefix))
+
+    def test_no_completion(self):
+        extra = UserQueryCommandStr(self.receiver, '')._doGetExtraDict()
+        self.receiver._completer = self.receiver._getCompleter(extra)
+        self.assertEqual([], self._complete_all('a'))
+
+    @patch('builtins.input', side_effect=['b', 'hello', 'b', 'a'])
+    def test_history_per_query_type(self, mock_input):
+        menu = UserQueryCommandMenu(self.receiver, '', {'a':'Option A', 'b':'Option B'})
+        text = UserQueryCommandStr(self.receiver, '')
+        self.assertEqual('b', menu.Execute())
+        self.assertEqual('hello', text.Execute())
+        self.assertEqual('b', menu.Execute())
+        # The history of menu responses was loaded into readline before the third query
+        self.receiver._readline.add_history.assert_called_with('b')
+        self.assertEqual('a', menu.Execute())
+        # Repeated responses are kept once
+        self.assertEqual(['b', 'a'], self.receiver.GetHistory(UserQueryCommandMenu))
+        self.assertEqual(['hello'], self.receiver.GetHistory(UserQueryCommandStr))
+        # The completer is restored after each query
+        self.receiver._readline.set_completer.assert_called_with(None)
+
+    @patch('builtins.input', side_effect=['b'])
+    def test_application_history_restored(self, mock_input):
+        # The history that the application had in readline before the query is put back afterwards
+        application_history = ['import os', 'print(os.getcwd())']
+        readline = self.receiver._readline
+        readline.get_current_history_length.return_value = len(application_history)
+        readline.get_history_item.side_effect = lambda i: application_history[i-1]
+        self.receiver._history = {'UserQueryCommandMenu': ['a']}
+        UserQueryCommandMenu(self.receiver, '', {'a':'Option A', 'b':'Option B'}).Execute()
+        self.assertEqual([call.clear_history(), call.add_history('a'), call.clear_history(), call.add_history('import os'),
+                          call.add_history('print(os.getcwd())')],
+                         [c for c in readline.mock_calls if c[0] in ('clear_history', 'add_history')])
+
+    @patch('builtins.input', side_effect=['hello'])
+    def test_history_persists(self, mock_input):
+        UserQueryCommandStr(self.receiver, '').Execute()
+        self.receiver.Flush()
+        with open(self.history_file, encoding='utf-8') as file:
+            self.assertEqual({'UserQueryCommandStr': ['hello']}, json.load(file))
+        receiver = ReadlineConsoleUserQueryReceiver(history_file=self.history_file)
+        self.assertEqual(['hello'], receiver.GetHistory(UserQueryCommandStr))
+
+    def test_history_length(self):
+        receiver = ReadlineConsoleUserQueryReceiver(history_file=self.history_file, history_length=2)
+        self.addCleanup(receiver.Flush)
+        history = receiver._getHistory({})
+        for response in ('a', 'b', 'c', ' '):
+            receiver._addHistory(history, response)
+        self.assertEqual(['b', 'c'], receiver.GetHistory())
+
+    @patch('sys.stdin', io.StringIO('answer\n'))
+    def test_headless(self):
+        # When stdin is not a terminal, responses are read as by ConsoleUserQueryReceiver, without readline
+        self.assertEqual('answer', self.receiver.GetRawResponse())
+        self.receiver._readline.set_completer.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+"""
+This module provides multi-threaded stress tests for:
+    (1) UserQueryCommand.Execute(...) of every concrete UserQueryCommand class, with the command, its receiver, a memo,
+        middleware and a tracer all shared by many threads at once
+    (2) ConsoleUserQueryReceiver, shared by many threads reading answers, and blocks of lines, from the same pipe
+    (3) The logger shared by all receivers, when receivers are instantiated by many threads at once
+
+The thread switch interval is shortened while the tests run, so that threads are interleaved far more often than usual.
+On a free-threaded (no-GIL) build of Python, the threads also run truly in parallel.
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+import logging
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Local
+from UserResponseCollector.UserQueryReceiver import UserQueryReceiver, ConsoleUserQueryReceiver, BytesConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryReceiver import UserQueryCancellationToken
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+from UserResponseCollector.UserQueryCommand import UserQueryCommandStr, UserQueryCommandText, UserQueryCommandPathSave
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathOpen, UserQueryCommandPathGlob, UserQueryCommandPathDirectory
+from UserResponseCollector.UserQueryCommand import UserQueryCommandTable
+from UserResponseCollector.UserQueryMiddleware import UserQueryMiddleware, _EMPTY_DICT
+from UserResponseCollector.UserQueryMemo import UserQueryResponseMemo
+from UserResponseCollector.UserQueryRateLimiter import UserQueryRateLimiter
+from UserResponseCollector.UserQueryTracer import UserQueryTracer
+
+
+_THREADS = 8
+_QUERIES_PER_THREAD = 50
+
+
+class ThreadScriptedUserQueryReceiver(UserQueryReceiver):
+    """
+    Receiver, shared by many threads, that answers the queries of each thread from that thread's own pass through a
+    script of responses, repeated as often as needed, and counts the error messages issued.
+    """
+    def __init__(self, script=()):
+        """
+        :parameter script: The raw responses, in the order that they are requested by each thread, sequence of strings
+        """
+        UserQueryReceiver.__init__(self)
+        self._script = tuple(script)
+        self._local = threading.local()
+        self._count_lock = threading.Lock()
+        self.error_count = 0
+        # The cancellation tokens passed with each query, as list of Tuple (thread identifier, query type, token)
+        self.tokens = []
+
+    def GetRawResponse(self, prompt_text='', extra=_EMPTY_DICT):
+        position = getattr(self._local, 'position', 0)
+        self._local.position = position + 1
+        with self._count_lock:
+            self.tokens.append((threading.get_ident(), extra.get('query_type'), extra.get('cancellation_token')))
+        return self._script[position % len(self._script)]
+
+    def IssueErrorMessage(self, msg=''):
+        str(msg)
+        with self._count_lock:
+            self.error_count += 1
+        return None
+
+
+class CountingMiddleware(UserQueryMiddleware):
+    """
+    Middleware that counts the raw responses requested, and the results of validation.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requested = 0
+        self.validated = 0
+
+    def BeforeGetRawResponse(self, command=None, prompt_text='', extra=_EMPTY_DICT):
+        with self._lock:
+            self.requested += 1
+
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        with self._lock:
+            self.validated += 1
+        return result
+
+
+def _readResponse(response=None):
+    """
+    Turn a response into a value that can be compared, closing it if it holds resources, as an application would.
+    :parameter response: The response returned by Execute()
+    :return: The comparable value of the response
+    """
+    if hasattr(response, 'read'):
+        text = response.read()
+        response.close()
+        return text
+    if hasattr(response, 'GetRow'):
+        return [response.GetRow(i) for i in range(len(response))]
+    if hasattr(response, 'Close'):
+        paths = sorted(response)
+        response.Close()
+        return paths
+    return response
+
+
+class Test_ThreadSafety(unittest.TestCase):
+
+    def setUp(self):
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        (self.root / 'data.csv').write_text('a,b\n1,2\n')
+        (self.root / 'subdirectory').mkdir()
+
+    def hammer(self, command_class=None, script=(), expected=None, invalid_count=0, *args):
+        """
+        Execute one command of command_class from many threads at once, sharing its receiver, memo, middleware and a
+        tracer, and check that every query returns the expected response.
+        :parameter command_class: The concrete UserQueryCommand class
+        :parameter script: The raw responses for each query, sequence of strings
+        :parameter expected: The expected response, as returned by _readResponse(...)
+        :parameter invalid_count: The number of error messages issued for each query, int
+        :parameter args: The arguments of command_class, after the receiver and query preface
+        """
+        receiver = ThreadScriptedUserQueryReceiver(script)
+        counter = CountingMiddleware()
+        limiter = UserQueryRateLimiter(rate=1e9, burst=1000, backoff_base=0)
+        receiver.AddMiddleware(counter).AddMiddleware(limiter)
+        command = command_class(receiver, 'Please respond.', *args).SetResponseMemo(UserQueryResponseMemo())
+        start = threading.Barrier(_THREADS)
+
+        def work():
+            start.wait()
+            return [_readResponse(command.Execute()) for i in range(_QUERIES_PER_THREAD)]
+
+        with UserQueryTracer() as tracer, ThreadPoolExecutor(_THREADS) as executor:
+            futures = [executor.submit(work) for i in range(_THREADS)]
+            results = [future.result() for future in futures]
+
+        query_count = _THREADS * _QUERIES_PER_THREAD
+        self.assertEqual([[expected] * _QUERIES_PER_THREAD] * _THREADS, results)
+        self.assertEqual(query_count * invalid_count, receiver.error_count)
+        self.assertEqual(counter.requested, limiter.GetStats()['attempts'])
+        self.assertLessEqual(query_count, counter.validated)
+        spans = tracer.GetSpans()
+        self.assertEqual(query_count, sum(1 for span in spans if span.name == f"{command_class.__name__}.Execute"))
+        self.assertEqual(set(), {span.depth for span in spans if span.category == 'command'} - {0, 2})
+
+    def test_Menu(self):
+        self.hammer(UserQueryCommandMenu, ['x', 'a'], 'a', 1, {'a':'Accept', 'r':'Reject', 's':'Skip'})
+
+    def test_NumberInteger(self):
+        self.hammer(UserQueryCommandNumberInteger, ['ten', '0', '10'], 10, 2, 1, 100)
+
+    def test_NumberFloat(self):
+        self.hammer(UserQueryCommandNumberFloat, ['x', '2.5', '0.5'], 0.5, 2, 0.0, 1.0)
+
+    def test_Str(self):
+        self.hammer(UserQueryCommandStr, ['x' * 30, 'name'], 'name', 1, 25)
+
+    def test_Text(self):
+        self.hammer(UserQueryCommandText, ['x' * 30, 'y' * 30, '.', 'line one', 'line two', '.'], 'line one\nline two\n', 1, 50)
+
+    def test_PathSave(self):
+        self.hammer(UserQueryCommandPathSave, [str(self.root / 'new_file')], self.root / 'new_file', 0)
+
+    def test_PathOpen(self):
+        self.hammer(UserQueryCommandPathOpen, [str(self.root / 'data'), str(self.root / 'data.csv')], self.root / 'data.csv', 1, True)
+
+    def test_PathGlob(self):
+        self.hammer(UserQueryCommandPathGlob, [str(self.root / '*.txt'), str(self.root / '*.csv')], [self.root / 'data.csv'], 1,
+                    10, False)
+
+    def test_PathDirectory(self):
+        self.hammer(UserQueryCommandPathDirectory, ['x', '1', 'u', 's'], self.root, 1, str(self.root))
+
+    def test_Table(self):
+        self.hammer(UserQueryCommandTable, ['name,count', 'a,x', '', 'name,count', 'a,1', 'b,2', ''], [('a', 1), ('b', 2)], 1,
+                    {'name':str, 'count':int})
+
+    def test_cancellation_token_per_thread(self):
+        # The confirmation menu of each query is executed with the cancellation token of the thread that executed the query
+        (self.root / 'existing.txt').write_text('')
+        receiver = ThreadScriptedUserQueryReceiver([str(self.root / 'existing.txt'), 'y'])
+        command = UserQueryCommandPathSave(receiver, 'Please respond.')
+        start = threading.Barrier(_THREADS)
+
+        def work():
+            token = UserQueryCancellationToken()
+            start.wait()
+            for i in range(_QUERIES_PER_THREAD):
+                self.assertEqual(self.root / 'existing.txt', command.Execute(token))
+            return (threading.get_ident(), token)
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            tokens = dict(future.result() for future in [executor.submit(work) for i in range(_THREADS)])
+        menu_tokens = [(thread_id, token) for (thread_id, query_type, token) in receiver.tokens
+                       if query_type is UserQueryCommandMenu]
+        self.assertEqual(_THREADS * _QUERIES_PER_THREAD, len(menu_tokens))
+        for (thread_id, token) in menu_tokens:
+            self.assertIs(tokens[thread_id], token)
+
+    def test_shared_headless_receiver(self):
+        # Each line piped in is read by exactly one query, however the threads interleave
+        count = _THREADS * _QUERIES_PER_THREAD
+        stream = io.BytesIO(''.join(f"{i}\n" for i in range(count)).encode())
+        receiver = BytesConsoleUserQueryReceiver(stream=stream, chunk_size=64, buffer_output=True)
+        command = UserQueryCommandNumberInteger(receiver, 'Please respond.')
+        start = threading.Barrier(_THREADS)
+
+        def work():
+            start.wait()
+            return [command.Execute() for i in range(_QUERIES_PER_THREAD)]
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            results = [future.result() for future in [executor.submit(work) for i in range(_THREADS)]]
+        self.assertEqual(list(range(count)), sorted(value for thread_results in results for value in thread_results))
+
+    def test_blocks_read_whole(self):
+        # A query in another thread waits until a block has ended, rather than taking lines from the middle of it
+        for headless in (False, True):
+            with self.subTest(headless=headless):
+                receiver = ConsoleUserQueryReceiver(headless=headless)
+                with patch('sys.stdin', io.TextIOWrapper(io.BytesIO(b'a,b\n1,2\n3,4\n\nnext\n'))):
+                    block = receiver.GetRawResponseBlock('', {}, '')
+                    self.assertEqual('a,b', next(block))
+                    with ThreadPoolExecutor(1) as executor:
+                        other = executor.submit(receiver.GetRawResponse, '')
+                        self.assertRaises(TimeoutError, other.result, 0.1)
+                        self.assertEqual(['1,2', '3,4'], list(block))
+                        self.assertEqual('next', other.result())
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_chunks_read_whole(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver()
+        with patch('sys.stdin', io.TextIOWrapper(io.BytesIO(b'line 1\nline 2\n.\nnext\n'))):
+            chunks = receiver.GetRawResponseChunks('', {}, '.', 64)
+            self.assertEqual('line 1\n', next(chunks))
+            with ThreadPoolExecutor(1) as executor:
+                other = executor.submit(receiver.GetRawResponse, '')
+                self.assertRaises(TimeoutError, other.result, 0.1)
+                self.assertEqual(['line 2\n'], list(chunks))
+                self.assertEqual('next', other.result())
+
+    def test_logger_handler_added_once(self):
+        logger = logging.getLogger('user_query_receiver_logger')
+        start = threading.Barrier(_THREADS)
+
+        def work():
+            start.wait()
+            return [ThreadScriptedUserQueryReceiver(['a']) for i in range(_QUERIES_PER_THREAD)]
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            for future in [executor.submit(work) for i in range(_THREADS)]:
+                future.result()
+        handlers = [handler for handler in logger.handlers if getattr(handler, '_user_query_receiver', False)]
+        self.assertEqual(1, len(handlers))
+
+    def test_middleware_added_concurrently(self):
+        receiver = ThreadScriptedUserQueryReceiver(['a'])
+        middleware = [CountingMiddleware() for i in range(_THREADS * 4)]
+
+        def work(index):
+            for item in middleware[index::_THREADS]:
+                receiver.AddMiddleware(item)
+
+        with ThreadPoolExecutor(_THREADS) as executor:
+            for future in [executor.submit(work, i) for i in range(_THREADS)]:
+                future.result()
+        self.assertCountEqual(middleware, receiver.GetMiddlewarePipeline().GetMiddleware())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryCancellationToken class
+    (2) Cancellation of UserQueryCommand.Execute(...) by the receivers
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import gc
+import io
+import os
+import select
+import threading
+
+# Local
+from UserResponseCollector.UserQueryReceiver import UserQueryCancellationToken, UserQueryReceiverTerminateQueryingThreadError
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver, BytesConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandStr, UserQueryCommandText
+
+
+class Test_UserQueryCancellationToken(unittest.TestCase):
+
+    def test_Cancel(self):
+        with UserQueryCancellationToken() as token:
+            self.assertFalse(token.IsCancelled())
+            token.RaiseIfCancelled()
+            fd = token.GetWakeFileDescriptor()
+            self.assertEqual([], select.select([fd], [], [], 0)[0])
+            token.Cancel()
+            self.assertTrue(token.IsCancelled())
+            self.assertTrue(token.Wait(0))
+            self.assertEqual([fd], select.select([fd], [], [], 0)[0])
+            self.assertRaises(UserQueryReceiverTerminateQueryingThreadError, token.RaiseIfCancelled)
+
+    def test_GetWakeFileDescriptor_after_Cancel(self):
+        with UserQueryCancellationToken() as token:
+            token.Cancel()
+            fd = token.GetWakeFileDescriptor()
+            self.assertEqual([fd], select.select([fd], [], [], 0)[0])
+
+    def test_Close(self):
+        token = UserQueryCancellationToken()
+        fd = token.GetWakeFileDescriptor()
+        token.Close()
+        self.assertRaises(OSError, os.fstat, fd)
+        # Closing again, or collecting the token, must not close a descriptor reused by someone else
+        (read_fd, write_fd) = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        token.Close()
+        del token
+        gc.collect()
+        os.fstat(read_fd)
+        os.fstat(write_fd)
+
+    def test_wake_pipe_closed_when_collected(self):
+        token = UserQueryCancellationToken()
+        fd = token.GetWakeFileDescriptor()
+        os.fstat(fd)
+        del token
+        gc.collect()
+        self.assertRaises(OSError, os.fstat, fd)
+
+
+class Test_Cancellation(unittest.TestCase):
+
+    def setUp(self):
+        # A pipe that nobody writes to, like a terminal that nobody is at
+        (read_fd, self.write_fd) = os.pipe()
+        self.stream = os.fdopen(read_fd, 'rb')
+        self.addCleanup(self.stream.close)
+        self.addCleanup(os.close, self.write_fd)
+        self.token = UserQueryCancellationToken()
+        self.addCleanup(self.token.Close)
+
+    def _executeInThread(self, command):
+        """
+        Execute command in a thread, cancel it, and return the exception the thread ended with.
+        """
+        outcome = []
+        def run():
+            try:
+                outcome.append(command.Execute(self.token))
+            except Exception as err:
+                outcome.append(err)
+        thread = threading.Thread(target=run)
+        thread.start()
+        # The thread is blocked waiting for input
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        self.token.Cancel()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        return outcome[0]
+
+    def test_headless_read_is_woken(self):
+        receiver = BytesConsoleUserQueryReceiver(stream=self.stream)
+        outcome = self._executeInThread(UserQueryCommandNumberInteger(receiver, 'How many?'))
+        self.assertIsInstance(outcome, UserQueryReceiverTerminateQueryingThreadError)
+
+    # Apply a patch() decorator to capture the prompt written to the console window.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_console_read_is_woken(self, mock_stdout):
+        # A text stream reading the pipe, that claims to be a terminal
+        stdin = io.TextIOWrapper(self.stream)
+        with patch('sys.stdin', stdin), patch.object(stdin, 'isatty', return_value=True):
+            receiver = ConsoleUserQueryReceiver()
+            outcome = self._executeInThread(UserQueryCommandStr(receiver, 'Name?'))
+        self.assertIsInstance(outcome, UserQueryReceiverTerminateQueryingThreadError)
+
+    # Apply a patch() decorator to capture the prompt written to the console window.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_console_chunks_read_is_woken(self, mock_stdout):
+        # A text stream reading the pipe, that claims to be a terminal
+        stdin = io.TextIOWrapper(self.stream)
+        with patch('sys.stdin', stdin), patch.object(stdin, 'isatty', return_value=True):
+            receiver = ConsoleUserQueryReceiver()
+            outcome = self._executeInThread(UserQueryCommandText(receiver, 'Paste the text.'))
+        self.assertIsInstance(outcome, UserQueryReceiverTerminateQueryingThreadError)
+
+    def test_response_before_cancel(self):
+        os.write(self.write_fd, b'7\n')
+        receiver = BytesConsoleUserQueryReceiver(stream=self.stream)
+        self.assertEqual(7, UserQueryCommandNumberInteger(receiver, '').Execute(self.token))
+
+    def test_already_cancelled(self):
+        self.token.Cancel()
+        receiver = BytesConsoleUserQueryReceiver(stream=io.BytesIO(b'7\n'))
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertRaises(UserQueryReceiverTerminateQueryingThreadError, command.Execute, self.token)
+
+
+if __name__ == '__main__':
+    unittest.main()
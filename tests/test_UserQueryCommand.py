@@ -7,6 +7,9 @@ This module provides unit tests for:
 import unittest
 from unittest.mock import patch
 import io
+import os
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -14,7 +17,17 @@ from pathlib import Path
 from UserResponseCollector.UserQueryCommand import UserQueryCommand, UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandPathOpen, UserQueryCommandPathSave
 from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberFloat, UserQueryCommandStr
 from UserResponseCollector.UserQueryCommand import askForMenuSelection, askForInt, askForFloat, askForStr, askForPathSave, askForPathOpen
+from UserResponseCollector.UserQueryCommand import UserQueryCommandTable, UserQueryTable, askForTable
+from UserResponseCollector.UserQueryCommand import UserQueryCommandText, askForText
+from UserResponseCollector.UserQueryCommand import OverwritePolicy, resolvePathSaveBatch
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathGlob, UserQueryPathMatches, askForPathGlob
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathDirectory, askForPathDirectory
 import UserResponseCollector.UserQueryReceiver
+import UserResponseCollector.DirectoryIndex
+from UserResponseCollector.PathValidator import PathValidatorCSV, PathValidatorNotEmpty
+
+# The directory that UserResponseCollector is imported from, so that a fresh interpreter imports the same package
+_IMPORT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(UserResponseCollector.UserQueryReceiver.__file__)))
 
 # TODO: Since UserQueryCommand.Execute() has been refactored as a Template Method, it would be an enhancement of
 # testing to create unit tests for the individual primitive operations of the UserQueryCommandX classes, rather than
@@ -65,12 +78,12 @@ class Test_UserQueryCommandPathSaveOpen(unittest.TestCase):
         # First ... the don't overwrite case
         exp_val = (False, 'Please enter a path to a new file or file that you wish to overwrite.')
         act_val = command._doValidateProcessedResponse(Path(temp_path))
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
         # Second ... the do overwrite case
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse(Path(temp_path))
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_PathSave_command_exists_n_y(self):
         
@@ -148,6 +161,64 @@ class Test_UserQueryCommandPathSaveOpen(unittest.TestCase):
         act_val = command._doValidateProcessedResponse()
         self.assertEqual(exp_val, act_val)
 
+    def test_PathOpen_command_doValidateProcessedResponse_must_exist(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathOpen(receiver, '', must_exist=True)
+        exp_val = (False, "\n'None' is not an existing file. Please try again.")
+        act_val = command._doValidateProcessedResponse()
+        self.assertEqual(exp_val, act_val)
+        # By default, a path that doesn't exist is valid
+        command = UserQueryCommandPathOpen(receiver, '', validators=[PathValidatorNotEmpty()])
+        self.assertEqual((True, ''), command._doValidateProcessedResponse())
+
+    def test_PathOpen_command_doValidateProcessedResponse_exists(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        Path(temp_dir.name, 'report_2024.csv').touch()
+        Path(temp_dir.name, 'report_2025.csv').touch()
+        Path(temp_dir.name, 'reports').mkdir()
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathOpen(receiver, '', must_exist=True)
+        # An existing file
+        exp_val = (True, '')
+        act_val = command._doValidateProcessedResponse(Path(temp_dir.name, 'report_2025.csv'))
+        self.assertEqual(exp_val, act_val)
+        # A directory
+        path = Path(temp_dir.name, 'reports')
+        exp_val = (False, f"\n\'{path}\' is a directory, not a file. Please try again.")
+        act_val = command._doValidateProcessedResponse(path)
+        self.assertEqual(exp_val, act_val)
+        # A path that doesn't exist, but is the start of existing paths, which are suggested
+        path = Path(temp_dir.name, 'report_')
+        suggestions = f"\'{path}2024.csv\', \'{path}2025.csv\'"
+        exp_val = (False, f"\n\'{path}\' is not an existing file. Did you mean: {suggestions}? Please try again.")
+        act_val = command._doValidateProcessedResponse(path)
+        self.assertEqual(exp_val, act_val)
+        # A path in a directory that doesn't exist
+        path = Path(temp_dir.name, 'missing', 'report.csv')
+        exp_val = (False, f"\n\'{path}\' is not an existing file. Please try again.")
+        act_val = command._doValidateProcessedResponse(path)
+        self.assertEqual(exp_val, act_val)
+
+    def test_PathOpen_command_doValidateProcessedResponse_validators(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        Path(temp_dir.name, 'data.csv').write_text('a,b\n1,2\n')
+        Path(temp_dir.name, 'empty.csv').touch()
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathOpen(receiver, '', must_exist=True, validators=[PathValidatorNotEmpty(), PathValidatorCSV()])
+        exp_val = (True, '')
+        act_val = command._doValidateProcessedResponse(Path(temp_dir.name, 'data.csv'))
+        self.assertEqual(exp_val, act_val)
+        path = Path(temp_dir.name, 'empty.csv')
+        exp_val = (False, f"\n\'{path}\' is empty. Please try again.")
+        act_val = command._doValidateProcessedResponse(path)
+        self.assertEqual(exp_val, act_val)
+        # Without the existence check, a path that doesn't exist is valid, but an existing file is still validated
+        command = UserQueryCommandPathOpen(receiver, '', must_exist=False, validators=[PathValidatorNotEmpty()])
+        self.assertEqual((True, ''), command._doValidateProcessedResponse(Path(temp_dir.name, 'new.csv')))
+        self.assertFalse(command._doValidateProcessedResponse(path)[0])
+
     def test_PathOpen_command(self):
 
         # Create a named temporary file.
@@ -192,7 +263,7 @@ class Test_UserQueryCommandPathSaveOpen(unittest.TestCase):
         
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         query_preface = 'Which file would you like to open?'
-        command = UserQueryCommandPathOpen(receiver, query_preface)
+        command = UserQueryCommandPathOpen(receiver, query_preface, must_exist=True)
         
         exp_val = temp_path
         test_path = command.Execute()
@@ -245,6 +316,26 @@ class Test_UserQueryCommand(unittest.TestCase):
         act_val = extra['query_type']
         self.assertEqual(exp_val, act_val)
     
+    def test_commands_have_no_instance_dict(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        commands = [UserQueryCommandMenu(receiver, '', {'1':'Option 1'}), UserQueryCommandNumberInteger(receiver, ''),
+                    UserQueryCommandNumberFloat(receiver, ''), UserQueryCommandStr(receiver, ''), UserQueryCommandText(receiver, ''),
+                    UserQueryCommandPathSave(receiver, ''), UserQueryCommandPathOpen(receiver, ''),
+                    UserQueryCommandPathGlob(receiver, ''), UserQueryCommandPathDirectory(receiver, ''),
+                    UserQueryCommandTable(receiver, '', {'a':int})]
+        for command in commands:
+            self.assertFalse(hasattr(command, '__dict__'), type(command).__name__)
+
+    def test_shared_extra_not_changed(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathSave(receiver, '')
+        extra = command._doGetExtraDict()
+        self.assertEqual({'query_type':UserQueryCommandPathSave, 'completion':'path'}, extra)
+        extra['cancellation_token'] = None
+        self.assertEqual({'completion':'path'}, dict(UserQueryCommandPathSave._EXTRA))
+        with self.assertRaises(TypeError):
+            UserQueryCommandPathSave._EXTRA['completion'] = None
+
     def test_menu_command_doGetExtraDict(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         query_preface = 'Do you want option 1 or option 2?'
@@ -252,7 +343,11 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandMenu(receiver, query_preface, query_dic)
         exp_val = {'query_type':UserQueryCommandMenu, 'query_dic':{'1':'Option 1', '2':'Option 2'}}
         act_val = command._doGetExtraDict()
+        accept = act_val.pop('accept_partial')
         self.assertEqual(exp_val, act_val)
+        # The check is given the sorted keys of this query
+        self.assertEqual(command._doIsAcceptablePartialResponse, accept.func)
+        self.assertEqual({'sorted_keys':['1', '2']}, accept.keywords)
         
     def test_menu_command_doCreatePromptText(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -268,7 +363,7 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandMenu(receiver)
         exp_val = ('1','')
         act_val = command._doProcessRawResponse('1')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_menu_command_doValidateProcessedResponse(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -277,7 +372,7 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandMenu(receiver, query_preface, query_dic)
         exp_val = (True,'')
         act_val = command._doValidateProcessedResponse('2')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_menu_command_doValidateProcessedResponse_bad(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -287,7 +382,7 @@ class Test_UserQueryCommand(unittest.TestCase):
         processed_response = 'z'
         exp_val = (False,f"\n\'{processed_response}\' is not a valid response. Please try again.")
         act_val = command._doValidateProcessedResponse('z')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     # Apply a patch() decorator to replace keyboard input from user with a string.
     # The patch should result in first an invalid response, and then a valid response.
@@ -331,21 +426,21 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandNumberInteger(receiver, '')
         exp_val = (10, '')
         act_val = command._doProcessRawResponse('10')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberInteger_command_doProcessRawResponse_bad(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberInteger(receiver, '')
         exp_val = (None, f"\n\'{'ten'}\' is not an integer. Please try again.")
         act_val = command._doProcessRawResponse('ten')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberInteger_command_doValidateProcessedResponse(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberInteger(receiver, '', 1, 20)
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse(10)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberInteger_command_doValidateProcessedResponse_OutOfRange(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -353,11 +448,11 @@ class Test_UserQueryCommand(unittest.TestCase):
         # Exceed maximum value
         exp_val = (False, f"\n\'{21}\' is greater than {20}. Please try again.")
         act_val = command._doValidateProcessedResponse(21)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
         # Less than minimum value
         exp_val = (False, f"\n\'{1}\' is less than {2}. Please try again.")
         act_val = command._doValidateProcessedResponse(1)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberInteger_command_doValidateProcessedResponse_min0_max0(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -365,19 +460,19 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandNumberInteger(receiver, '', 0, 20)
         exp_val = (False, f"\n\'{-1}\' is less than {0}. Please try again.")
         act_val = command._doValidateProcessedResponse(-1)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
         # Greater than maximum value
         command = UserQueryCommandNumberInteger(receiver, '', -20, 0)
         exp_val = (False, f"\n\'{1}\' is greater than {0}. Please try again.")
         act_val = command._doValidateProcessedResponse(1)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberInteger_command_doValidateProcessedResponse_NoMinMax(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberInteger(receiver, '')
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse(21)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     # Apply a patch() decorator to replace keyboard input from user with a string.
     # The patch should result in first an invalid response, and then a valid response.
@@ -459,21 +554,21 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandNumberFloat(receiver, '')
         exp_val = (10.5, '')
         act_val = command._doProcessRawResponse('10.5')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberFloat_command_doProcessRawResponse_bad(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberFloat(receiver, '')
         exp_val = (None, f"\n\'{'ten'}\' is not a floating point number. Please try again.")
         act_val = command._doProcessRawResponse('ten')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberFloat_command_doValidateProcessedResponse(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberFloat(receiver, '', minimum=1.25, maximum=20.75)
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse(10.5)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberFloat_command_doValidateProcessedResponse_OutOfRange(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -481,11 +576,11 @@ class Test_UserQueryCommand(unittest.TestCase):
         # Exceed maximum value
         exp_val = (False, f"\n\'{20.9}\' is greater than {20.75}. Please try again.")
         act_val = command._doValidateProcessedResponse(20.9)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
         # Less than minimum value
         exp_val = (False, f"\n\'{1.15}\' is less than {1.25}. Please try again.")
         act_val = command._doValidateProcessedResponse(1.15)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberFloat_command_doValidateProcessedResponse_min0_max0(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
@@ -493,19 +588,19 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandNumberFloat(receiver, '', minimum=-1.25, maximum=0.00)
         exp_val = (False, f"\n\'{1.25}\' is greater than {0.00}. Please try again.")
         act_val = command._doValidateProcessedResponse(1.25)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
         # Less than minimum value
         command = UserQueryCommandNumberFloat(receiver, '', minimum=0.00, maximum=20.9)
         exp_val = (False, f"\n\'{-1.15}\' is less than {0.00}. Please try again.")
         act_val = command._doValidateProcessedResponse(-1.15)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_NumberFloat_command_doValidateProcessedResponse_NoMinMax(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandNumberFloat(receiver, '')
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse(10.5)
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     # Apply a patch() decorator to replace keyboard input from user with a string.
     # The patch should result in first an invalid response, and then a valid response.
@@ -582,28 +677,28 @@ class Test_UserQueryCommand(unittest.TestCase):
         command = UserQueryCommandStr(receiver, '')
         exp_val = ('George Washington', '')
         act_val = command._doProcessRawResponse('George Washington')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_Str_command_doValidateProcessedResponse(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandStr(receiver, '', max_length=15)
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse('G. Washington')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_Str_command_doValidateProcessedResponse_OutOfRange(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandStr(receiver, '', max_length=15)
         exp_val = (False, f"\n\'{'George Washington'}\' is longer than {15} characters. Please try again.")
         act_val = command._doValidateProcessedResponse('George Washington')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     def test_Str_command_doValidateProcessedResponse_NoMinMax(self):
         receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
         command = UserQueryCommandStr(receiver, '', max_length=None)
         exp_val = (True, '')
         act_val = command._doValidateProcessedResponse('George Washington')
-        self.assertTupleEqual(exp_val, act_val)
+        self.assertEqual(exp_val, act_val)
 
     # Apply a patch() decorator to replace keyboard input from user with a string.
     # The patch should result in first an invalid response that is too long, then a valid response.
@@ -627,6 +722,349 @@ class Test_UserQueryCommand(unittest.TestCase):
         act_val = askForStr(query_preface, max_length=15)
         self.assertEqual(exp_val, act_val)
 
+class Test_UserQueryCommandTable(unittest.TestCase):
+
+    def test_Table_command_doCreatePromptText(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        query_preface = 'Paste the order lines.'
+        command = UserQueryCommandTable(receiver, query_preface, {'item':str, 'qty':int})
+        exp_val = 'Paste the order lines.\nEnter rows of values, starting with a header row, for columns: item, qty\nEnd with a blank line:  '
+        act_val = command._doCreatePromptText()
+        self.assertEqual(exp_val, act_val)
+
+    def test_Table_command_doGetExtraDict(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int}, terminator='END')
+        exp_val = {'query_type':UserQueryCommandTable, 'columns':{'qty':int}, 'terminator':'END'}
+        act_val = command._doGetExtraDict()
+        self.assertEqual(exp_val, act_val)
+
+    def test_Table_command_doProcessRawResponse(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'item':str, 'qty':int, 'price':float})
+        # Header columns are in a different order than the columns argument
+        lines = ['price,item,qty', '2.5,"Widget, large",4', '0.75,Gadget,10']
+        (table, msg) = command._doProcessRawResponse(iter(lines))
+        self.assertEqual('', msg)
+        self.assertEqual(2, len(table))
+        self.assertEqual(['item', 'qty', 'price'], table.GetColumnNames())
+        self.assertEqual(('Widget, large', 4, 2.5), table.GetRow(0))
+        self.assertEqual([4, 10], list(table.GetColumn('qty')))
+        self.assertEqual('q', table.GetColumn('qty').typecode)
+        self.assertEqual('d', table.GetColumn('price').typecode)
+
+    def test_Table_command_doProcessRawResponse_no_header(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int, 'price':float}, header=False)
+        (table, msg) = command._doProcessRawResponse('1,2.5\n3,4.5')
+        self.assertEqual([(1, 2.5), (3, 4.5)], [table.GetRow(0), table.GetRow(1)])
+
+    def test_Table_command_doProcessRawResponse_bad_value(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int})
+        lines = iter(['qty', '1', 'ten', '3'])
+        exp_val = (None, f"\nLine 3, column 'qty':\n'ten' is not an integer. Please try again.")
+        act_val = command._doProcessRawResponse(lines)
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual('invalid_cell', act_val.code)
+        # The rest of the block must have been discarded
+        self.assertEqual([], list(lines))
+
+    def test_Table_command_doProcessRawResponse_missing_column(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int, 'price':float})
+        exp_val = (None, f"\nThe header row does not include the column 'price'. Please try again.")
+        act_val = command._doProcessRawResponse(['qty', '1'])
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual('missing_column', act_val.code)
+
+    def test_Table_command_doProcessRawResponse_wrong_row_length(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int, 'price':float}, header=False)
+        exp_val = (None, f"\nLine 1 has 1 values, but 2 are required. Please try again.")
+        act_val = command._doProcessRawResponse(['1'])
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual('wrong_value_count', act_val.code)
+
+    def test_Table_command_converters_per_table(self):
+        receivers = [UserResponseCollector.UserQueryReceiver.ConsoleUserQueryReceiver() for i in range(2)]
+        commands = [UserQueryCommandTable(receiver, '', {'qty':int, 'name':str}) for receiver in receivers]
+        # Each table converts its cells with commands of its own receiver, rather than those of the first table built
+        for (receiver, command) in zip(receivers, commands):
+            self.assertEqual({int, str}, set(command._converters))
+            for converter in command._converters.values():
+                self.assertIs(receiver, converter._receiver)
+
+    def test_Table_command_doValidateProcessedResponse_empty(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, '', {'qty':int})
+        exp_val = (False, '\nNo rows of values were entered. Please try again.')
+        act_val = command._doValidateProcessedResponse(UserQueryTable({'qty':int}))
+        self.assertEqual(exp_val, act_val)
+
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    # The patch should result in first an invalid block, and then a valid block.
+    @patch('sys.stdin', io.StringIO('qty,price\n1,x\n2,3.0\n\nqty,price\n1,2.0\n2,3.0\n\n'))
+    def test_Table_command(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandTable(receiver, 'Paste the order lines.', {'qty':int, 'price':float})
+        table = command.Execute()
+        self.assertEqual([(1, 2.0), (2, 3.0)], [table.GetRow(0), table.GetRow(1)])
+
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    # The block ends at the end of input, rather than with a terminator.
+    @patch('sys.stdin', io.StringIO('qty\n5\n6'))
+    def test_table_function(self):
+        table = askForTable('Paste the order lines.', {'qty':int})
+        self.assertEqual([5, 6], list(table.GetColumn('qty')))
+
+    # Apply a patch() decorator to replace keyboard input from user with a header row, and then the end of input.
+    @patch('sys.stdin', io.StringIO('qty\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_table_function_end_of_input(self, mock_stdout):
+        # The block with no rows is rejected once, and then there is no more input to ask again with
+        self.assertRaises(EOFError, askForTable, 'Paste the order lines.', {'qty':int})
+        self.assertEqual(1, mock_stdout.getvalue().count('No rows of values were entered.'))
+
+    def test_table_function_end_of_piped_input(self):
+        # A script whose piped input ends fails at once, rather than asking again forever
+        code = "from UserResponseCollector.UserQueryCommand import askForTable; askForTable('Paste.', {'a':int, 'b':int})"
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [_IMPORT_ROOT, env.get('PYTHONPATH')]))
+        completed = subprocess.run([sys.executable, '-c', code], input='a,b\n', env=env, capture_output=True, text=True,
+                                   timeout=60)
+        self.assertNotEqual(0, completed.returncode)
+        self.assertIn('EOFError', completed.stderr)
+        self.assertLess(len(completed.stdout), 1000)
+
+class Test_UserQueryCommandText(unittest.TestCase):
+
+    def test_Text_command_doCreatePromptText(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandText(receiver, 'Paste the certificate.', max_length=4000)
+        exp_val = "Paste the certificate.\nEnter lines of text no longer than 4000 characters in total.\nEnd with a line containing only '.':  \n"
+        act_val = command._doCreatePromptText()
+        self.assertEqual(exp_val, act_val)
+
+    def test_Text_command_doProcessRawResponse(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandText(receiver, '', max_length=100)
+        (text_file, msg) = command._doProcessRawResponse(iter(['first line\n', 'second ', 'line\n']))
+        self.addCleanup(text_file.close)
+        self.assertEqual('', msg)
+        self.assertEqual('first line\nsecond line\n', text_file.read())
+
+    def test_Text_command_doProcessRawResponse_spooled_to_disk(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandText(receiver, '', spool_threshold=64)
+        (text_file, msg) = command._doProcessRawResponse(('x' * 50 + '\n' for i in range(10)))
+        self.addCleanup(text_file.close)
+        self.assertTrue(text_file._rolled)
+        self.assertEqual(10, len(text_file.readlines()))
+
+    def test_Text_command_doProcessRawResponse_too_long(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandText(receiver, '', max_length=15)
+        chunks = iter(['George Washington\n', 'more\n', 'and more\n'])
+        exp_val = (None, '\nThe text is longer than 15 characters. Please try again.')
+        act_val = command._doProcessRawResponse(chunks)
+        self.assertEqual(exp_val, act_val)
+        # The rest of the text must have been discarded
+        self.assertEqual([], list(chunks))
+
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    # The patch should result in first an invalid response that is too long, then a valid response.
+    @patch('sys.stdin', io.StringIO('-----BEGIN-----\n' + 'A' * 100 + '\n-----END-----\n.\nshort\n.\n'))
+    def test_Text_command(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandText(receiver, 'Paste the certificate.', max_length=50, chunk_size=16)
+        text_file = command.Execute()
+        self.addCleanup(text_file.close)
+        self.assertEqual('short\n', text_file.read())
+
+    # Apply a patch() decorator to replace keyboard input from user with a string.
+    @patch('sys.stdin', io.StringIO('line 1\nline 2\nEND\n'))
+    def test_text_function(self):
+        text_file = askForText('Paste the log.', terminator='END')
+        self.addCleanup(text_file.close)
+        self.assertEqual('line 1\nline 2\n', text_file.read())
+
+class Test_resolvePathSaveBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.other_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.other_dir.cleanup)
+        Path(self.temp_dir.name, 'a.csv').touch()
+        Path(self.temp_dir.name, 'a_1.csv').touch()
+        Path(self.other_dir.name, 'c.csv').touch()
+        self.paths = [Path(self.temp_dir.name, 'a.csv'), Path(self.temp_dir.name, 'b.csv'), Path(self.other_dir.name, 'c.csv'),
+                      Path(self.temp_dir.name, 'missing', 'd.csv')]
+
+    def test_ALWAYS(self):
+        act_val = resolvePathSaveBatch(self.paths, OverwritePolicy.ALWAYS)
+        self.assertEqual(self.paths, act_val)
+
+    def test_NEVER(self):
+        exp_val = [None, self.paths[1], None, self.paths[3]]
+        act_val = resolvePathSaveBatch(self.paths, OverwritePolicy.NEVER)
+        self.assertEqual(exp_val, act_val)
+
+    def test_RENAME(self):
+        # 'a_1.csv' already exists, and 'a_2.csv' is another path in the batch, so 'a.csv' becomes 'a_3.csv'
+        paths = self.paths + [Path(self.temp_dir.name, 'a_2.csv')]
+        exp_val = [Path(self.temp_dir.name, 'a_3.csv'), paths[1], Path(self.other_dir.name, 'c_1.csv'), paths[3], paths[4]]
+        act_val = resolvePathSaveBatch(paths, OverwritePolicy.RENAME)
+        self.assertEqual(exp_val, act_val)
+
+    def test_one_scan_per_directory(self):
+        with patch('UserResponseCollector.DirectoryIndex.DirectoryIndexCache.GetIndex', autospec=True,
+                   side_effect=UserResponseCollector.DirectoryIndex.DirectoryIndexCache.GetIndex) as mock_get_index:
+            resolvePathSaveBatch(self.paths, OverwritePolicy.NEVER)
+            self.assertEqual(3, mock_get_index.call_count)
+            # Renaming reuses the indexes already obtained, rather than listing the directories again
+            resolvePathSaveBatch(self.paths, OverwritePolicy.RENAME)
+            self.assertEqual(6, mock_get_index.call_count)
+
+    # Apply patch() decorators to replace keyboard input from user with a string, and to capture the console output.
+    # The patch should result in first an invalid response, and then a choice to rename the existing files.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    @patch('sys.stdin', io.StringIO('x\nr\n'))
+    def test_ASK(self, mock_stdout):
+        exp_val = [Path(self.temp_dir.name, 'a_2.csv'), self.paths[1], Path(self.other_dir.name, 'c_1.csv'), self.paths[3]]
+        act_val = resolvePathSaveBatch(self.paths, OverwritePolicy.ASK, 'Saving the reports.')
+        self.assertEqual(exp_val, act_val)
+        # The user was asked once for both existing files, and the question would have been asked again after the invalid response
+        self.assertEqual(1, mock_stdout.getvalue().count("\n'x' is not a valid response."))
+
+    def test_ASK_nothing_exists(self):
+        paths = [self.paths[1], self.paths[3]]
+        # Nothing exists, so the user is not asked, and stdin is not read
+        with patch('sys.stdin', io.StringIO('')):
+            act_val = resolvePathSaveBatch(paths)
+        self.assertEqual(paths, act_val)
+
+
+class Test_UserQueryCommandPathGlob(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        for i in range(4):
+            Path(self.root, f"data_{i}.csv").touch()
+        Path(self.root, 'notes.txt').touch()
+
+    def test_PathGlob_command_doCreatePromptText(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathGlob(receiver, 'Which files would you like to open?')
+        exp_val = 'Which files would you like to open?\nEnter a file system path pattern (e.g., data/*.csv or data/**/*.csv), or a directory:  '
+        act_val = command._doCreatePromptText()
+        self.assertEqual(exp_val, act_val)
+
+    def test_PathGlob_command_doProcessRawResponse(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathGlob(receiver, '', preview_limit=2)
+        (matches, msg) = command._doProcessRawResponse(str(self.root / '*.csv'))
+        self.assertEqual('', msg)
+        self.assertIsInstance(matches, UserQueryPathMatches)
+        self.assertEqual(2, len(matches.GetPreview()))
+        self.assertTrue(matches.HasMore())
+        # Iterating produces the previewed paths, and then the rest
+        exp_val = [self.root / f"data_{i}.csv" for i in range(4)]
+        act_val = sorted(matches)
+        self.assertEqual(exp_val, act_val)
+        # An empty pattern
+        exp_val = (None, '\nNo pattern was entered. Please try again.')
+        act_val = command._doProcessRawResponse('  ')
+        self.assertEqual(exp_val, act_val)
+
+    def test_PathGlob_command_doValidateProcessedResponse_no_matches(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathGlob(receiver, '')
+        pattern = str(self.root / '*.json')
+        exp_val = (False, f"\nNo files match \'{pattern}\'. Please try again.")
+        matches = UserQueryPathMatches(pattern)
+        with patch.object(matches, '_paths', wraps=matches._paths) as mock_paths:
+            act_val = command._doValidateProcessedResponse(matches)
+        self.assertEqual(exp_val, act_val)
+        # The abandoned matches are closed at once
+        mock_paths.close.assert_called_once_with()
+
+    # Apply a patch() decorator to capture the printed error message.
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_PathGlob_command(self, mock_stdout):
+        # First pattern matches nothing, second is rejected by the user, third is confirmed
+        responses = [str(self.root / '*.json'), str(self.root / '*.txt'), 'n', str(self.root / '*.csv'), 'y']
+        patcher = patch('sys.stdin', io.StringIO('\n'.join(responses) + '\n'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathGlob(receiver, '', preview_limit=2)
+        exp_val = [self.root / f"data_{i}.csv" for i in range(4)]
+        act_val = sorted(command.Execute())
+        self.assertEqual(exp_val, act_val)
+        self.assertIn('No files match', mock_stdout.getvalue())
+        self.assertIn('Please enter another pattern.', mock_stdout.getvalue())
+
+    def test_PathGlob_function(self):
+        patcher = patch('sys.stdin', io.StringIO(str(self.root / '*.txt') + '\ny\n'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        exp_val = [self.root / 'notes.txt']
+        act_val = list(askForPathGlob('Which files would you like to open?'))
+        self.assertEqual(exp_val, act_val)
+
+
+class Test_UserQueryCommandPathDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        Path(self.root, 'only').mkdir()
+        for i in range(3):
+            Path(self.root, 'only', f"dir_{i}").mkdir()
+        self.addCleanup(UserResponseCollector.DirectoryIndex.DirectoryIndexCache_GetCache().Clear)
+
+    def _patchStdin(self, responses):
+        patcher = patch('sys.stdin', io.StringIO('\n'.join(responses) + '\n'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_PathDirectory_command_select(self, mock_stdout):
+        # Into 'only', to the second page, into its only subdirectory, up again, and select
+        self._patchStdin(['1', 'n', '1', 'u', 's'])
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathDirectory(receiver, 'Where are the files?', self.root, page_size=2)
+        exp_val = Path(self.root, 'only')
+        act_val = command.Execute()
+        self.assertEqual(exp_val, act_val)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_PathDirectory_command_previous_page(self, mock_stdout):
+        self._patchStdin(['1', 'n', 'p', 's'])
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathDirectory(receiver, '', self.root, page_size=2)
+        self.assertEqual(Path(self.root, 'only'), command.Execute())
+
+    def test_PathDirectory_command_doValidateProcessedResponse(self):
+        receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
+        command = UserQueryCommandPathDirectory(receiver, '')
+        self.assertEqual((True, ''), command._doValidateProcessedResponse(self.root))
+        path = Path(self.root, 'missing')
+        exp_val = (False, f"\n\'{path}\' is no longer an existing directory. Please try again.")
+        act_val = command._doValidateProcessedResponse(path)
+        self.assertEqual(exp_val, act_val)
+
+    def test_PathDirectory_function(self):
+        self._patchStdin(['s'])
+        exp_val = self.root
+        act_val = askForPathDirectory('Where are the files?', self.root)
+        self.assertEqual(exp_val, act_val)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryResponseMemo
+    (2) Memoized processing and validation of raw responses by UserQueryCommand.Execute(...)
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+
+# Local
+from UserResponseCollector.UserQueryMemo import UserQueryResponseMemo
+from UserResponseCollector.UserQueryResult import UserQueryResult
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandMenu, UserQueryCommandStr
+from UserResponseCollector.UserQueryCommand import UserQueryCommandPathOpen
+
+
+class Test_UserQueryResponseMemo(unittest.TestCase):
+
+    def test_Get_Put(self):
+        memo = UserQueryResponseMemo()
+        self.assertIsNone(memo.Get('config', '10'))
+        memo.Put('config', '10', UserQueryResult(10), UserQueryResult.VALID)
+        self.assertEqual((UserQueryResult(10), UserQueryResult.VALID), memo.Get('config', '10'))
+        self.assertIsNone(memo.Get('other config', '10'))
+        exp_val = {'hits':1, 'misses':2, 'evictions':0, 'entries':1, 'configurations':1}
+        self.assertEqual(exp_val, memo.GetStats())
+        memo.Clear()
+        exp_val = {'hits':0, 'misses':0, 'evictions':0, 'entries':0, 'configurations':0}
+        self.assertEqual(exp_val, memo.GetStats())
+
+    def test_LRU_eviction(self):
+        memo = UserQueryResponseMemo(max_entries=2)
+        memo.Put('config', 'a', UserQueryResult('a'), None)
+        memo.Put('config', 'b', UserQueryResult('b'), None)
+        # Using 'a' makes 'b' the least recently used
+        memo.Get('config', 'a')
+        memo.Put('config', 'c', UserQueryResult('c'), None)
+        self.assertIsNone(memo.Get('config', 'b'))
+        self.assertIsNotNone(memo.Get('config', 'a'))
+        self.assertIsNotNone(memo.Get('config', 'c'))
+        self.assertEqual(1, memo.GetStats()['evictions'])
+        # The limit applies to each configuration separately
+        memo.Put('other config', 'd', UserQueryResult('d'), None)
+        self.assertEqual(3, memo.GetStats()['entries'])
+
+    def test_configuration_eviction(self):
+        memo = UserQueryResponseMemo(max_configurations=2)
+        memo.Put('config 1', 'a', UserQueryResult('a'), None)
+        memo.Put('config 1', 'b', UserQueryResult('b'), None)
+        memo.Put('config 2', 'a', UserQueryResult('a'), None)
+        # Using 'config 1' makes 'config 2' the least recently used
+        memo.Get('config 1', 'a')
+        memo.Put('config 3', 'a', UserQueryResult('a'), None)
+        self.assertIsNone(memo.Get('config 2', 'a'))
+        self.assertIsNotNone(memo.Get('config 1', 'b'))
+        self.assertIsNotNone(memo.Get('config 3', 'a'))
+        exp_val = {'hits':3, 'misses':1, 'evictions':1, 'entries':3, 'configurations':2}
+        self.assertEqual(exp_val, memo.GetStats())
+        # Discarding a configuration discards all of its raw responses
+        memo.Put('config 4', 'a', UserQueryResult('a'), None)
+        self.assertEqual(3, memo.GetStats()['evictions'])
+        self.assertEqual(2, memo.GetStats()['entries'])
+
+    def test_configurations_bounded(self):
+        memo = UserQueryResponseMemo(max_configurations=8)
+        for maximum in range(1000):
+            memo.Put(('UserQueryCommandNumberInteger', 1, maximum), '1', UserQueryResult(1), None)
+        self.assertEqual(8, memo.GetStats()['configurations'])
+
+
+class Test_UserQueryCommandMemo(unittest.TestCase):
+
+    def test_getMemoConfiguration(self):
+        receiver = ConsoleUserQueryReceiver()
+        self.assertEqual((UserQueryCommandNumberInteger, 1, 10), UserQueryCommandNumberInteger(receiver, '', 1, 10)._getMemoConfiguration())
+        self.assertEqual((UserQueryCommandStr, 5), UserQueryCommandStr(receiver, '', 5)._getMemoConfiguration())
+        self.assertEqual((UserQueryCommandMenu, (('y', 'Yes'),)), UserQueryCommandMenu(receiver, '', {'y':'Yes'})._getMemoConfiguration())
+        self.assertIsNone(UserQueryCommandPathOpen(receiver, '')._getMemoConfiguration())
+
+    @patch('sys.stdin', io.StringIO('x\n0\n10\nx\n0\n10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_memoized(self, mock_stdout):
+        memo = UserQueryResponseMemo()
+        receiver = ConsoleUserQueryReceiver()
+        # Commands of the same configuration share cached results
+        commands = [UserQueryCommandNumberInteger(receiver, '', 1, 100).SetResponseMemo(memo) for i in range(2)]
+        self.assertIs(memo, commands[0].GetResponseMemo())
+        self.assertEqual(10, commands[0].Execute())
+        exp_val = {'hits':0, 'misses':3, 'evictions':0, 'entries':3, 'configurations':1}
+        self.assertEqual(exp_val, memo.GetStats())
+        with patch.object(UserQueryCommandNumberInteger, '_doProcessRawResponse') as process, \
+             patch.object(UserQueryCommandNumberInteger, '_doValidateProcessedResponse') as validate:
+            self.assertEqual(10, commands[1].Execute())
+        process.assert_not_called()
+        validate.assert_not_called()
+        self.assertEqual(3, memo.GetStats()['hits'])
+        output = mock_stdout.getvalue()
+        self.assertEqual(2, output.count("'x' is not an integer. Please try again."))
+        self.assertEqual(2, output.count("'0' is less than 1. Please try again."))
+
+    @patch('sys.stdin', io.StringIO('10\n10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_configurations_not_shared(self, mock_stdout):
+        memo = UserQueryResponseMemo()
+        receiver = ConsoleUserQueryReceiver()
+        self.assertEqual(10, UserQueryCommandNumberInteger(receiver, '', 1, 100).SetResponseMemo(memo).Execute())
+        command = UserQueryCommandNumberInteger(receiver, '', 20, 100).SetResponseMemo(memo)
+        self.assertRaises(EOFError, command.Execute)
+        self.assertIn("'10' is less than 20. Please try again.", mock_stdout.getvalue())
+        self.assertEqual(2, memo.GetStats()['configurations'])
+
+    @patch('sys.stdin', io.StringIO('missing.txt\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_not_memoizable(self, mock_stdout):
+        memo = UserQueryResponseMemo()
+        command = UserQueryCommandPathOpen(ConsoleUserQueryReceiver(), '', must_exist=False).SetResponseMemo(memo)
+        self.assertEqual('missing.txt', str(command.Execute()))
+        self.assertEqual(0, memo.GetStats()['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
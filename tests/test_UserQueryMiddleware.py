@@ -0,0 +1,144 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryMiddleware, and UserQueryMiddlewarePipeline
+    (2) UserQueryReceiver.AddMiddleware(...) and RemoveMiddleware(...), and middleware around UserQueryCommand.Execute(...)
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+
+# Local
+from UserResponseCollector.UserQueryMiddleware import UserQueryMiddleware, UserQueryMiddlewarePipeline, _EMPTY_DICT
+from UserResponseCollector.UserQueryResult import UserQueryResult
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandMenu
+
+
+class _Normalize(UserQueryMiddleware):
+    def AfterGetRawResponse(self, command=None, raw_response=''):
+        return raw_response.strip().lower()
+
+
+class _Cache(UserQueryMiddleware):
+    def __init__(self):
+        self.cache = {}
+        self.hits = 0
+
+    def BeforeProcessRawResponse(self, command=None, raw_response=''):
+        result = self.cache.get(raw_response)
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def AfterProcessRawResponse(self, command=None, raw_response='', result=None):
+        self.cache[raw_response] = result
+        return result
+
+
+class _Record(UserQueryMiddleware):
+    def __init__(self, name='', calls=None):
+        self.name = name
+        self.calls = calls
+
+    def BeforeGetRawResponse(self, command=None, prompt_text='', extra=_EMPTY_DICT):
+        self.calls.append(('before', self.name, type(command).__name__))
+
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        self.calls.append(('after', self.name, processed_response, result.value))
+        return result
+
+    def AfterQueryAbandoned(self, command=None, error=None):
+        self.calls.append(('abandoned', self.name, type(error).__name__))
+
+
+class _RejectOdd(UserQueryMiddleware):
+    def AfterValidateProcessedResponse(self, command=None, processed_response=None, result=None):
+        if result.value and processed_response % 2:
+            return UserQueryResult(False, 'message', ('\nOdd numbers are not allowed.',))
+        return result
+
+
+class Test_UserQueryMiddleware(unittest.TestCase):
+
+    def test_no_middleware(self):
+        receiver = ConsoleUserQueryReceiver()
+        self.assertIsNone(receiver.GetMiddlewarePipeline())
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertEqual(command._doProcessRawResponse, command._getOperations()[3])
+
+    def test_pipeline_compiles_overridden_hooks_only(self):
+        normalize = _Normalize()
+        cache = _Cache()
+        pipeline = UserQueryMiddlewarePipeline([normalize, cache])
+        self.assertEqual((normalize, cache), pipeline.GetMiddleware())
+        self.assertEqual((), pipeline._before_get)
+        self.assertEqual((normalize.AfterGetRawResponse,), pipeline._after_get)
+        self.assertEqual((cache.BeforeProcessRawResponse,), pipeline._before_process)
+        self.assertEqual((), pipeline._after_validate)
+        self.assertEqual((), pipeline._after_abandoned)
+        command = UserQueryCommandNumberInteger(ConsoleUserQueryReceiver(), '')
+        operations = command._getOperations()
+        wrapped = pipeline.WrapOperations(command, operations)
+        # Stages without hooks are left as they are
+        self.assertEqual(operations[4], wrapped[4])
+        self.assertNotEqual(operations[3], wrapped[3])
+
+    def test_Add_Remove_Middleware(self):
+        receiver = ConsoleUserQueryReceiver()
+        normalize = _Normalize()
+        cache = _Cache()
+        self.assertIs(receiver, receiver.AddMiddleware(normalize).AddMiddleware(cache))
+        self.assertEqual((normalize, cache), receiver.GetMiddlewarePipeline().GetMiddleware())
+        receiver.RemoveMiddleware(normalize)
+        self.assertEqual((cache,), receiver.GetMiddlewarePipeline().GetMiddleware())
+        receiver.RemoveMiddleware(cache)
+        self.assertIsNone(receiver.GetMiddlewarePipeline())
+        self.assertRaises(ValueError, receiver.RemoveMiddleware, cache)
+
+    @patch('sys.stdin', io.StringIO('  Y \n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_normalize(self, mock_stdout):
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(_Normalize())
+        command = UserQueryCommandMenu(receiver, '', {'y':'Yes', 'n':'No'})
+        self.assertEqual('y', command.Execute())
+
+    @patch('sys.stdin', io.StringIO('10\n10\n12\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_cache(self, mock_stdout):
+        cache = _Cache()
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(cache)
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertEqual([10, 10, 12], [command.Execute() for i in range(3)])
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(UserQueryResult(10), cache.cache['10'])
+
+    @patch('sys.stdin', io.StringIO('3\n4\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_order_and_validation(self, mock_stdout):
+        calls = []
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(_Record('outer', calls)).AddMiddleware(_RejectOdd())
+        receiver.AddMiddleware(_Record('inner', calls))
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertEqual(4, command.Execute())
+        self.assertIn('Odd numbers are not allowed.', mock_stdout.getvalue())
+        exp_val = [('before', 'outer', 'UserQueryCommandNumberInteger'), ('before', 'inner', 'UserQueryCommandNumberInteger'),
+                   ('after', 'inner', 3, True), ('after', 'outer', 3, False),
+                   ('before', 'outer', 'UserQueryCommandNumberInteger'), ('before', 'inner', 'UserQueryCommandNumberInteger'),
+                   ('after', 'inner', 4, True), ('after', 'outer', 4, True)]
+        self.assertEqual(exp_val, calls)
+
+    def test_query_abandoned(self):
+        calls = []
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(_Record('outer', calls)).AddMiddleware(_Record('inner', calls))
+        command = UserQueryCommandNumberInteger(receiver, '')
+        with patch.object(receiver, 'GetRawResponseUndecoded', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, command.Execute)
+        exp_val = [('before', 'outer', 'UserQueryCommandNumberInteger'), ('before', 'inner', 'UserQueryCommandNumberInteger'),
+                   ('abandoned', 'inner', 'KeyboardInterrupt'), ('abandoned', 'outer', 'KeyboardInterrupt')]
+        self.assertEqual(exp_val, calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryTokenBucket
+    (2) UserQueryRateLimiter, attached to a receiver as middleware
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+import threading
+import time
+
+# Local
+from UserResponseCollector.UserQueryRateLimiter import UserQueryTokenBucket, UserQueryRateLimiter
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver, UserQueryCancellationToken
+from UserResponseCollector.UserQueryReceiver import UserQueryReceiverTerminateQueryingThreadError
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger
+
+
+class _FakeTime(object):
+    """
+    Clock, and sleep function that advances it instead of waiting.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds=0.0):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Test_UserQueryTokenBucket(unittest.TestCase):
+
+    def test_Reserve(self):
+        fake = _FakeTime()
+        bucket = UserQueryTokenBucket(rate=2.0, capacity=2, clock=fake.clock)
+        self.assertEqual([0.0, 0.0, 0.5, 1.0], [bucket.Reserve() for i in range(4)])
+        # The reserved tokens are added after 1 second, and then the bucket refills up to its capacity
+        fake.now = 10.0
+        self.assertEqual([0.0, 0.0, 0.5], [bucket.Reserve() for i in range(3)])
+
+    def test_TryAcquire(self):
+        fake = _FakeTime()
+        bucket = UserQueryTokenBucket(rate=1.0, capacity=1, clock=fake.clock)
+        self.assertTrue(bucket.TryAcquire())
+        self.assertFalse(bucket.TryAcquire())
+        fake.now = 1.0
+        self.assertTrue(bucket.TryAcquire())
+
+
+class Test_UserQueryRateLimiter(unittest.TestCase):
+
+    @patch('sys.stdin', io.StringIO('x\nx\n0\nx\n10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_backoff(self, mock_stdout):
+        fake = _FakeTime()
+        limiter = UserQueryRateLimiter(rate=1000.0, burst=10, backoff_base=0.1, backoff_max=0.3, clock=fake.clock, sleep=fake.sleep)
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(limiter)
+        command = UserQueryCommandNumberInteger(receiver, '', minimum=1)
+        self.assertEqual(10, command.Execute())
+        self.assertEqual([0.1, 0.2, 0.3, 0.3], fake.sleeps)
+        exp_val = {'attempts':5, 'throttled':0, 'throttled_seconds':0.0, 'backoffs':4, 'backoff_seconds':0.9}
+        stats = limiter.GetStats()
+        stats['backoff_seconds'] = round(stats['backoff_seconds'], 6)
+        self.assertEqual(exp_val, stats)
+
+    @patch('sys.stdin', io.StringIO('1\n2\n3\n4\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_throttle(self, mock_stdout):
+        fake = _FakeTime()
+        limiter = UserQueryRateLimiter(rate=2.0, burst=2, clock=fake.clock, sleep=fake.sleep)
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(limiter)
+        command = UserQueryCommandNumberInteger(receiver, '')
+        self.assertEqual([1, 2, 3, 4], [command.Execute() for i in range(4)])
+        # The third response waits for a token, which is added 0.5 seconds later, as is the fourth
+        self.assertEqual([0.5, 0.5], fake.sleeps)
+        stats = limiter.GetStats()
+        self.assertEqual(2, stats['throttled'])
+        self.assertEqual(1.0, stats['throttled_seconds'])
+        limiter.ResetStats()
+        self.assertEqual(0, limiter.GetStats()['attempts'])
+
+    @patch('sys.stdin', io.StringIO('x\n10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_cancelled_during_backoff(self, mock_stdout):
+        limiter = UserQueryRateLimiter(backoff_base=60.0, backoff_max=60.0)
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(limiter)
+        command = UserQueryCommandNumberInteger(receiver, '')
+        token = UserQueryCancellationToken()
+        self.addCleanup(token.Close)
+        # Cancel from another thread, shortly after the first response is rejected, so that the backoff is cut short
+        timer = threading.Timer(0.05, token.Cancel)
+        with patch.object(receiver, 'IssueErrorMessage', side_effect=lambda msg: timer.start()):
+            start = time.monotonic()
+            self.assertRaises(UserQueryReceiverTerminateQueryingThreadError, command.Execute, token)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(1, limiter.GetStats()['backoffs'])
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_backoff_reset_when_query_abandoned(self, mock_stdout):
+        fake = _FakeTime()
+        limiter = UserQueryRateLimiter(rate=1000.0, burst=10, backoff_base=0.1, clock=fake.clock, sleep=fake.sleep)
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(limiter)
+        command = UserQueryCommandNumberInteger(receiver, '', minimum=1)
+        # The first query is abandoned after a rejected response, e.g., because it timed out
+        responses = ['x', UserQueryReceiverTerminateQueryingThreadError('Timed out'), '10']
+        with patch.object(receiver, 'GetRawResponseUndecoded', side_effect=responses):
+            self.assertRaises(UserQueryReceiverTerminateQueryingThreadError, command.Execute)
+            self.assertEqual([0.1], fake.sleeps)
+            # The next query doesn't back off for the rejections of the abandoned one
+            self.assertEqual(10, command.Execute())
+        self.assertEqual([0.1], fake.sleeps)
+
+
+if __name__ == '__main__':
+    unittest.main()
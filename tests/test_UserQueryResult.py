@@ -0,0 +1,99 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryResult, and its lazily rendered error messages
+    (2) asUserQueryResult(...)
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+
+# Local
+from UserResponseCollector.UserQueryResult import UserQueryResult, asUserQueryResult, registerUserQueryMessage
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandStr
+
+
+class _LegacyCommand(UserQueryCommandStr):
+    """
+    Command written before UserQueryResult, which returns tuples.
+    """
+    def _doProcessRawResponse(self, raw_response=''):
+        if raw_response == 'bad':
+            return (None, '\nLegacy error.')
+        return (raw_response, '')
+
+    def _doValidateProcessedResponse(self, processed_response=None):
+        if processed_response == 'invalid':
+            return (False, '\nLegacy invalid.')
+        return (True, '')
+
+
+class Test_UserQueryResult(unittest.TestCase):
+
+    def test_slots(self):
+        result = UserQueryResult(None, 'not_an_integer', ('x',))
+        self.assertFalse(hasattr(result, '__dict__'))
+        with self.assertRaises(AttributeError):
+            result.message = 'x'
+
+    def test_GetMessage(self):
+        result = UserQueryResult(False, 'less_than_minimum', (0, 1))
+        self.assertTrue(result.IsError())
+        self.assertEqual("\n'0' is less than 1. Please try again.", result.GetMessage())
+        self.assertEqual(result.GetMessage(), str(result))
+        self.assertFalse(UserQueryResult.VALID.IsError())
+        self.assertEqual('', UserQueryResult.VALID.GetMessage())
+
+    def test_message_rendered_lazily(self):
+        calls = []
+        registerUserQueryMessage('test_lazy', lambda value: calls.append(value) or f"Bad {value}")
+        result = UserQueryResult(False, 'test_lazy', ('x',))
+        self.assertEqual([], calls)
+        self.assertEqual('Bad x', str(result))
+        self.assertEqual(['x'], calls)
+
+    def test_tuple_compatibility(self):
+        result = UserQueryResult(None, 'not_an_integer', ('x',))
+        (value, msg) = result
+        self.assertIsNone(value)
+        self.assertEqual("\n'x' is not an integer. Please try again.", msg)
+        self.assertEqual(2, len(result))
+        self.assertEqual(msg, result[1])
+        self.assertEqual((None, msg), result)
+        self.assertEqual(UserQueryResult(None, 'not_an_integer', ('x',)), result)
+        self.assertNotEqual(UserQueryResult(None, 'not_an_integer', ('y',)), result)
+
+    def test_asUserQueryResult(self):
+        result = UserQueryResult(42)
+        self.assertIs(result, asUserQueryResult(result))
+        self.assertEqual(UserQueryResult(42), asUserQueryResult((42, '')))
+        self.assertEqual(UserQueryResult(None, 'message', ('Bad',)), asUserQueryResult((None, 'Bad')))
+
+    def test_not_rendered_when_valid(self):
+        command = UserQueryCommandNumberInteger(ConsoleUserQueryReceiver(), '', minimum=1)
+        with patch.object(UserQueryResult, 'GetMessage') as get_message:
+            command._doValidateProcessedResponse(5)
+            command._doProcessRawResponse('5')
+        get_message.assert_not_called()
+
+    @patch('sys.stdin', io.StringIO('x\n0\n5\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_issues_rendered_message(self, mock_stdout):
+        command = UserQueryCommandNumberInteger(ConsoleUserQueryReceiver(), '', minimum=1)
+        self.assertEqual(5, command.Execute())
+        self.assertIn("'x' is not an integer. Please try again.", mock_stdout.getvalue())
+        self.assertIn("'0' is less than 1. Please try again.", mock_stdout.getvalue())
+
+    @patch('sys.stdin', io.StringIO('bad\ninvalid\ngood\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_legacy_tuples(self, mock_stdout):
+        command = _LegacyCommand(ConsoleUserQueryReceiver(), '')
+        self.assertEqual('good', command.Execute())
+        self.assertIn('Legacy error.', mock_stdout.getvalue())
+        self.assertIn('Legacy invalid.', mock_stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
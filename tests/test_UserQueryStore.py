@@ -0,0 +1,155 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryResponseStore, recording answers, and computing their statistics with NumPy
+    (2) UserQueryResponseRecorder, recording validated answers around UserQueryCommand.Execute(...)
+
+Tests of the statistics are skipped if NumPy isn't installed.
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import gc
+import io
+
+# Local
+from UserResponseCollector.UserQueryStore import UserQueryResponseStore, UserQueryResponseRecorder
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu, UserQueryCommandNumberInteger, UserQueryCommandNumberFloat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Test_UserQueryResponseStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = UserQueryResponseStore().AddCategoryQuestion('colour', ['r', 'g', 'b']).AddNumberQuestion('weight')
+
+    def test_Record(self):
+        self.store.Record('colour', 'g', 'operator 1')
+        self.store.Record('weight', 12, 'operator 2')
+        self.store.Record('weight', 13.5, 'operator 1')
+        self.assertEqual(['colour', 'weight'], self.store.GetQuestions())
+        self.assertEqual(['operator 1', 'operator 2'], self.store.GetRespondents())
+        self.assertEqual(('r', 'g', 'b'), self.store.GetCategories('colour'))
+        self.assertEqual(1, self.store.GetCount('colour'))
+        self.assertEqual(2, self.store.GetCount('weight'))
+
+    def test_Record_invalid(self):
+        with self.assertRaises(ValueError):
+            self.store.Record('colour', 'purple')
+        with self.assertRaises(ValueError):
+            self.store.Record('weight', 'heavy')
+        with self.assertRaises(KeyError):
+            self.store.Record('height', 2.0)
+        self.assertEqual(0, self.store.GetCount('colour'))
+        self.assertEqual([], self.store.GetRespondents())
+
+    def test_wrong_kind_of_question(self):
+        with self.assertRaises(ValueError):
+            self.store.GetCategories('weight')
+        with self.assertRaises(ValueError):
+            self.store.GetMean('colour')
+
+    def test_AddQuestion(self):
+        receiver = ConsoleUserQueryReceiver()
+        menu = UserQueryCommandMenu(receiver, '', {'y':'Yes', 'n':'No'})
+        integer = UserQueryCommandNumberInteger(receiver, '')
+        store = UserQueryResponseStore().AddQuestion('agree', menu).AddQuestion('age', integer)
+        self.assertEqual(('y', 'n'), store.GetCategories('agree'))
+        self.assertEqual('age', store.GetQuestion(integer))
+        self.assertIsNone(store.GetQuestion(UserQueryCommandNumberFloat(receiver, '')))
+        with self.assertRaises(ValueError):
+            store.AddQuestion('agree', UserQueryCommandNumberFloat(receiver, ''))
+
+    def test_AddQuestion_command_not_kept_alive(self):
+        receiver = ConsoleUserQueryReceiver()
+        store = UserQueryResponseStore()
+        for i in range(100):
+            store.AddQuestion('age', UserQueryCommandNumberInteger(receiver, f"Age of respondent {i}?"))
+        gc.collect()
+        # The question and its column remain, but the commands added for it are gone
+        self.assertEqual(0, len(store._questions_by_command))
+        self.assertEqual(['age'], store.GetQuestions())
+
+    @unittest.skipUnless(numpy, 'NumPy is not installed')
+    def test_GetValues(self):
+        for (answer, respondent) in [('b', 'a'), ('r', 'b'), ('b', 'b')]:
+            self.store.Record('colour', answer, respondent)
+        values = self.store.GetValues('colour')
+        self.assertEqual(numpy.int32, values.dtype)
+        self.assertEqual([2, 0, 2], values.tolist())
+        self.assertEqual([0, 2], self.store.GetValues('colour', 'b').tolist())
+        self.assertEqual([], self.store.GetValues('colour', 'nobody').tolist())
+        self.assertEqual(numpy.float64, self.store.GetValues('weight').dtype)
+        self.assertEqual(0, self.store.GetValues('weight').size)
+
+    @unittest.skipUnless(numpy, 'NumPy is not installed')
+    def test_GetCounts(self):
+        for answer in 'rbbgbb':
+            self.store.Record('colour', answer, 'a' if answer == 'r' else 'b')
+        self.assertEqual({'r':1, 'g':1, 'b':4}, self.store.GetCounts('colour'))
+        self.assertEqual({'r':1, 'g':0, 'b':0}, self.store.GetCounts('colour', 'a'))
+
+    @unittest.skipUnless(numpy, 'NumPy is not installed')
+    def test_number_statistics(self):
+        for value in range(1, 101):
+            self.store.Record('weight', value, 'even' if value % 2 == 0 else 'odd')
+        self.assertAlmostEqual(50.5, self.store.GetMean('weight'))
+        self.assertAlmostEqual(51.0, self.store.GetMean('weight', 'even'))
+        self.assertEqual([25.75, 50.5, 75.25], self.store.GetQuantiles('weight').tolist())
+        self.assertEqual([1.0, 100.0], self.store.GetQuantiles('weight', (0.0, 1.0)).tolist())
+        (counts, edges) = self.store.GetHistogram('weight', bins=4, value_range=(0, 100))
+        self.assertEqual([24, 25, 25, 26], counts.tolist())
+        self.assertEqual([0.0, 25.0, 50.0, 75.0, 100.0], edges.tolist())
+
+    @unittest.skipUnless(numpy, 'NumPy is not installed')
+    def test_no_answers(self):
+        self.assertIsNone(self.store.GetMean('weight'))
+        self.assertIsNone(self.store.GetQuantiles('weight'))
+        self.assertEqual({'r':0, 'g':0, 'b':0}, self.store.GetCounts('colour'))
+
+    @unittest.skipUnless(numpy is None, 'NumPy is installed')
+    def test_statistics_without_numpy(self):
+        with self.assertRaises(ImportError):
+            self.store.GetMean('weight')
+
+
+class Test_UserQueryResponseRecorder(unittest.TestCase):
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_records_validated_answers(self, mock_stdout):
+        store = UserQueryResponseStore()
+        answers = {'operator 1': 'x\nb\n200\n7\n2.5\n', 'operator 2': 'r\n9\n0.5\n'}
+        for (respondent, script) in answers.items():
+            receiver = ConsoleUserQueryReceiver().AddMiddleware(store.GetRecorder(respondent))
+            menu = UserQueryCommandMenu(receiver, '', {'r':'Red', 'b':'Blue'})
+            integer = UserQueryCommandNumberInteger(receiver, '', minimum=1, maximum=10)
+            number = UserQueryCommandNumberFloat(receiver, '')
+            store.AddQuestion('colour', menu).AddQuestion('count', integer).AddQuestion('size', number)
+            with patch('sys.stdin', io.StringIO(script)):
+                for command in (menu, integer, number):
+                    command.Execute()
+        # Only answers that passed validation are recorded
+        self.assertEqual(2, store.GetCount('colour'))
+        self.assertEqual(2, store.GetCount('count'))
+        self.assertEqual(['operator 1', 'operator 2'], store.GetRespondents())
+        if numpy is not None:
+            self.assertEqual({'r':1, 'b':1}, store.GetCounts('colour'))
+            self.assertEqual([7.0], store.GetValues('count', 'operator 1').tolist())
+            self.assertAlmostEqual(1.5, store.GetMean('size'))
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_ignores_other_commands(self, mock_stdout):
+        store = UserQueryResponseStore().AddNumberQuestion('count')
+        receiver = ConsoleUserQueryReceiver().AddMiddleware(UserQueryResponseRecorder(store, 'operator 1'))
+        with patch('sys.stdin', io.StringIO('5\n')):
+            UserQueryCommandNumberInteger(receiver, '').Execute()
+        self.assertEqual(0, store.GetCount('count'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+This module provides unit tests for:
+    (1) UserQueryTracer, and the spans that it records around UserQueryCommand.Execute(...)
+    (2) setUserQueryTracer(...) and getUserQueryTracer()
+"""
+
+# Standard
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+# Local
+from UserResponseCollector.UserQueryTracer import UserQueryTracer, setUserQueryTracer, getUserQueryTracer
+from UserResponseCollector.UserQueryReceiver import ConsoleUserQueryReceiver
+from UserResponseCollector.UserQueryCommand import UserQueryCommandNumberInteger, UserQueryCommandPathSave
+
+
+class _FakeClock(object):
+    """
+    Clock that advances by 1000 ns each time it is read.
+    """
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1000
+        return self.now
+
+
+class Test_UserQueryTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(setUserQueryTracer, None)
+
+    def test_Span_nesting(self):
+        tracer = UserQueryTracer(_FakeClock())
+        with tracer.Span('outer', 'test'):
+            with tracer.Span('inner', 'test', {'key':'value'}):
+                pass
+        spans = tracer.GetSpans()
+        self.assertEqual(['inner', 'outer'], [span.name for span in spans])
+        self.assertEqual([1, 0], [span.depth for span in spans])
+        self.assertEqual({'key':'value'}, spans[0].args)
+        self.assertEqual(1000, spans[0].duration_ns)
+        self.assertEqual(3000, spans[1].duration_ns)
+        self.assertEqual(1000, spans[1].start_ns)
+
+    def test_Span_exception(self):
+        tracer = UserQueryTracer()
+        with self.assertRaises(ValueError):
+            with tracer.Span('failing'):
+                raise ValueError
+        self.assertEqual({'exception':'ValueError'}, tracer.GetSpans()[0].args)
+        tracer.Clear()
+        self.assertEqual([], tracer.GetSpans())
+
+    def test_context_manager_installs_tracer(self):
+        self.assertIsNone(getUserQueryTracer())
+        with UserQueryTracer() as outer:
+            self.assertIs(outer, getUserQueryTracer())
+            with UserQueryTracer() as inner:
+                self.assertIs(inner, getUserQueryTracer())
+            self.assertIs(outer, getUserQueryTracer())
+        self.assertIsNone(getUserQueryTracer())
+
+    @patch('sys.stdin', io.StringIO('x\n10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_spans(self, mock_stdout):
+        command = UserQueryCommandNumberInteger(ConsoleUserQueryReceiver(), '', minimum=1)
+        with UserQueryTracer() as tracer:
+            self.assertEqual(10, command.Execute())
+        names = [span.name for span in tracer.GetSpans()]
+        self.assertEqual('UserQueryCommandNumberInteger.Execute', names[-1])
+        self.assertEqual(2, names.count('UserQueryCommandNumberInteger._doGetRawResponse'))
+        self.assertEqual(2, names.count('UserQueryCommandNumberInteger._doProcessRawResponse'))
+        self.assertEqual(1, names.count('UserQueryCommandNumberInteger._doValidateProcessedResponse'))
+        self.assertEqual(1, names.count('ConsoleUserQueryReceiver.IssueErrorMessage'))
+        for span in tracer.GetSpans()[:-1]:
+            self.assertEqual(1, span.depth)
+
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_nested_command_spans(self, mock_stdout):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, 'existing.txt')
+            path.write_text('')
+            command = UserQueryCommandPathSave(ConsoleUserQueryReceiver(), '')
+            with patch('sys.stdin', io.StringIO(f"{path}\ny\n")), UserQueryTracer() as tracer:
+                self.assertEqual(path, command.Execute())
+        spans = {span.name: span for span in tracer.GetSpans()}
+        self.assertEqual(0, spans['UserQueryCommandPathSave.Execute'].depth)
+        self.assertEqual(1, spans['UserQueryCommandPathSave._doValidateProcessedResponse'].depth)
+        self.assertEqual(2, spans['UserQueryCommandMenu.Execute'].depth)
+        self.assertEqual(3, spans['UserQueryCommandMenu._doGetRawResponse'].depth)
+
+    @patch('sys.stdin', io.StringIO('10\n'))
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_Execute_without_tracer(self, mock_stdout):
+        tracer = UserQueryTracer()
+        command = UserQueryCommandNumberInteger(ConsoleUserQueryReceiver(), '')
+        with patch.object(UserQueryTracer, 'Wrap') as wrap:
+            self.assertEqual(10, command.Execute())
+        wrap.assert_not_called()
+        self.assertEqual([], tracer.GetSpans())
+
+    def test_threads(self):
+        tracer = UserQueryTracer()
+        def work():
+            with tracer.Span('work'):
+                pass
+        threads = [threading.Thread(target=work) for i in range(4)]
+        with tracer.Span('main'):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        spans = tracer.GetSpans()
+        self.assertEqual(5, len(spans))
+        # Spans in other threads aren't nested within the span of the main thread
+        self.assertEqual([0] * 5, [span.depth for span in spans])
+        self.assertNotIn(threading.get_ident(), [span.thread_id for span in spans if span.name == 'work'])
+
+    def test_WriteChromeTrace(self):
+        tracer = UserQueryTracer(_FakeClock())
+        with tracer.Span('outer', 'command'):
+            with tracer.Span('inner', 'primitive'):
+                pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'trace.json')
+            self.assertEqual(2, tracer.WriteChromeTrace(path))
+            with open(path, encoding='utf-8') as file:
+                trace = json.load(file)
+        events = trace['traceEvents']
+        self.assertEqual(['outer', 'inner'], [event['name'] for event in events])
+        self.assertEqual({'name':'outer', 'cat':'command', 'ph':'X', 'ts':1.0, 'dur':3.0, 'pid':os.getpid(),
+                          'tid':threading.get_ident(), 'args':{}}, events[0])
+        self.assertEqual(2.0, events[1]['ts'])
+        self.assertEqual(1.0, events[1]['dur'])
+
+
+if __name__ == '__main__':
+    unittest.main()